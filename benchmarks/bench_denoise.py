@@ -0,0 +1,101 @@
+"""
+Denoise benchmark: per-chunk cost of the streaming spectral gate
+
+Feeds synthetic speech-like audio (harmonic tone bursts in white noise)
+through SpectralGate in microphone-sized chunks and reports the median
+cost per chunk, the real-time factor and the SNR gain. When noisereduce
+is installed, its whole-utterance stationary mode is timed for reference
+(it can only start once the utterance has ended).
+
+Usage:
+    python benchmarks/bench_denoise.py [--rates 16000 44100] [--chunk 1024] [--seconds 3]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.denoise import NOISEREDUCE_AVAILABLE, SpectralGate, reduce_noise_offline
+
+
+def synth(rate: int, seconds: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """(clean, noise) int16 signals: 200 Hz harmonic bursts, 300 ms on / 200 ms off"""
+    t = np.arange(int(rate * seconds)) / rate
+    voice = sum(np.sin(2 * np.pi * 200 * k * t) / k for k in range(1, 6))
+    envelope = ((t % 0.5) < 0.3).astype(np.float64)
+    clean = 4000 * voice * envelope
+    noise = rng.normal(0, 400, len(t))
+    return clean, noise
+
+
+def snr_db(clean: np.ndarray, estimate: np.ndarray) -> float:
+    error = estimate - clean
+    return 10 * np.log10(np.sum(clean ** 2) / max(np.sum(error ** 2), 1e-9))
+
+
+def run(rates: List[int], chunk: int, seconds: float, seed: int = 7) -> Dict[int, Dict[str, float]]:
+    rng = np.random.default_rng(seed)
+    results: Dict[int, Dict[str, float]] = {}
+    for rate in rates:
+        clean, noise = synth(rate, seconds, rng)
+        noisy = np.clip(clean + noise, -32768, 32767).astype(np.int16)
+        profile = rng.normal(0, 400, rate // 2).astype(np.int16).tobytes()
+
+        gate = SpectralGate(rate)
+        gate.learn_noise(profile)
+        samples, output = [], b""
+        for start in range(0, len(noisy), chunk):
+            piece = noisy[start:start + chunk].tobytes()
+            begin = time.perf_counter()
+            output += gate.process(piece)
+            samples.append((time.perf_counter() - begin) * 1e6)
+
+        denoised = np.frombuffer(output, dtype=np.int16).astype(np.float64)[gate.hop:]
+        reference = clean[:len(denoised)]
+        row = {
+            "chunk_us": statistics.median(samples),
+            "rtf": sum(samples) / 1e6 / seconds,
+            "latency_ms": gate.stats()["latency_ms"],
+            "snr_in_db": snr_db(reference, noisy[:len(denoised)].astype(np.float64)),
+            "snr_out_db": snr_db(reference, denoised),
+        }
+        if NOISEREDUCE_AVAILABLE:
+            begin = time.perf_counter()
+            reduce_noise_offline(noisy.tobytes(), rate, profile)
+            row["noisereduce_ms"] = (time.perf_counter() - begin) * 1000
+        results[rate] = row
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the streaming denoise stage")
+    parser.add_argument("--rates", type=int, nargs="+", default=[16000, 44100])
+    parser.add_argument("--chunk", type=int, default=1024)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    results = run(args.rates, args.chunk, args.seconds)
+
+    print(f"\nSTREAMING SPECTRAL GATE ({args.chunk}-frame chunks)")
+    print("=" * 60)
+    for rate, row in results.items():
+        print(f"\n{rate:,} Hz")
+        print(f"  per chunk          {row['chunk_us']:10.1f} us")
+        print(f"  real-time factor   {row['rtf']:10.4f}")
+        print(f"  added latency      {row['latency_ms']:10.1f} ms")
+        print(f"  SNR in -> out      {row['snr_in_db']:6.1f} -> {row['snr_out_db']:.1f} dB")
+        if "noisereduce_ms" in row:
+            print(f"  noisereduce (whole utterance) {row['noisereduce_ms']:.1f} ms after end of speech")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Fuzzy tier benchmark: legacy per-phrase loop vs BatchFuzzyScorer
+
+Scores the same utterances against synthetic phrase tables of 1k, 10k and
+100k phrases and reports per-utterance latency for the old fuzzywuzzy
+loop and every available batch backend.
+
+Usage:
+    python benchmarks/bench_fuzzy.py [--sizes 1000 10000 100000] [--utterances 20]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.phoneme_variants import PhonemeVariants
+from src.core import fuzzy_scorer
+from src.core.fuzzy_scorer import BatchFuzzyScorer
+
+BASE_PHRASES = [
+    "next slide", "back slide", "previous slide", "open slide show",
+    "close slide show", "help menu", "stop program", "caption on",
+    "popup off", "change language", "show analytics", "mulai presentasi",
+]
+ALPHABET = "abcdefghijklmnopqrstuvwxyz "
+
+
+def build_table(size: int, rnd: random.Random) -> List[str]:
+    """Phoneme variants of the real commands, padded with mutated copies"""
+    table: List[str] = []
+    for phrase in BASE_PHRASES:
+        table.extend(PhonemeVariants.add_regional_variants(phrase))
+    table = sorted(set(table))
+    while len(table) < size:
+        phrase = list(rnd.choice(table))
+        for _ in range(rnd.randint(1, 3)):
+            position = rnd.randrange(len(phrase))
+            phrase[position] = rnd.choice(ALPHABET)
+        table.append("".join(phrase))
+    return table[:size]
+
+
+def build_utterances(count: int, rnd: random.Random) -> List[str]:
+    """Near-miss utterances: a command with one or two typos"""
+    utterances = []
+    for _ in range(count):
+        phrase = list(rnd.choice(BASE_PHRASES))
+        for _ in range(rnd.randint(1, 2)):
+            phrase[rnd.randrange(len(phrase))] = rnd.choice(ALPHABET)
+        utterances.append("".join(phrase))
+    return utterances
+
+
+def legacy_loop(text: str, phrases: List[str]) -> List[int]:
+    """The detector's original fuzzy tier (import inside the loop included)"""
+    hits = []
+    for pid, phrase in enumerate(phrases):
+        try:
+            from fuzzywuzzy import fuzz
+            if fuzz.ratio(text, phrase) >= 85:
+                hits.append(pid)
+        except ImportError:
+            return hits
+    return hits
+
+
+def time_per_call(func: Callable[[str], object], utterances: List[str]) -> float:
+    """Median latency per utterance in milliseconds"""
+    samples = []
+    for text in utterances:
+        start = time.perf_counter()
+        func(text)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def available_backends() -> List[str]:
+    backends = ["python"]
+    if fuzzy_scorer.NUMPY_AVAILABLE:
+        backends.insert(0, "numpy")
+        if fuzzy_scorer.RAPIDFUZZ_AVAILABLE:
+            backends.insert(0, "rapidfuzz")
+    return backends
+
+
+def run(sizes: List[int], utterance_count: int, seed: int = 42) -> Dict[int, Dict[str, float]]:
+    rnd = random.Random(seed)
+    utterances = build_utterances(utterance_count, rnd)
+    results: Dict[int, Dict[str, float]] = {}
+
+    try:
+        import fuzzywuzzy  # noqa: F401
+        has_legacy = True
+    except ImportError:
+        has_legacy = False
+
+    for size in sizes:
+        phrases = build_table(size, rnd)
+        row: Dict[str, float] = {}
+        if has_legacy:
+            row["legacy loop"] = time_per_call(lambda text: legacy_loop(text, phrases), utterances)
+        for backend in available_backends():
+            if backend == "python" and size > 10000 and not fuzzy_scorer.LEVENSHTEIN_AVAILABLE:
+                continue  # pure-Python LCS at 100k only measures patience
+            scorer = BatchFuzzyScorer(phrases, cutoff=85, backend=backend)
+            scorer.score(utterances[0])  # warm per-character caches
+            row[f"batch/{backend}"] = time_per_call(scorer.score, utterances)
+        results[size] = row
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the detector's fuzzy tier")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--utterances", type=int, default=20)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.utterances)
+
+    print("\nFUZZY TIER LATENCY (median ms per utterance)")
+    print("=" * 60)
+    for size, row in results.items():
+        print(f"\n{size:,} phrases")
+        baseline = row.get("legacy loop")
+        for name, latency in row.items():
+            speedup = f"  ({baseline / latency:.1f}x)" if baseline and name != "legacy loop" else ""
+            print(f"  {name:<18} {latency:10.3f} ms{speedup}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Offline decoding benchmark: free dictation vs command-grammar Vosk
+
+Decodes every WAV fixture twice with the same Vosk model, once
+open-vocabulary and once restricted to the wake-word grammar, and reports
+decode CPU time, real-time factor, exact-transcript accuracy and command
+accuracy (the detector's verdict on the hypothesis vs on the reference).
+
+Fixtures: a directory of 16-bit mono PCM WAV files plus transcripts.json
+mapping file name -> spoken phrase, e.g. {"next_01.wav": "next slide"}.
+
+Usage:
+    python benchmarks/bench_grammar.py [--fixtures benchmarks/fixtures/commands] [--model model]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import wave
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.command_grammar import grammar_json
+from src.core.streaming_recognizer import StreamingRecognizer
+from src.core.voice_detector import SmartVoiceDetector
+from src.infrastructure.exceptions import VoiceRecognitionError
+
+DEFAULT_FIXTURES = Path(__file__).parent / "fixtures" / "commands"
+CHUNK_FRAMES = 4000
+
+
+def load_fixtures(directory: Path) -> List[Tuple[Path, str]]:
+    """(wav path, reference transcript) pairs listed in transcripts.json"""
+    manifest = directory / "transcripts.json"
+    if not manifest.exists():
+        return []
+    with open(manifest, "r", encoding="utf-8") as f:
+        transcripts: Dict[str, str] = json.load(f)
+    return [(directory / name, text.lower().strip())
+            for name, text in sorted(transcripts.items())
+            if (directory / name).exists()]
+
+
+def read_wav(path: Path) -> Tuple[int, List[bytes], float]:
+    """Sample rate, PCM chunks and duration (s) of a 16-bit mono WAV"""
+    with wave.open(str(path), "rb") as wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            raise ValueError(f"{path.name}: expected 16-bit mono PCM")
+        rate = wav.getframerate()
+        duration = wav.getnframes() / rate
+        chunks = []
+        while True:
+            data = wav.readframes(CHUNK_FRAMES)
+            if not data:
+                break
+            chunks.append(data)
+    return rate, chunks, duration
+
+
+def decode(path: Path, model_path: str, grammar: Optional[str]) -> Tuple[str, float, float]:
+    """Hypothesis, decode CPU seconds and audio duration for one file"""
+    rate, chunks, duration = read_wav(path)
+    recognizer = StreamingRecognizer(rate, model_path, grammar=grammar)
+    start = time.process_time()
+    finals = []
+    for chunk in chunks:
+        kind, text = recognizer.feed(chunk)
+        if kind == "final" and text:
+            finals.append(text)
+    tail = recognizer.flush()
+    if tail:
+        finals.append(tail)
+    return " ".join(finals), time.process_time() - start, duration
+
+
+def command_of(detector: SmartVoiceDetector, text: str) -> Optional[str]:
+    match = detector.evaluate(text) if text else None
+    return match["command"] if match and match["score"] >= 8.0 else None
+
+
+def run(fixtures: List[Tuple[Path, str]], model_path: str) -> Dict[str, Dict[str, float]]:
+    detector = SmartVoiceDetector()
+    modes = {
+        "free dictation": None,
+        "command grammar": grammar_json(detector.wake_words, model_path, exclude=detector.generated_variants),
+    }
+    results: Dict[str, Dict[str, float]] = {}
+    for mode, grammar in modes.items():
+        cpu, rtf, exact, commands = [], [], 0, 0
+        for path, reference in fixtures:
+            hypothesis, seconds, duration = decode(path, model_path, grammar)
+            cpu.append(seconds * 1000)
+            rtf.append(seconds / duration if duration else 0.0)
+            exact += hypothesis == reference
+            commands += command_of(detector, hypothesis) == command_of(detector, reference)
+        results[mode] = {
+            "median_cpu_ms": statistics.median(cpu),
+            "mean_rtf": statistics.mean(rtf),
+            "exact_accuracy": exact / len(fixtures),
+            "command_accuracy": commands / len(fixtures),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark grammar-constrained Vosk decoding")
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument("--model", default="model")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"No fixtures found in {args.fixtures} (need *.wav + transcripts.json)")
+        sys.exit(1)
+
+    try:
+        results = run(fixtures, args.model)
+    except VoiceRecognitionError as e:
+        print(f"Cannot run benchmark: {e}")
+        sys.exit(1)
+
+    print(f"\nOFFLINE DECODING ({len(fixtures)} fixtures)")
+    print("=" * 60)
+    print(f"  {'mode':<18} {'cpu ms':>9} {'RTF':>7} {'exact':>7} {'command':>8}")
+    for mode, row in results.items():
+        print(f"  {mode:<18} {row['median_cpu_ms']:9.1f} {row['mean_rtf']:7.3f} "
+              f"{row['exact_accuracy']:7.0%} {row['command_accuracy']:8.0%}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Phrase-table benchmark: expanded variants vs pronunciation model vs phonetic index
+
+Builds the detector once per voice.phrase_model and reports phrase count,
+cold build time (variant disk cache off), memory retained by the detector
+and per-utterance evaluate() latency. A growth table then adds synthetic
+spellings to WORD_SUBSTITUTIONS and shows how the stored variant table and
+the automaton's arcs grow with them.
+
+Usage:
+    python benchmarks/bench_phrase_model.py [--extra 0 10 20 40] [--rounds 3]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.phoneme_variants import PhonemeVariants
+from src.core.phrase_index import PhraseIndex
+from src.core.pronunciation_model import PronunciationModel
+from src.core.voice_detector import SmartVoiceDetector
+from src.infrastructure.config import get_config
+
+MODELS = ("variants", "automaton", "phonetic")
+MODELLED = ["next slide", "slide next", "lanjut slide", "slide lanjut",
+            "back slide", "slide back", "mundur slide", "slide mundur", "previous slide", "slide previous"]
+UTTERANCES = ["neks slaid", "please bek slait", "nekst slide", "slide mundur", "open slide show",
+              "stop program", "so the revenue grew this quarter", "kita lihat tabel berikut ini"]
+
+
+def build(phrase_model: str) -> Dict[str, Any]:
+    """Cold-build one detector, measuring time and retained memory"""
+    PhonemeVariants.clear_cache()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        detector = SmartVoiceDetector(config=get_config().copy({"voice.phrase_model": phrase_model}))
+    build_ms = (time.perf_counter() - start) * 1000
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"detector": detector, "build_ms": build_ms, "retained_kb": retained / 1024, "peak_kb": peak / 1024}
+
+
+def evaluate_us(detector: SmartVoiceDetector, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in UTTERANCES:
+            detector.evaluate(text)
+        timings.append((time.perf_counter() - start) / len(UTTERANCES) * 1e6)
+    return statistics.median(timings)
+
+
+def growth(extra: int) -> Dict[str, int]:
+    """Table sizes with `extra` synthetic spellings added to next / slide / back"""
+    original = PhonemeVariants.WORD_SUBSTITUTIONS
+    PhonemeVariants.WORD_SUBSTITUTIONS = {word: list(spellings) for word, spellings in original.items()}
+    try:
+        for word in ("next", "slide", "back"):
+            PhonemeVariants.WORD_SUBSTITUTIONS[word] += [f"{word}{n}" for n in range(extra)]
+        PhonemeVariants.clear_cache()
+        variants = sum(len(PhonemeVariants.expand(phrase)) for phrase in MODELLED)
+        index = PhraseIndex({"demo": {"phrases": MODELLED, "weight": 10, "description": ""}})
+        stats = PronunciationModel(index, MODELLED).stats()
+    finally:
+        PhonemeVariants.WORD_SUBSTITUTIONS = original
+        PhonemeVariants.clear_cache()
+    return {"variants": variants, "arcs": stats["arcs"], "nodes": stats["nodes"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark phrase-table models")
+    parser.add_argument("--extra", type=int, nargs="+", default=[0, 10, 20, 40])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    PhonemeVariants.cache_enabled = False  # Cold builds, and no cache file written
+    rows = {model: build(model) for model in MODELS}
+
+    print("\nPHRASE TABLE")
+    print("=" * 72)
+    print(f"  {'model':<10} {'phrases':>8} {'build ms':>9} {'retained KB':>12} {'peak KB':>9} {'eval us':>8}")
+    for model, row in rows.items():
+        detector = row["detector"]
+        print(f"  {model:<10} {len(detector.phrase_index):8d} {row['build_ms']:9.1f} "
+              f"{row['retained_kb']:12.0f} {row['peak_kb']:9.0f} {evaluate_us(detector, args.rounds):8.0f}")
+    print("=" * 72)
+
+    print("\nGROWTH (extra spellings per word for next / slide / back)")
+    print("=" * 72)
+    print(f"  {'extra':>5} {'stored variants':>16} {'automaton arcs':>15} {'trie nodes':>11}")
+    for extra in args.extra:
+        sizes = growth(extra)
+        print(f"  {extra:5d} {sizes['variants']:16d} {sizes['arcs']:15d} {sizes['nodes']:11d}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
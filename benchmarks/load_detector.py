@@ -0,0 +1,265 @@
+"""
+Load generator for SmartVoiceDetector.detect
+
+Drives the detector with generated utterances from several processes (one
+detector per process, as a multi-room service would run) and reports
+throughput, tail latency and memory for each phrase-table size and
+process count, so the saturation point and the scaling with cores and
+vocabulary can be read off one table.
+
+Utterance mix (--mix, weights):
+    command   a hand-written wake phrase ("next slide")
+    variant   a PhonemeVariants accent variant, sometimes with a typo
+    noisy     a command wrapped in filler words ("um okay next slide please")
+    oov       out-of-vocabulary speech (random words / letters)
+
+--table-sizes pads the phrase table with synthetic phrases (a separate
+padding command) to see how matching cost grows with vocabulary.
+
+Usage:
+    python benchmarks/load_detector.py [--utterances 200000] [--processes 1 2 4]
+                                       [--table-sizes 0 10000] [--output load.json]
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.phoneme_variants import PhonemeVariants
+from src.infrastructure.tracing import LatencyHistogram
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+FILLERS = ["um", "uh", "okay", "so", "please", "now", "and", "then", "ya", "eh", "tolong", "sekarang"]
+OOV_WORDS = [
+    "revenue", "quarter", "growth", "chart", "customer", "market", "team", "budget", "result",
+    "data", "future", "question", "thank", "you", "everyone", "today", "presentasi", "hasil",
+    "tahun", "kami", "penjualan", "produk", "lihat", "gambar", "berikut", "terima", "kasih",
+]
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+DEFAULT_MIX = {"command": 0.4, "variant": 0.3, "noisy": 0.2, "oov": 0.1}
+PADDING_COMMAND = "load_padding"
+
+
+# ---------- utterance generation ----------
+
+class UtteranceGenerator:
+    """Endless, seeded stream of (category, text) drawn from the detector's own phrases"""
+
+    def __init__(self, base_phrases: List[str], mix: Dict[str, float], seed: int) -> None:
+        self.rnd = random.Random(seed)
+        self.base_phrases = base_phrases
+        self.categories = list(mix)
+        self.weights = [mix[c] for c in self.categories]
+        self.variants = {phrase: PhonemeVariants.generate_variants(phrase) for phrase in base_phrases}
+
+    def _typo(self, text: str) -> str:
+        chars = list(text)
+        chars[self.rnd.randrange(len(chars))] = self.rnd.choice(ALPHABET)
+        return "".join(chars)
+
+    def next(self) -> Tuple[str, str]:
+        category = self.rnd.choices(self.categories, self.weights)[0]
+        phrase = self.rnd.choice(self.base_phrases)
+        if category == "command":
+            return category, phrase
+        if category == "variant":
+            variant = self.rnd.choice(self.variants[phrase])
+            return category, self._typo(variant) if self.rnd.random() < 0.3 else variant
+        if category == "noisy":
+            before = self.rnd.sample(FILLERS, self.rnd.randint(0, 2))
+            after = self.rnd.sample(FILLERS, self.rnd.randint(0, 2))
+            return category, " ".join(before + [phrase] + after)
+        words = [self.rnd.choice(OOV_WORDS) for _ in range(self.rnd.randint(1, 6))]
+        if self.rnd.random() < 0.3:
+            words.append("".join(self.rnd.choice(ALPHABET) for _ in range(self.rnd.randint(3, 9))))
+        return category, " ".join(words)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        while True:
+            yield self.next()
+
+
+def padding_phrases(size: int, seed: int) -> List[str]:
+    """Synthetic two/three-word phrases that look like vocabulary but name no real command"""
+    rnd = random.Random(seed)
+    phrases = set()
+    while len(phrases) < size:
+        words = ["".join(rnd.choice(ALPHABET) for _ in range(rnd.randint(3, 8))) for _ in range(rnd.randint(2, 3))]
+        phrases.add(" ".join(words))
+    return sorted(phrases)
+
+
+# ---------- worker ----------
+
+def _peak_rss_mb() -> float:
+    if not RESOURCE_AVAILABLE:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+def worker(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a detector, run job['count'] utterances through detect(), return the measurements"""
+    # Keep the load's misses out of the real unrecognized-command log
+    from src.infrastructure.config import get_config
+    get_config().set("storage.unrecognized_log", str(Path(job["scratch"]) / f"unrecognized-{os.getpid()}.jsonl"))
+    from src.core.voice_detector import SmartVoiceDetector
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        build_start = time.perf_counter()
+        detector = SmartVoiceDetector()
+        base_phrases = [phrase for command in detector.wake_words.values()
+                        for phrase in command["phrases"] if phrase not in detector.generated_variants]
+        if job["table_size"]:
+            detector.wake_words[PADDING_COMMAND] = {
+                "phrases": padding_phrases(job["table_size"], job["seed"]),
+                "weight": 1,
+                "description": "Synthetic load padding",
+            }
+            detector.rebuild_index()
+        build_ms = (time.perf_counter() - build_start) * 1000
+        detector.cooldown_seconds = 0
+
+        generator = UtteranceGenerator(base_phrases, job["mix"], job["seed"])
+        for _, text in zip(range(job["warmup"]), generator):
+            detector.detect(text)
+
+        histogram = LatencyHistogram()
+        categories: Dict[str, Dict[str, int]] = {}
+        clock = time.perf_counter_ns
+        started = time.perf_counter()
+        for _, (category, text) in zip(range(job["count"]), generator):
+            start = clock()
+            result = detector.detect(text)
+            histogram.record((clock() - start) / 1e6)
+            tally = categories.setdefault(category, {"total": 0, "matched": 0})
+            tally["total"] += 1
+            tally["matched"] += bool(result and result.get("command") not in (None, "unknown"))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "count": job["count"],
+        "elapsed": elapsed,
+        "build_ms": build_ms,
+        "phrases": len(detector.phrase_index.phrases),
+        "histogram": histogram,
+        "categories": categories,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+# ---------- driver ----------
+
+def run_config(processes: int, table_size: int, utterances: int, mix: Dict[str, float],
+               seed: int, warmup: int, scratch: str) -> Dict[str, Any]:
+    """All processes start together; throughput is total utterances / slowest worker"""
+    share, extra = divmod(utterances, processes)
+    jobs = [{
+        "count": share + (i < extra), "table_size": table_size, "mix": mix,
+        "seed": seed + i, "warmup": warmup, "scratch": scratch,
+    } for i in range(processes)]
+
+    wall_start = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(worker, jobs)
+    wall = time.perf_counter() - wall_start
+
+    histogram = LatencyHistogram()
+    categories: Dict[str, Dict[str, int]] = {}
+    for result in results:
+        histogram.merge(result["histogram"])
+        for category, tally in result["categories"].items():
+            total = categories.setdefault(category, {"total": 0, "matched": 0})
+            total["total"] += tally["total"]
+            total["matched"] += tally["matched"]
+
+    slowest = max(result["elapsed"] for result in results)
+    return {
+        "processes": processes,
+        "table_size": table_size,
+        "phrases": results[0]["phrases"],
+        "utterances": utterances,
+        "throughput": utterances / slowest if slowest else 0.0,
+        "per_process_throughput": [r["count"] / r["elapsed"] for r in results if r["elapsed"]],
+        "wall_seconds": wall,
+        "build_ms": max(r["build_ms"] for r in results),
+        "latency_ms": histogram.summary(),
+        "match_rate": {c: t["matched"] / t["total"] for c, t in categories.items() if t["total"]},
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in results),
+    }
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """'command=0.4,variant=0.3,...' -> weights"""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown category '{name}' (choose from {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Multi-process load test for SmartVoiceDetector.detect")
+    parser.add_argument("--utterances", type=int, default=200000, help="Utterances per configuration (split across processes)")
+    parser.add_argument("--processes", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--table-sizes", nargs="+", type=int, default=[0], help="Synthetic phrases added to the table")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX)
+    parser.add_argument("--warmup", type=int, default=200, help="Untimed utterances per process")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    print(f"\nDETECTOR LOAD TEST ({args.utterances:,} utterances per run, {os.cpu_count()} CPUs)")
+    print("=" * 60)
+    print(f"  {'phrases':>8} {'procs':>5} {'utt/s':>9} {'scale':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'RSS MB':>7}")
+
+    runs = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for table_size in args.table_sizes:
+            single = None
+            for processes in args.processes:
+                run = run_config(processes, table_size, args.utterances, args.mix, args.seed, args.warmup, scratch)
+                if single is None:
+                    single = run["throughput"] / processes
+                # Scaling efficiency vs the first (usually single-process) configuration
+                run["efficiency"] = run["throughput"] / (single * processes) if single else 0.0
+                runs.append(run)
+                latency = run["latency_ms"]
+                print(f"  {run['phrases']:>8} {processes:>5} {run['throughput']:>9.0f} {run['efficiency']:>6.0%} "
+                      f"{latency['p50_ms']:>6.3f}ms {latency['p95_ms']:>6.3f}ms {latency['p99_ms']:>6.3f}ms "
+                      f"{latency['max_ms']:>6.1f}ms {run['peak_rss_mb']:>7.0f}")
+
+    print("=" * 60)
+    for table_size in args.table_sizes:
+        table_runs = [r for r in runs if r["table_size"] == table_size]
+        best = max(table_runs, key=lambda r: r["throughput"])
+        print(f"  +{table_size} phrases: saturates at ~{best['throughput']:,.0f} utt/s with {best['processes']} processes")
+    rates = runs[-1]["match_rate"]
+    print("  match rate: " + ", ".join(f"{c} {rate:.0%}" for c, rate in sorted(rates.items())))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"cpus": os.cpu_count(), "utterances": args.utterances, "mix": args.mix, "runs": runs}, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
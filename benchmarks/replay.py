@@ -0,0 +1,308 @@
+"""
+Replay benchmark: recorded commands through recognizer backends and the detector
+
+Feeds a corpus of WAV recordings through each recognizer backend and then
+SmartVoiceDetector.detect, with no microphone, and reports command
+accuracy, false-trigger rate (distractor speech that fired a command),
+wrong-command rate and per-stage latency percentiles. Results are written
+as JSON so runs can be compared (--compare).
+
+Corpus: a directory of WAV files plus corpus.json, e.g.
+    [{"file": "next_us_01.wav", "transcript": "next slide", "command": "next",
+      "accent": "en-US", "noise": "quiet"},
+     {"file": "chatter_01.wav", "transcript": "as you can see here", "command": null}]
+"command" is the expected verdict; null marks a distractor. A bench_grammar
+transcripts.json ({"file.wav": "phrase"}) is accepted as well, the expected
+command then being the detector's verdict on the reference transcript.
+
+Backends:
+    vosk        offline Kaldi decoding with --model (default; no network)
+    google      Google Web Speech API (needs network)
+    transcript  the reference text itself: detector-only baseline, no model
+
+--snr 20 10 replays every file again with white noise mixed in at those
+signal-to-noise ratios (seeded), to see how accuracy degrades.
+
+Usage:
+    python benchmarks/replay.py [--corpus benchmarks/fixtures/commands] [--backends vosk transcript]
+                                [--snr 20 10] [--compare benchmarks/results/replay-<stamp>.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import speech_recognition as sr
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.recognizer_backends import GoogleBackend, RecognizerBackend, VoskBackend
+from src.core.voice_detector import SmartVoiceDetector
+from src.infrastructure.config import get_config
+from src.infrastructure.tracing import LatencyHistogram
+
+DEFAULT_CORPUS = Path(__file__).parent / "fixtures" / "commands"
+DEFAULT_RESULTS = Path(__file__).parent / "results"
+TRANSCRIPT_BACKEND = "transcript"
+
+
+# ---------- corpus ----------
+
+def load_corpus(directory: Path, detector: SmartVoiceDetector) -> List[Dict[str, Any]]:
+    """Entries (file, transcript, command, accent, noise) whose WAV exists"""
+    corpus_file = directory / "corpus.json"
+    transcripts_file = directory / "transcripts.json"
+    if corpus_file.exists():
+        with open(corpus_file, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    elif transcripts_file.exists():
+        with open(transcripts_file, "r", encoding="utf-8") as f:
+            entries = [
+                {"file": name, "transcript": text, "command": command_of(detector, text)[0]}
+                for name, text in sorted(json.load(f).items())
+            ]
+    else:
+        return []
+
+    corpus = []
+    for entry in entries:
+        path = directory / entry["file"]
+        if not path.exists():
+            continue
+        corpus.append({
+            "path": path,
+            "file": entry["file"],
+            "transcript": entry.get("transcript", "").lower().strip(),
+            "command": entry.get("command"),
+            "accent": entry.get("accent", "unspecified"),
+            "noise": entry.get("noise", "unspecified"),
+        })
+    return corpus
+
+
+def read_audio(path: Path) -> sr.AudioData:
+    with sr.AudioFile(str(path)) as source:
+        return sr.Recognizer().record(source)
+
+
+def add_noise(audio: sr.AudioData, snr_db: float, rng: np.random.Generator) -> sr.AudioData:
+    """Copy of audio with white noise at snr_db relative to the signal power"""
+    samples = np.frombuffer(audio.get_raw_data(convert_width=2), dtype=np.int16).astype(np.float64)
+    power = float(np.mean(samples ** 2)) or 1.0
+    noise = rng.normal(0.0, np.sqrt(power / 10 ** (snr_db / 10)), len(samples))
+    mixed = np.clip(samples + noise, -32768, 32767).astype(np.int16)
+    return sr.AudioData(mixed.tobytes(), audio.sample_rate, 2)
+
+
+# ---------- stages ----------
+
+def make_backend(name: str, model_path: str, language: str) -> Optional[RecognizerBackend]:
+    """
+    Backend by name (None for the transcript baseline)
+
+    Raises:
+        sr.RequestError: engine unusable here (missing package / model)
+    """
+    if name == TRANSCRIPT_BACKEND:
+        return None
+    if name == VoskBackend.name:
+        return VoskBackend(model_path)
+    if name == GoogleBackend.name:
+        return GoogleBackend(sr.Recognizer(), language)
+    raise sr.RequestError(f"Unknown backend: {name}")
+
+
+def command_of(detector: SmartVoiceDetector, text: str) -> Tuple[Optional[str], float]:
+    """The command detect() would execute for text (None = nothing) and its latency in ms"""
+    detector.last_execution_time = float("-inf")  # Replayed utterances are not subject to the cooldown
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = detector.detect(text) if text else None
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    command = result.get("command") if result else None
+    return (None if command == "unknown" else command), elapsed_ms
+
+
+def replay(corpus: List[Dict[str, Any]], backend: Optional[RecognizerBackend],
+           detector: SmartVoiceDetector, snr_db: Optional[float], seed: int) -> Dict[str, Any]:
+    """One pass over the corpus with one backend and noise condition"""
+    rng = np.random.default_rng(seed)
+    recognize_ms, detect_ms = LatencyHistogram(), LatencyHistogram()
+    rtf: List[float] = []
+    tallies: Dict[str, Dict[str, Dict[str, int]]] = {"accent": defaultdict(lambda: defaultdict(int)),
+                                                     "noise": defaultdict(lambda: defaultdict(int))}
+    counts = defaultdict(int)
+    failures = []
+
+    for entry in corpus:
+        hypothesis = entry["transcript"]
+        if backend is not None:
+            audio = read_audio(entry["path"])
+            if snr_db is not None:
+                audio = add_noise(audio, snr_db, rng)
+            start = time.perf_counter()
+            try:
+                hypothesis = backend.recognize(audio)
+            except sr.UnknownValueError:
+                hypothesis = ""
+            except sr.RequestError:
+                hypothesis = ""
+                counts["engine_errors"] += 1
+            elapsed = time.perf_counter() - start
+            recognize_ms.record(elapsed * 1000)
+            duration = len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+            if duration:
+                rtf.append(elapsed / duration)
+
+        command, elapsed_ms = command_of(detector, hypothesis)
+        detect_ms.record(elapsed_ms)
+
+        expected = entry["command"]
+        counts["utterances"] += 1
+        if expected is None:
+            counts["distractors"] += 1
+            counts["false_triggers"] += command is not None
+            correct = command is None
+        else:
+            counts["commands"] += 1
+            counts["correct"] += command == expected
+            counts["wrong_command"] += command is not None and command != expected
+            counts["missed"] += command is None
+            correct = command == expected
+        for tag in ("accent", "noise"):
+            tallies[tag][entry[tag]]["total"] += 1
+            tallies[tag][entry[tag]]["correct"] += correct
+        if not correct:
+            failures.append({"file": entry["file"], "expected": expected, "got": command,
+                             "hypothesis": hypothesis})
+
+    return {
+        "utterances": counts["utterances"],
+        "command_accuracy": counts["correct"] / counts["commands"] if counts["commands"] else None,
+        "false_trigger_rate": counts["false_triggers"] / counts["distractors"] if counts["distractors"] else None,
+        "wrong_command_rate": counts["wrong_command"] / counts["commands"] if counts["commands"] else None,
+        "missed_rate": counts["missed"] / counts["commands"] if counts["commands"] else None,
+        "engine_errors": counts["engine_errors"],
+        "mean_rtf": float(np.mean(rtf)) if rtf else None,
+        "latency_ms": {
+            "recognize": recognize_ms.summary() if recognize_ms.count else None,
+            "detect": detect_ms.summary(),
+        },
+        "by_accent": {k: v["correct"] / v["total"] for k, v in tallies["accent"].items()},
+        "by_noise": {k: v["correct"] / v["total"] for k, v in tallies["noise"].items()},
+        "failures": failures,
+    }
+
+
+# ---------- reporting ----------
+
+def _pct(value: Optional[float]) -> str:
+    return "   n/a" if value is None else f"{value:6.1%}"
+
+
+def print_report(runs: Dict[str, Dict[str, Any]]) -> None:
+    print(f"\n  {'run':<22} {'accuracy':>9} {'false trig':>11} {'wrong cmd':>10} "
+          f"{'rec p50':>8} {'rec p95':>8} {'det p95':>8}")
+    for name, run in runs.items():
+        recognize = run["latency_ms"]["recognize"] or {}
+        print(f"  {name:<22} {_pct(run['command_accuracy']):>9} {_pct(run['false_trigger_rate']):>11} "
+              f"{_pct(run['wrong_command_rate']):>10} {recognize.get('p50_ms', 0):7.0f}ms "
+              f"{recognize.get('p95_ms', 0):7.0f}ms {run['latency_ms']['detect']['p95_ms']:7.2f}ms")
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    """Print metric deltas for runs present in both result files"""
+    print(f"\n  vs {previous.get('timestamp', '?')}")
+    for name, run in current["runs"].items():
+        old = previous.get("runs", {}).get(name)
+        if old is None:
+            continue
+        deltas = []
+        for metric in ("command_accuracy", "false_trigger_rate", "wrong_command_rate"):
+            if run[metric] is not None and old.get(metric) is not None:
+                deltas.append(f"{metric} {run[metric] - old[metric]:+.1%}")
+        new_rec, old_rec = run["latency_ms"]["recognize"], old["latency_ms"].get("recognize")
+        if new_rec and old_rec:
+            deltas.append(f"recognize p95 {new_rec['p95_ms'] - old_rec['p95_ms']:+.0f}ms")
+        print(f"  {name:<22} " + ", ".join(deltas))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded commands through recognizers and the detector")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--backends", nargs="+", default=[VoskBackend.name],
+                        choices=[VoskBackend.name, GoogleBackend.name, TRANSCRIPT_BACKEND])
+    parser.add_argument("--model", default="model")
+    parser.add_argument("--language", default="en-US", help="Google language code")
+    parser.add_argument("--snr", nargs="*", type=float, default=[], help="Extra passes with white noise at these SNRs (dB)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Results JSON (default benchmarks/results/replay-<time>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results JSON to diff against")
+    args = parser.parse_args()
+
+    # Misses are logged by detect(); keep them out of the real unrecognized-command log
+    scratch = tempfile.TemporaryDirectory()
+    get_config().set("storage.unrecognized_log", str(Path(scratch.name) / "unrecognized.jsonl"))
+
+    detector = SmartVoiceDetector()
+    corpus = load_corpus(args.corpus, detector)
+    if not corpus:
+        print(f"No recordings found in {args.corpus} (need *.wav + corpus.json or transcripts.json)")
+        sys.exit(1)
+
+    print(f"\nREPLAY BENCHMARK ({len(corpus)} recordings from {args.corpus})")
+    print("=" * 60)
+
+    runs: Dict[str, Dict[str, Any]] = {}
+    for name in args.backends:
+        try:
+            backend = make_backend(name, args.model, args.language)
+        except sr.RequestError as e:
+            print(f"  [SKIP] {name}: {e}")
+            continue
+        conditions = [None] if backend is None else [None] + args.snr
+        for snr_db in conditions:
+            label = f"{name}/clean" if snr_db is None else f"{name}/snr{snr_db:g}"
+            runs[label] = replay(corpus, backend, detector, snr_db, args.seed)
+        if backend is not None:
+            backend.close()
+
+    if not runs:
+        print("No backend could run")
+        sys.exit(1)
+
+    print_report(runs)
+    print("=" * 60)
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "corpus": str(args.corpus),
+        "recordings": len(corpus),
+        "model": args.model,
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "runs": runs,
+    }
+    output = args.output or DEFAULT_RESULTS / f"replay-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,22 @@ __version__ = "2.0.0"
 __author__ = "SlideSense Team"
 __description__ = "Voice-controlled PowerPoint presentation with accessibility features"
 
-# Import main components for easy access
-try:
-    from src.core.voice_detector import SmartVoiceDetector
-    from src.core.voice_recognizer import HybridVoiceRecognizer
-    from src.core.powerpoint_controller import PowerPointController
-    from src.core.accessibility_popup import AccessibilityPopup
-    from src.infrastructure.logger import get_logger
-    from src.infrastructure.config import get_config
-except ImportError:
-    pass
+# Main components for easy access, imported on first use so that importing
+# any src.* module does not load the recognizers, pyautogui or Tk
+_EXPORTS = {
+    "SmartVoiceDetector": "src.core.voice_detector",
+    "HybridVoiceRecognizer": "src.core.voice_recognizer",
+    "PowerPointController": "src.core.powerpoint_controller",
+    "AccessibilityPopup": "src.core.accessibility_popup",
+    "get_logger": "src.infrastructure.logger",
+    "get_config": "src.infrastructure.config",
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'src' has no attribute '{name}'")
+    import importlib
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -14,6 +14,8 @@ from datetime import datetime, timedelta
 import json
 import os
 
+from src.infrastructure.telemetry import get_telemetry
+
 class AccessibilityPopup:
     """
     Popup overlay untuk membantu audiens difabel dalam presentasi fullscreen
@@ -414,6 +416,11 @@ class AccessibilityPopup:
         if len(self.analytics['interaction_events']) > 100:
             self.analytics['interaction_events'].pop(0)
 
+        # Full history goes to the telemetry database
+        telemetry = get_telemetry()
+        if telemetry:
+            telemetry.record_event(event_type, details)
+
     def get_analytics_summary(self) -> Dict[str, Any]:
         """Get analytics summary"""
         duration = datetime.now() - self.analytics['start_time']
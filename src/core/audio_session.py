@@ -0,0 +1,347 @@
+# ============================================
+# AUDIO SESSION - One long-lived microphone stream shared by all consumers
+# ============================================
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import speech_recognition as sr
+
+from src.infrastructure.exceptions import AudioProcessingError
+from src.infrastructure.logger import get_logger
+
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+# ---------- device enumeration (cached) ----------
+
+_devices: Optional[List[Dict[str, Any]]] = None
+_devices_lock = threading.Lock()
+
+
+def list_input_devices(refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Input devices as [{'index', 'name', 'channels', 'rate'}]
+
+    PortAudio only re-scans hardware when a PyAudio instance is created, so
+    the list is built once and reused; pass refresh=True after a hot-plug
+    (AudioSession does this itself when its device disappears).
+    """
+    global _devices
+    with _devices_lock:
+        if _devices is None or refresh:
+            _devices = _enumerate_devices()
+        return [dict(device) for device in _devices]
+
+
+def _enumerate_devices() -> List[Dict[str, Any]]:
+    if not PYAUDIO_AVAILABLE:
+        return []
+    audio = pyaudio.PyAudio()
+    try:
+        devices = []
+        for i in range(audio.get_device_count()):
+            info = audio.get_device_info_by_index(i)
+            if info.get('maxInputChannels', 0) > 0:
+                devices.append({
+                    'index': i,
+                    'name': info.get('name', 'Unknown'),
+                    'channels': info.get('maxInputChannels', 0),
+                    'rate': int(info.get('defaultSampleRate', 16000)),
+                })
+        return devices
+    finally:
+        audio.terminate()
+
+
+# ---------- session ----------
+
+class Subscription:
+    """
+    One consumer's view of the live stream
+
+    Chunks are queued as they arrive; if the consumer falls behind, the
+    oldest chunks are dropped so a late reader never gets stale audio.
+    """
+
+    def __init__(self, session: "AudioSession", max_chunks: int) -> None:
+        self.session = session
+        self._chunks: Deque[Tuple[int, bytes]] = deque(maxlen=max_chunks)
+        self._ready = threading.Condition()
+        self._pending = b""
+        self.dropped = 0
+        self.last_read = 0  # Stream position (chunk number) of the last chunk read
+
+    def _push(self, chunk: bytes, position: int = 0) -> None:
+        with self._ready:
+            if len(self._chunks) == self._chunks.maxlen:
+                self.dropped += 1
+            self._chunks.append((position, chunk))
+            self._ready.notify()
+
+    def read(self, frames: int, timeout: float = 1.0) -> bytes:
+        """
+        Next `frames` frames of PCM
+
+        Returns silence if the device stalls for `timeout`, so callers that
+        count buffers (speech_recognition's listen) still time out normally.
+        """
+        needed = frames * self.session.sample_width
+        data = self._pending
+        while len(data) < needed:
+            with self._ready:
+                if not self._chunks and not self._ready.wait_for(lambda: self._chunks, timeout):
+                    data += b"\x00" * (needed - len(data))
+                    break
+                self.last_read, chunk = self._chunks.popleft()
+                data += chunk
+        self._pending = data[needed:]
+        return data[:needed]
+
+    def close(self) -> None:
+        self.session.unsubscribe(self)
+
+
+class PreRoll:
+    """
+    The most recent chunks of the stream, numbered, and how far consumers got
+
+    A new subscriber is primed only with chunks no earlier subscriber has
+    read, so the tail of an utterance cut off by phrase_time_limit is not
+    fed into the next listen() a second time.
+    """
+
+    def __init__(self, max_chunks: int) -> None:
+        self._chunks: Deque[Tuple[int, bytes]] = deque(maxlen=max_chunks)
+        self.position = 0  # Number of the newest chunk
+        self.consumed = 0  # Number of the newest chunk any subscriber has read
+
+    def append(self, chunk: bytes) -> int:
+        self.position += 1
+        self._chunks.append((self.position, chunk))
+        return self.position
+
+    def mark_consumed(self, position: int) -> None:
+        self.consumed = max(self.consumed, position)
+
+    def unconsumed(self) -> List[Tuple[int, bytes]]:
+        return [(position, chunk) for position, chunk in self._chunks if position > self.consumed]
+
+    def clear(self) -> None:
+        self._chunks.clear()
+
+
+class SessionSource(sr.AudioSource):
+    """
+    speech_recognition AudioSource backed by an AudioSession
+
+    Entering the context subscribes to the already-running stream instead of
+    opening the device, so `with recognizer.microphone as source:` is free.
+    """
+
+    class _Stream:
+        def __init__(self, source: "SessionSource", subscription: Subscription) -> None:
+            self._source = source
+            self._subscription = subscription
+            self._processed = b""
+
+        def read(self, size: int) -> bytes:
+            transform = self._source.transform
+            if transform is None:
+                return self._subscription.read(size)
+
+            # Streaming transforms may hold back part of a chunk; top up until size frames
+            needed = size * self._source.SAMPLE_WIDTH
+            data = self._processed
+            while len(data) < needed:
+                data += transform.process(self._subscription.read(size))
+            self._processed = data[needed:]
+            return data[:needed]
+
+        def close(self) -> None:
+            self._subscription.close()
+
+    def __init__(self, session: "AudioSession", transform: Optional[Any] = None) -> None:
+        self.session = session
+        self.transform = transform  # Optional .process(bytes) -> bytes stage, e.g. SpectralGate
+        self.device_index = session.device_index
+        self.format = session.format
+        self.SAMPLE_WIDTH = session.sample_width
+        self.SAMPLE_RATE = session.sample_rate
+        self.CHUNK = session.chunk_size
+        self.stream = None
+
+    def __enter__(self) -> "SessionSource":
+        assert self.stream is None, "This audio source is already inside a context manager"
+        self.session.open()
+        if self.transform is not None:
+            self.transform.reset()
+        self.stream = SessionSource._Stream(self, self.session.subscribe())
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stream.close()
+        self.stream = None
+
+
+class AudioSession:
+    """
+    Keeps one PyAudio input stream open for the whole run
+
+    A reader thread pulls fixed-size chunks and fans them out to every
+    subscriber. The last `preroll_seconds` of audio are kept and handed to
+    new subscribers, minus anything an earlier subscriber already read.
+    This covers a short gap between two listen() calls. Audio older than
+    the pre-roll is still missed, e.g. while a slow recognition runs in
+    serial mode.
+    """
+
+    def __init__(self, device_index: Optional[int] = None, sample_rate: Optional[int] = None,
+                 chunk_size: int = 1024, preroll_seconds: float = 0.5,
+                 max_buffer_seconds: float = 5.0) -> None:
+        if not PYAUDIO_AVAILABLE:
+            raise AudioProcessingError("PyAudio not installed. Install with: pip install pyaudio")
+
+        self.device_index = device_index
+        self.chunk_size = chunk_size
+        self.format = pyaudio.paInt16
+        self.sample_width = pyaudio.get_sample_size(self.format)
+        self.sample_rate = sample_rate or self._device_rate(device_index)
+
+        chunks_per_second = self.sample_rate / chunk_size
+        self._preroll = PreRoll(max(1, int(preroll_seconds * chunks_per_second)))
+        self._max_chunks = max(1, int(max_buffer_seconds * chunks_per_second))
+
+        self._audio = None
+        self._stream = None
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.opens = 0
+        self.read_errors = 0
+
+    @staticmethod
+    def _device_rate(device_index: Optional[int]) -> int:
+        for device in list_input_devices():
+            if device_index is None or device['index'] == device_index:
+                return device['rate']
+        return 16000
+
+    @property
+    def is_open(self) -> bool:
+        return self._running.is_set()
+
+    def open(self) -> None:
+        """Open the device once; later calls are no-ops"""
+        with self._lock:
+            if self._running.is_set():
+                return
+            self._open_stream()
+            self._running.set()
+            self._thread = threading.Thread(target=self._reader, name="audio-session", daemon=True)
+            self._thread.start()
+
+    def _open_stream(self) -> None:
+        try:
+            self._audio = pyaudio.PyAudio()
+            self._stream = self._audio.open(
+                input_device_index=self.device_index, channels=1, format=self.format,
+                rate=self.sample_rate, frames_per_buffer=self.chunk_size, input=True,
+            )
+        except Exception as e:
+            if self._audio is not None:
+                self._audio.terminate()
+                self._audio = None
+            raise AudioProcessingError(f"Cannot open microphone {self.device_index}: {e}")
+        self.opens += 1
+
+    def _close_stream(self) -> None:
+        try:
+            if self._stream is not None:
+                self._stream.stop_stream()
+                self._stream.close()
+        except Exception:
+            pass
+        finally:
+            self._stream = None
+            if self._audio is not None:
+                self._audio.terminate()
+                self._audio = None
+
+    def _reader(self) -> None:
+        while self._running.is_set():
+            try:
+                chunk = self._stream.read(self.chunk_size, exception_on_overflow=False)
+            except Exception as e:
+                self.read_errors += 1
+                logger.warning(f"Microphone read failed, reopening: {e}")
+                self._reopen()
+                continue
+
+            with self._lock:
+                position = self._preroll.append(chunk)
+                subscribers = list(self._subscribers)
+            for subscription in subscribers:
+                subscription._push(chunk, position)
+
+    def _reopen(self) -> None:
+        """Device vanished or glitched: rescan devices and reopen"""
+        with self._lock:
+            self._close_stream()
+        while self._running.is_set():
+            list_input_devices(refresh=True)
+            try:
+                with self._lock:
+                    self._open_stream()
+                return
+            except AudioProcessingError as e:
+                logger.warning(str(e))
+                time.sleep(1.0)
+
+    def subscribe(self, preroll: bool = True) -> Subscription:
+        """Start receiving chunks (optionally starting with the unread part of the pre-roll)"""
+        subscription = Subscription(self, self._max_chunks)
+        with self._lock:
+            if preroll:
+                for position, chunk in self._preroll.unconsumed():
+                    subscription._push(chunk, position)
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._preroll.mark_consumed(subscription.last_read)
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def source(self) -> SessionSource:
+        """AudioSource for speech_recognition (Recognizer.listen, adjust_for_ambient_noise)"""
+        return SessionSource(self)
+
+    def close(self) -> None:
+        """Stop the reader thread and release the device"""
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+        with self._lock:
+            self._close_stream()
+            self._subscribers.clear()
+            self._preroll.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "open": self.is_open,
+            "opens": self.opens,
+            "read_errors": self.read_errors,
+            "subscribers": len(self._subscribers),
+            "sample_rate": self.sample_rate,
+        }
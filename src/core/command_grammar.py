@@ -0,0 +1,104 @@
+# ============================================
+# COMMAND GRAMMAR - Closed vocabulary for constrained Vosk decoding
+# ============================================
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from src.infrastructure.constants import MAIN_COMMANDS
+
+UNKNOWN_TOKEN = "[unk]"  # Vosk's garbage word: absorbs anything off-grammar
+
+_lexicons: Dict[str, Set[str]] = {}
+
+
+def load_lexicon(model_path: str = "model") -> Set[str]:
+    """
+    Words the model can decode
+
+    Prefers graph/words.txt (exact decoder vocabulary) and falls back to the
+    pronunciation dictionary shipped with the model. Result is cached per path.
+
+    Returns:
+        Set of lower-case words, empty if neither file exists
+    """
+    key = str(Path(model_path).resolve())
+    if key in _lexicons:
+        return _lexicons[key]
+
+    words: Set[str] = set()
+    words_file = Path(model_path) / "graph" / "words.txt"
+    dict_file = Path(model_path) / "cmudict-en-us.dict"
+    source = words_file if words_file.exists() else dict_file
+    if source.exists():
+        with open(source, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                # cmudict marks alternate pronunciations as "word(2)"
+                word = parts[0].split("(")[0].lower()
+                if word and not word.startswith(("<", "#")):
+                    words.add(word)
+    _lexicons[key] = words
+    return words
+
+
+def command_phrases(wake_words: Dict[str, Dict[str, Any]], exclude: Optional[Set[str]] = None,
+                    include_main_commands: bool = True) -> List[str]:
+    """
+    Every command phrase in table order (wake words first, then MAIN_COMMANDS keywords)
+
+    Args:
+        wake_words: Detector phrase table
+        exclude: Phrases to leave out, typically the detector's generated
+            phoneme variants - the grammar already forces the decoder onto
+            the nearest real phrase, so mis-hearing spellings only add arcs
+        include_main_commands: Also add the keywords from constants.MAIN_COMMANDS
+    """
+    exclude = exclude or set()
+    phrases: Dict[str, None] = {}
+    for data in wake_words.values():
+        for phrase in data["phrases"]:
+            if phrase not in exclude:
+                phrases[" ".join(phrase.lower().split())] = None
+    if include_main_commands:
+        for data in MAIN_COMMANDS.values():
+            for keyword in data["keywords"]:
+                phrases[" ".join(keyword.lower().split())] = None
+    return [phrase for phrase in phrases if phrase]
+
+
+def build_grammar(phrases: Iterable[str], vocabulary: Optional[Set[str]] = None,
+                  include_unknown: bool = True) -> List[str]:
+    """
+    Phrase list for vosk.KaldiRecognizer(model, rate, grammar)
+
+    Phrases containing words outside the model vocabulary are dropped
+    (Kaldi would reject the whole grammar otherwise). Phonetic spellings
+    such as "neks slaid" only exist for the fuzzy matcher and vanish here.
+
+    Args:
+        phrases: Candidate command phrases
+        vocabulary: Decodable words, None to keep every phrase
+        include_unknown: Append the [unk] garbage token
+    """
+    grammar = []
+    for phrase in phrases:
+        if vocabulary is None or all(word in vocabulary for word in phrase.split()):
+            grammar.append(phrase)
+    if include_unknown:
+        grammar.append(UNKNOWN_TOKEN)
+    return grammar
+
+
+def grammar_json(wake_words: Dict[str, Dict[str, Any]], model_path: str = "model",
+                 exclude: Optional[Set[str]] = None) -> str:
+    """JSON grammar string for the wake-word table, filtered by the model lexicon"""
+    vocabulary = load_lexicon(model_path) or None
+    return json.dumps(build_grammar(command_phrases(wake_words, exclude), vocabulary))
+
+
+def strip_unknown(text: str) -> str:
+    """Remove [unk] tokens from a grammar-mode transcript"""
+    return " ".join(word for word in text.split() if word != UNKNOWN_TOKEN)
@@ -0,0 +1,198 @@
+# ============================================
+# COMMAND SCHEDULER - Per-command debounce and coalescing between detect and execute
+# ============================================
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from src.infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CommandPolicy:
+    """
+    How repeats of one command are handled
+
+    debounce: a repeat accepted less than this many seconds after the last
+              accepted one is dropped (toggles like "open slide show" heard
+              twice); 0 never drops
+    coalesce: a repeat that arrives while the previous one is still waiting
+              for the executor joins it, so "next slide" x3 said quickly
+              runs as one batch of three key presses
+    """
+
+    def __init__(self, debounce: float = 0.0, coalesce: bool = False) -> None:
+        self.debounce = debounce
+        self.coalesce = coalesce
+
+
+DEFAULT_POLICY = CommandPolicy(debounce=1.0)
+DEFAULT_POLICIES: Dict[str, CommandPolicy] = {
+    # Navigation is counted: every utterance is one slide
+    "next": CommandPolicy(coalesce=True),
+    "previous": CommandPolicy(coalesce=True),
+    # Toggles and dialogs: a quick repeat is almost always the same request
+    "open_slideshow": CommandPolicy(debounce=2.0),
+    "close_slideshow": CommandPolicy(debounce=2.0),
+    "help": CommandPolicy(debounce=2.0),
+    "stop": CommandPolicy(),
+}
+
+
+class ScheduledCommand:
+    """One executor task: a command plus every queued repeat coalesced into it"""
+
+    def __init__(self, command: Optional[str], item: Any, submitted_at: float) -> None:
+        self.command = command
+        self.items: List[Any] = [item]
+        self.submitted_at = submitted_at
+
+    @property
+    def item(self) -> Any:
+        return self.items[0]
+
+    @property
+    def count(self) -> int:
+        return len(self.items)
+
+
+class CommandScheduler:
+    """
+    Bounded queue of detected commands, ordered, on a monotonic clock
+
+    Replaces the detector's global cooldown: debounce is per command (see
+    CommandPolicy), so "next" followed at once by "previous" both run, and
+    nothing ever sleeps. key(item) names the command an item carries; items
+    whose key is None (unknown speech) pass through in order, unthrottled.
+
+    Usable directly (put_nowait / drain) or as a pipeline Stage inbox: get()
+    hands out ScheduledCommand entries; put() enqueues control items (e.g.
+    the pipeline's stop sentinel) verbatim, bypassing policy and capacity.
+    """
+
+    def __init__(self, key: Callable[[Any], Optional[str]] = lambda item: item,
+                 policies: Optional[Dict[str, CommandPolicy]] = None,
+                 default_policy: CommandPolicy = DEFAULT_POLICY, max_pending: int = 8,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.key = key
+        self.policies = dict(DEFAULT_POLICIES)
+        if policies:
+            self.policies.update(policies)
+        self.default_policy = default_policy
+        self.max_pending = max_pending
+        self.clock = clock
+
+        self._pending: Deque[Any] = deque()
+        self._ready = threading.Condition()
+        self._last_accepted: Dict[str, float] = {}
+
+        self.submitted = 0
+        self.debounced = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def policy(self, command: str) -> CommandPolicy:
+        return self.policies.get(command, self.default_policy)
+
+    # ---------- producer side ----------
+
+    def put_nowait(self, item: Any) -> bool:
+        """
+        Schedule one detected item
+
+        Returns:
+            False if the command was debounced (dropped on purpose)
+
+        Raises:
+            queue.Full: max_pending distinct tasks are already waiting
+        """
+        command = self.key(item)
+        with self._ready:
+            self.submitted += 1
+            now = self.clock()
+            if command is not None:
+                policy = self.policy(command)
+                if self._debounced(command, now):
+                    return False
+
+                tail = self._pending[-1] if self._pending else None
+                if policy.coalesce and isinstance(tail, ScheduledCommand) and tail.command == command:
+                    tail.items.append(item)
+                    self._last_accepted[command] = now
+                    self.coalesced += 1
+                    return True
+
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                raise queue.Full
+            if command is not None:
+                self._last_accepted[command] = now
+            self._pending.append(ScheduledCommand(command, item, now))
+            self._ready.notify()
+            return True
+
+    def admit(self, command: str) -> bool:
+        """
+        Debounce check for a command run outside the queue (a further step
+        of a multi-command utterance); counts as accepted when it passes
+        """
+        with self._ready:
+            now = self.clock()
+            if self._debounced(command, now):
+                return False
+            self._last_accepted[command] = now
+            return True
+
+    def retry_after(self, command: str) -> float:
+        """Seconds until a repeat of command would pass debounce (0 = now)"""
+        with self._ready:
+            last = self._last_accepted.get(command)
+            if last is None:
+                return 0.0
+            return max(0.0, self.policy(command).debounce - (self.clock() - last))
+
+    def _debounced(self, command: str, now: float) -> bool:
+        policy = self.policy(command)
+        last = self._last_accepted.get(command)
+        if last is not None and now - last < policy.debounce:
+            self.debounced += 1
+            logger.debug(f"Debounced '{command}' ({now - last:.2f}s < {policy.debounce}s)")
+            return True
+        return False
+
+    def put(self, item: Any) -> None:
+        """Enqueue a control item as-is (get() returns it unwrapped)"""
+        with self._ready:
+            self._pending.append(item)
+            self._ready.notify()
+
+    # ---------- consumer side ----------
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Oldest task, or raise queue.Empty after timeout"""
+        with self._ready:
+            if not self._pending and not self._ready.wait_for(lambda: self._pending, timeout):
+                raise queue.Empty
+            return self._pending.popleft()
+
+    def drain(self) -> List[Any]:
+        """Everything waiting, oldest first"""
+        with self._ready:
+            tasks = list(self._pending)
+            self._pending.clear()
+            return tasks
+
+    def qsize(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "submitted": self.submitted,
+            "debounced": self.debounced,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "pending": self.qsize(),
+        }
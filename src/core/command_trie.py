@@ -0,0 +1,177 @@
+# ============================================
+# COMMAND TRIE - Token-prefix matcher for wake-word phrases
+# ============================================
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.core.phoneme_variants import PhonemeVariants
+from src.core.phrase_index import PhraseIndex
+
+
+class TrieNode:
+    """One token edge deep; commands = every command with a phrase at or below"""
+
+    __slots__ = ("children", "terminals", "commands", "depth")
+
+    def __init__(self, depth: int = 0) -> None:
+        self.children: Dict[str, "TrieNode"] = {}
+        self.terminals: List[int] = []  # Phrase ids ending here
+        self.commands: Set[str] = set()
+        self.depth = depth
+
+    def extending_commands(self) -> Set[str]:
+        """Commands with a phrase strictly longer than the path to this node"""
+        commands: Set[str] = set()
+        for child in self.children.values():
+            commands |= child.commands
+        return commands
+
+
+class CommandTrie:
+    """
+    Phrases of a PhraseIndex as a trie of phonetically normalized tokens
+
+    Wake-word phrases are a handful of tokens each, so walking the input one
+    word at a time with a frontier of live hypotheses (start position, trie
+    node) costs O(input tokens x frontier) and never revisits the phrase
+    table. Edges use PhonemeVariants._to_phonetic, so generated variants
+    that only differ in diacritics share one path. Phrase ids and scores are
+    the PhraseIndex's: a completed phrase scores weight + CONTAINS_BONUS,
+    or EXACT_BONUS when it spans the whole utterance.
+    """
+
+    def __init__(self, index: PhraseIndex) -> None:
+        self.index = index
+        self.root = TrieNode()
+        self.node_count = 1
+        self._phonetic: Dict[str, str] = {}
+        for pid, phrase in enumerate(index.phrases):
+            tokens = self.tokenize(phrase)
+            if not tokens:
+                continue
+            command = index.commands[pid]
+            node = self.root
+            node.commands.add(command)
+            for token in tokens:
+                child = node.children.get(token)
+                if child is None:
+                    child = node.children[token] = TrieNode(node.depth + 1)
+                    self.node_count += 1
+                node = child
+                node.commands.add(command)
+            node.terminals.append(pid)
+
+    def normalize(self, word: str) -> str:
+        token = self._phonetic.get(word)
+        if token is None:
+            token = self._phonetic[word] = PhonemeVariants._to_phonetic(word)
+        return token
+
+    def tokenize(self, text: str) -> List[str]:
+        return [self.normalize(word) for word in text.split()]
+
+    def walker(self) -> "TrieWalker":
+        return TrieWalker(self)
+
+    def matches(self, text: str) -> List[Tuple[int, int, int]]:
+        """Every token-aligned phrase occurrence as (start, end, phrase id)"""
+        walker = self.walker()
+        for token in text.split():
+            walker.push(token)
+        return walker.matches
+
+    def segment(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Split an utterance into the commands it names, in spoken order
+
+        Leftmost-longest: at each position the longest phrase wins (ties by
+        score, then phrase order), so "stop slide show" is one close command,
+        while "next slide next slide" is two next commands.
+
+        Returns:
+            Detector result dicts (see PhraseIndex.result), possibly empty
+        """
+        matches = self.matches(text)
+        total = len(text.split())
+        weights = self.index.weights
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0]), -weights[m[2]], m[2]))
+
+        sequence = []
+        position = 0
+        for start, end, pid in matches:
+            if start < position:
+                continue
+            exact = start == 0 and end == total
+            bonus = PhraseIndex.EXACT_BONUS if exact else PhraseIndex.CONTAINS_BONUS
+            sequence.append(self.index.result(pid, weights[pid] + bonus))
+            position = end
+        return sequence
+
+    def stats(self) -> Dict[str, int]:
+        return {"nodes": self.node_count, "root_edges": len(self.root.children)}
+
+
+class TrieWalker:
+    """
+    Incremental walk over a CommandTrie, one input token at a time
+
+    The frontier holds (start token, node) for every phrase prefix that ends
+    at the current position; a new hypothesis starts at every token.
+    Completed phrases accumulate in matches as (start, end, phrase id).
+    """
+
+    def __init__(self, trie: CommandTrie) -> None:
+        self.trie = trie
+        self.frontier: List[Tuple[int, TrieNode]] = []
+        self.tokens: List[str] = []
+        self.matches: List[Tuple[int, int, int]] = []
+
+    def push(self, word: str) -> List[Tuple[int, int, int]]:
+        """Advance every live hypothesis by one word; returns phrases completed by it"""
+        token = self.trie.normalize(word)
+        position = len(self.tokens)
+        completed = []
+        frontier = []
+        for start, node in self.frontier + [(position, self.trie.root)]:
+            child = node.children.get(token)
+            if child is None:
+                continue
+            frontier.append((start, child))
+            completed.extend((start, position + 1, pid) for pid in child.terminals)
+        self.frontier = frontier
+        self.tokens.append(token)
+        self.matches.extend(completed)
+        return completed
+
+    def extending_commands(self, fragment: str = "", max_start: Optional[int] = None) -> Set[str]:
+        """
+        Commands whose phrase could still grow out of the input
+
+        Args:
+            fragment: Trailing, possibly unfinished word not pushed yet
+                ("sl" may become "slide"); "" = only the pushed tokens
+            max_start: Ignore hypotheses that started after this token
+        """
+        hypotheses = [(start, node) for start, node in self.frontier
+                      if max_start is None or start <= max_start]
+        if not fragment:
+            commands: Set[str] = set()
+            for _, node in hypotheses:
+                commands |= node.extending_commands()
+            return commands
+
+        if max_start is None or len(self.tokens) <= max_start:
+            hypotheses.append((len(self.tokens), self.trie.root))
+        token = self.trie.normalize(fragment)
+        commands = set()
+        for _, node in hypotheses:
+            for edge, child in node.children.items():
+                if edge == token:
+                    commands |= child.extending_commands()
+                elif edge.startswith(token):
+                    commands |= child.commands
+        return commands
+
+    def reset(self) -> None:
+        self.frontier = []
+        self.tokens = []
+        self.matches = []
@@ -0,0 +1,165 @@
+# ============================================
+# DENOISE - Streaming spectral gate between capture and recognition
+# ============================================
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+try:
+    import noisereduce
+    NOISEREDUCE_AVAILABLE = True
+except ImportError:
+    NOISEREDUCE_AVAILABLE = False
+
+
+def _fft_size(sample_rate: int, window_ms: float = 32.0) -> int:
+    """Power of two closest to window_ms at this rate (512 @ 16 kHz)"""
+    target = sample_rate * window_ms / 1000
+    return int(2 ** round(np.log2(target)))
+
+
+class SpectralGate:
+    """
+    Stationary spectral gating (the algorithm behind noisereduce's
+    stationary mode) reworked for streaming
+
+    Audio is processed in 50%-overlap STFT frames as it arrives; each call
+    returns every sample that is already final, so the only added delay is
+    one hop (~16 ms) instead of a pass over the whole utterance. A bin is
+    kept when its level exceeds the noise profile mean + n_std * std for
+    that frequency, otherwise attenuated by prop_decrease.
+
+    The profile is learned from calibration audio and then tracked with an
+    exponential moving average over frames that look like pure noise.
+    """
+
+    NOISE_MARGIN_DB = 6.0  # A frame updates the profile only if no bin beats the gate by this much
+
+    def __init__(self, sample_rate: int, n_std: float = 1.5, prop_decrease: float = 0.9,
+                 adapt_rate: float = 0.02) -> None:
+        self.sample_rate = sample_rate
+        self.n_fft = _fft_size(sample_rate)
+        self.hop = self.n_fft // 2
+        self.n_std = n_std
+        self.prop_decrease = prop_decrease
+        self.adapt_rate = adapt_rate
+
+        # sqrt-Hann analysis + synthesis windows sum to one at 50% overlap
+        self._window = np.sqrt(np.hanning(self.n_fft + 1)[:-1])
+
+        bins = self.n_fft // 2 + 1
+        self.noise_mean: Optional[np.ndarray] = None
+        self.noise_std = np.zeros(bins)
+        self._pending = np.zeros(self.hop)  # Input not yet covered by a full frame
+        self._carry = np.zeros(self.hop)  # Second half of the previous output frame
+
+        self.frames_processed = 0
+        self.noise_frames = 0
+
+    @property
+    def has_profile(self) -> bool:
+        return self.noise_mean is not None
+
+    def _spectra(self, samples: np.ndarray) -> np.ndarray:
+        """Complex STFT of every full hop-aligned frame in samples"""
+        count = (len(samples) - self.n_fft) // self.hop + 1
+        if count <= 0:
+            return np.zeros((0, self.n_fft // 2 + 1), dtype=complex)
+        frames = np.lib.stride_tricks.as_strided(
+            samples, shape=(count, self.n_fft),
+            strides=(samples.strides[0] * self.hop, samples.strides[0]),
+            writeable=False,
+        )
+        return np.fft.rfft(frames * self._window, axis=1)
+
+    @staticmethod
+    def _to_db(spectra: np.ndarray) -> np.ndarray:
+        return 20 * np.log10(np.abs(spectra) + 1e-10)
+
+    def learn_noise(self, pcm: bytes) -> None:
+        """Build the noise profile from audio that contains no speech"""
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float64)
+        levels = self._to_db(self._spectra(samples))
+        if len(levels):
+            self.noise_mean = levels.mean(axis=0)
+            self.noise_std = levels.std(axis=0)
+
+    def _update_noise(self, levels: np.ndarray, threshold: np.ndarray) -> None:
+        speech_bins = levels > threshold + self.NOISE_MARGIN_DB
+        # Frames with no bin clearly above the gate are taken as noise
+        quiet = ~speech_bins.any(axis=1)
+        if not quiet.any():
+            return
+        self.noise_frames += int(quiet.sum())
+        rate = self.adapt_rate
+        for frame in levels[quiet]:
+            delta = frame - self.noise_mean
+            self.noise_mean = self.noise_mean + rate * delta
+            self.noise_std = np.sqrt((1 - rate) * (self.noise_std ** 2 + rate * delta * delta))
+
+    def process(self, pcm: bytes) -> bytes:
+        """
+        Denoise the next chunk of 16-bit mono PCM
+
+        Returns:
+            The samples that are complete so far (chunk length +- one hop);
+            the remainder comes out with the next call
+        """
+        if not self.has_profile:
+            return pcm
+
+        samples = np.concatenate([self._pending, np.frombuffer(pcm, dtype=np.int16).astype(np.float64)])
+        spectra = self._spectra(samples)
+        count = len(spectra)
+        if count == 0:
+            self._pending = samples
+            return b""
+
+        levels = self._to_db(spectra)
+        threshold = self.noise_mean + self.n_std * self.noise_std
+        speech_bins = levels > threshold
+        # Spread kept bins to their neighbours (harmonics leak into adjacent bins)
+        mask = speech_bins.copy()
+        mask[:, 1:] |= speech_bins[:, :-1]
+        mask[:, :-1] |= speech_bins[:, 1:]
+        gain = 1.0 - self.prop_decrease * (1.0 - mask)
+        frames = np.fft.irfft(spectra * gain, n=self.n_fft, axis=1) * self._window
+
+        # 50% overlap-add: output hop j = first half of frame j + second half of frame j-1
+        halves = np.vstack([self._carry, frames[:-1, self.hop:]])
+        output = (frames[:, :self.hop] + halves).reshape(-1)
+        self._carry = frames[-1, self.hop:].copy()
+        self._pending = samples[count * self.hop:]
+
+        self._update_noise(levels, threshold)
+        self.frames_processed += count
+        return np.clip(output, -32768, 32767).astype(np.int16).tobytes()
+
+    def reset(self) -> None:
+        """Forget buffered audio (keeps the noise profile)"""
+        self._pending = np.zeros(self.hop)
+        self._carry = np.zeros(self.hop)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "n_fft": self.n_fft,
+            "latency_ms": 1000 * self.hop / self.sample_rate,
+            "frames_processed": self.frames_processed,
+            "noise_frames": self.noise_frames,
+        }
+
+
+def reduce_noise_offline(pcm: bytes, sample_rate: int, noise_pcm: Optional[bytes] = None) -> bytes:
+    """
+    Whole-buffer denoise with the noisereduce package (reference / tooling only)
+
+    Raises:
+        ImportError: noisereduce not installed
+    """
+    if not NOISEREDUCE_AVAILABLE:
+        raise ImportError("noisereduce not installed. Install with: pip install noisereduce")
+    audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float64)
+    noise = np.frombuffer(noise_pcm, dtype=np.int16).astype(np.float64) if noise_pcm else None
+    cleaned = noisereduce.reduce_noise(y=audio, sr=sample_rate, y_noise=noise, stationary=True)
+    return np.clip(cleaned, -32768, 32767).astype(np.int16).tobytes()
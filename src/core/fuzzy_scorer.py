@@ -0,0 +1,249 @@
+# ============================================
+# BATCH FUZZY SCORER - One input vs the whole phrase table
+# ============================================
+import math
+from bisect import bisect_left, bisect_right
+from typing import Container, Dict, List, Optional, Sequence, Set, Tuple
+
+# Optional accelerators, best first
+try:
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+    from rapidfuzz.distance import Indel as rf_indel
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import Levenshtein  # python-Levenshtein, the backend fuzzywuzzy uses
+    LEVENSHTEIN_AVAILABLE = True
+except ImportError:
+    LEVENSHTEIN_AVAILABLE = False
+
+# Bit-parallel kernel packs one phrase into a single uint64
+MAX_KERNEL_LENGTH = 64
+
+
+def indel_ratio(lcs: int, total_length: int) -> int:
+    """
+    fuzzywuzzy's fuzz.ratio (python-Levenshtein backend) from an LCS length
+
+    ratio = round(100 * (1 - indel_distance / (len1 + len2)))
+    """
+    if total_length == 0:
+        return 0
+    distance = total_length - 2 * lcs
+    return int(round(100 * (1.0 - distance / total_length)))
+
+
+def _lcs_length(a: str, b: str) -> int:
+    """Plain dynamic-programming LCS (fallback for long phrases)"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = [0] * (len(b) + 1)
+    for char in a:
+        current = [0]
+        for j, other in enumerate(b, 1):
+            if char == other:
+                current.append(previous[j - 1] + 1)
+            else:
+                current.append(max(previous[j], current[j - 1]))
+        previous = current
+    return previous[-1]
+
+
+class BatchFuzzyScorer:
+    """
+    Scores one utterance against every phrase in a single call
+
+    Similarities are identical to fuzzywuzzy's fuzz.ratio. Phrases whose
+    length alone makes the cutoff unreachable are pruned before any
+    character is compared; the survivors are scored by the fastest
+    available backend:
+      - "rapidfuzz": process.cdist with score_cutoff
+      - "numpy":     bit-parallel LCS over a padded code-point matrix
+      - "python":    per-phrase loop (C Levenshtein ratio when installed)
+    """
+
+    def __init__(self, phrases: Sequence[str], cutoff: int = 85,
+                 top_k: Optional[int] = None, backend: Optional[str] = None) -> None:
+        self.phrases: List[str] = list(phrases)
+        self.cutoff = cutoff
+        self.top_k = top_k
+        self.backend = backend or self._default_backend()
+
+        # Phrases sorted by length so the reachable window is one slice
+        self._order: List[int] = sorted(range(len(self.phrases)), key=lambda pid: len(self.phrases[pid]))
+        self._lengths: List[int] = [len(self.phrases[pid]) for pid in self._order]
+        self._sorted_phrases: List[str] = [self.phrases[pid] for pid in self._order]
+
+        if self.backend == "numpy":
+            self._build_kernel()
+
+    @staticmethod
+    def _default_backend() -> str:
+        if RAPIDFUZZ_AVAILABLE and NUMPY_AVAILABLE:  # cdist returns NumPy arrays
+            return "rapidfuzz"
+        if NUMPY_AVAILABLE:
+            return "numpy"
+        return "python"
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    # ---------- length pruning ----------
+
+    def length_window(self, text_length: int, cutoff: int) -> Tuple[int, int]:
+        """
+        Slice [lo, hi) of the length-sorted table that can still reach cutoff
+
+        ratio <= 200 * min(m, l) / (m + l); anything below cutoff - 0.5
+        can never round up to the cutoff.
+        """
+        if cutoff <= 0:
+            return 0, len(self._lengths)
+        bound = cutoff - 0.5
+        min_length = math.ceil(bound * text_length / (200 - bound))
+        max_length = math.floor(text_length * (200 - bound) / bound)
+        return bisect_left(self._lengths, min_length), bisect_right(self._lengths, max_length)
+
+    # ---------- scoring ----------
+
+    def score(self, text: str, cutoff: Optional[int] = None, top_k: Optional[int] = None,
+              exclude: Optional[Container[int]] = None) -> List[Tuple[int, int]]:
+        """
+        Score text against the phrase table
+
+        Args:
+            text: Sanitized, lower-cased input
+            cutoff: Minimum similarity (0-100) to report, default self.cutoff
+            top_k: Keep only the k most similar phrases, default self.top_k
+            exclude: Phrase ids to skip (already scored by an earlier tier)
+
+        Returns:
+            List of (phrase id, similarity) sorted by similarity desc, id asc
+        """
+        cutoff = self.cutoff if cutoff is None else cutoff
+        top_k = self.top_k if top_k is None else top_k
+        if not text or not self.phrases:
+            return []
+
+        lo, hi = self.length_window(len(text), cutoff)
+        if lo >= hi:
+            return []
+
+        if self.backend == "rapidfuzz":
+            hits = self._score_rapidfuzz(text, lo, hi, cutoff)
+        elif self.backend == "numpy":
+            hits = self._score_numpy(text, lo, hi, cutoff)
+        else:
+            hits = self._score_python(text, lo, hi, cutoff)
+
+        if exclude:
+            hits = [(pid, similarity) for pid, similarity in hits if pid not in exclude]
+        hits.sort(key=lambda hit: (-hit[1], hit[0]))
+        if top_k:
+            hits = hits[:top_k]
+        return hits
+
+    def _score_rapidfuzz(self, text: str, lo: int, hi: int, cutoff: int) -> List[Tuple[int, int]]:
+        # cdist prunes with a slightly looser float cutoff; survivors get the exact integer ratio
+        loose_cutoff = max(cutoff - 1, 0)
+        matrix = rf_process.cdist([text], self._sorted_phrases[lo:hi], scorer=rf_fuzz.ratio,
+                                  score_cutoff=loose_cutoff, workers=1)
+        survivors = matrix[0].nonzero()[0] if loose_cutoff > 0 else range(hi - lo)
+        hits = []
+        for offset in survivors:
+            phrase = self._sorted_phrases[lo + offset]
+            total = len(text) + len(phrase)
+            lcs = (total - rf_indel.distance(text, phrase)) // 2
+            similarity = indel_ratio(lcs, total)
+            if similarity >= cutoff:
+                hits.append((self._order[lo + offset], similarity))
+        return hits
+
+    def _score_python(self, text: str, lo: int, hi: int, cutoff: int) -> List[Tuple[int, int]]:
+        hits = []
+        for position in range(lo, hi):
+            phrase = self._sorted_phrases[position]
+            if LEVENSHTEIN_AVAILABLE:
+                similarity = int(round(100 * Levenshtein.ratio(text, phrase)))
+            else:
+                similarity = indel_ratio(_lcs_length(text, phrase), len(text) + len(phrase))
+            if similarity >= cutoff:
+                hits.append((self._order[position], similarity))
+        return hits
+
+    # ---------- NumPy bit-parallel kernel ----------
+
+    def _build_kernel(self) -> None:
+        """Padded code-point matrix (phrases x 64) for the bit-parallel LCS"""
+        width = MAX_KERNEL_LENGTH
+        count = len(self._sorted_phrases)
+        self._codes = np.full((count, width), -1, dtype=np.int32)
+        self._long: Set[int] = set()
+        for row, phrase in enumerate(self._sorted_phrases):
+            if len(phrase) > width:
+                self._long.add(row)
+                continue
+            self._codes[row, :len(phrase)] = [ord(char) for char in phrase]
+        self._bit_weights = np.left_shift(np.uint64(1), np.arange(width, dtype=np.uint64))
+        self._length_masks = np.array(
+            [(1 << length) - 1 if length < width else (1 << width) - 1 for length in self._lengths],
+            dtype=np.uint64,
+        )
+        self._match_masks: Dict[str, "np.ndarray"] = {}
+
+    def _match_mask(self, char: str) -> "np.ndarray":
+        """Per phrase: bitmask of positions holding char (cached per character)"""
+        mask = self._match_masks.get(char)
+        if mask is None:
+            hits = (self._codes == ord(char)).astype(np.uint64)
+            mask = (hits * self._bit_weights).sum(axis=1, dtype=np.uint64)
+            self._match_masks[char] = mask
+        return mask
+
+    def _score_numpy(self, text: str, lo: int, hi: int, cutoff: int) -> List[Tuple[int, int]]:
+        # Hyyro's bit-vector LCS: one pass over the text, all phrases in parallel
+        vector = np.full(hi - lo, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for char in text:
+            matches = vector & self._match_mask(char)[lo:hi]
+            vector = (vector + matches) | (vector - matches)
+        lcs = _popcount(~vector & self._length_masks[lo:hi])
+
+        totals = np.asarray(self._lengths[lo:hi], dtype=np.int64) + len(text)
+        # Cheap float pre-filter, exact integer ratio for the survivors
+        candidates = np.nonzero(200.0 * lcs / totals >= cutoff - 1)[0]
+
+        hits = []
+        for offset in candidates:
+            row = lo + int(offset)
+            if row in self._long:
+                continue
+            similarity = indel_ratio(int(lcs[offset]), int(totals[offset]))
+            if similarity >= cutoff:
+                hits.append((self._order[row], similarity))
+        for row in sorted(self._long):
+            if lo <= row < hi:
+                phrase = self._sorted_phrases[row]
+                similarity = indel_ratio(_lcs_length(text, phrase), len(text) + len(phrase))
+                if similarity >= cutoff:
+                    hits.append((self._order[row], similarity))
+        return hits
+
+
+def _popcount(values: "np.ndarray") -> "np.ndarray":
+    """Vectorized popcount for uint64 arrays"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values).astype(np.int64)
+    as_bytes = values.view(np.uint8).reshape(-1, 8)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=1)
+
+
+if NUMPY_AVAILABLE:
+    _BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.int64)
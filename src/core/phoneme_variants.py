@@ -1,6 +1,14 @@
 # ============================================
 # PHONEME VARIANTS - Accent-aware phrase generation
 # ============================================
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Bump when the expansion algorithm changes so stale disk caches are ignored
+EXPANSION_VERSION = 1
 
 class PhonemeVariants:
     """Generate phonetic variants for Indonesian accents and dialects"""
@@ -38,6 +46,23 @@ class PhonemeVariants:
         'menu': ['menu', 'mènu', 'ménu', 'meenu', 'minu','manu','minu','menuu','menou','menue','manou','manue','minou','minue','manou','manue'],
     }
     
+    # Expansion cache: (phrase, region) -> sorted unique variants
+    CACHE_FILE = Path("cache") / "phoneme_variants.json"
+    cache_enabled = True
+    _cache: Dict[Tuple[str, str], List[str]] = {}
+    _cache_key: Optional[str] = None
+    _tables_token: Optional[Tuple[int, int, int]] = None  # Identity of the tables _cache_key was hashed from
+    _cache_dirty = False
+    _disk_entries: Dict[str, List[str]] = {}
+    _stats = {
+        "lookups": 0,
+        "memory_hits": 0,
+        "disk_hits": 0,
+        "misses": 0,
+        "variants_generated": 0,
+        "duplicates_collapsed": 0,
+    }
+
     @staticmethod
     def generate_variants(phrase):
         """
@@ -113,11 +138,58 @@ class PhonemeVariants:
             region: 'javanese', 'sundanese', 'mixed', etc.
         
         Returns:
-            List of region-specific variants
+            List of region-specific variants (memoized, see expand)
+        """
+        return list(PhonemeVariants.expand(phrase, region))
+    
+    @staticmethod
+    def expand(phrase, region='mixed'):
         """
-        variants = PhonemeVariants.generate_variants(phrase)
+        Memoized variant expansion per (phrase, region)
+        
+        Lookups go memory -> on-disk cache -> fresh computation. The disk
+        cache is keyed by a hash of the substitution tables, so replacing
+        WORD_SUBSTITUTIONS / VOWEL_PATTERNS / CONSONANT_PATTERNS
+        invalidates it automatically. The hash is only recomputed when a
+        table object is swapped; after editing one in place, call
+        clear_cache().
+        
+        Returns:
+            Sorted list of unique variants (do not mutate)
+        """
+        PhonemeVariants._ensure_cache()
+        stats = PhonemeVariants._stats
+        stats["lookups"] += 1
+        
+        key = (phrase, region)
+        cached = PhonemeVariants._cache.get(key)
+        if cached is not None:
+            stats["memory_hits"] += 1
+            return cached
+        
+        disk_key = f"{region}|{phrase}"
+        stored = PhonemeVariants._disk_entries.get(disk_key)
+        if stored is not None:
+            stats["disk_hits"] += 1
+            PhonemeVariants._cache[key] = stored
+            return stored
+        
+        stats["misses"] += 1
+        variants = PhonemeVariants._compute_regional_variants(phrase, region)
+        PhonemeVariants._cache[key] = variants
+        if PhonemeVariants.cache_enabled:
+            PhonemeVariants._disk_entries[disk_key] = variants
+            PhonemeVariants._cache_dirty = True
+        return variants
+    
+    @staticmethod
+    def _compute_regional_variants(phrase, region):
+        """Base variants plus regional passes, deduplicated between passes"""
+        stats = PhonemeVariants._stats
+        base = PhonemeVariants.generate_variants(phrase)
+        variants = set(base)
+        generated = len(base)
         
-        # Add region-specific patterns
         if region in ['javanese', 'mixed']:
             # Javanese: tends to drop final consonants, 'ng' → 'n'
             javanese_variants = []
@@ -127,7 +199,8 @@ class PhonemeVariants:
                     javanese_variants.append(v[:-1])
                 # NG → N
                 javanese_variants.append(v.replace('ng', 'n'))
-            variants.extend(javanese_variants)
+            generated += len(javanese_variants)
+            variants.update(javanese_variants)
         
         if region in ['sundanese', 'mixed']:
             # Sundanese: tends to shift vowels
@@ -137,7 +210,8 @@ class PhonemeVariants:
                 sundanese_variants.append(v.replace('e', 'i'))
                 # O → U shift
                 sundanese_variants.append(v.replace('o', 'u'))
-            variants.extend(sundanese_variants)
+            generated += len(sundanese_variants)
+            variants.update(sundanese_variants)
         
         if region in ['betawi', 'mixed']:
             # Betawi: tends to drop syllables
@@ -146,9 +220,103 @@ class PhonemeVariants:
                 words = v.split()
                 # Remove short words
                 betawi_variants.append(' '.join(w for w in words if len(w) > 2))
-            variants.extend(betawi_variants)
+            generated += len(betawi_variants)
+            variants.update(betawi_variants)
         
-        return list(set(variants))  # Remove duplicates
+        stats["variants_generated"] += generated
+        stats["duplicates_collapsed"] += generated - len(variants)
+        return sorted(variants)
+    
+    # ---------- cache management ----------
+    
+    @staticmethod
+    def table_hash():
+        """Hash of the substitution tables and expansion algorithm version"""
+        payload = json.dumps({
+            "version": EXPANSION_VERSION,
+            "words": PhonemeVariants.WORD_SUBSTITUTIONS,
+            "vowels": PhonemeVariants.VOWEL_PATTERNS,
+            "consonants": PhonemeVariants.CONSONANT_PATTERNS,
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _ensure_cache():
+        """(Re)load the disk cache when first used or when a table was replaced"""
+        # Hashing the tables costs more than a cache hit: only rehash when one was swapped out
+        token = (
+            id(PhonemeVariants.WORD_SUBSTITUTIONS),
+            id(PhonemeVariants.VOWEL_PATTERNS),
+            id(PhonemeVariants.CONSONANT_PATTERNS),
+        )
+        if token == PhonemeVariants._tables_token:
+            return
+        PhonemeVariants._tables_token = token
+        key = PhonemeVariants.table_hash()
+        if key == PhonemeVariants._cache_key:
+            return
+        
+        PhonemeVariants._cache_key = key
+        PhonemeVariants._cache = {}
+        PhonemeVariants._disk_entries = {}
+        PhonemeVariants._cache_dirty = False
+        
+        if not PhonemeVariants.cache_enabled:
+            return
+        try:
+            with open(PhonemeVariants.CACHE_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("key") == key:
+                PhonemeVariants._disk_entries = data.get("entries", {})
+        except (OSError, ValueError):
+            pass  # Missing or corrupt cache: rebuild lazily
+    
+    @staticmethod
+    def save_cache():
+        """Persist newly computed expansions (atomic replace, no-op if clean)"""
+        if not PhonemeVariants.cache_enabled or not PhonemeVariants._cache_dirty:
+            return False
+        
+        path = PhonemeVariants.CACHE_FILE
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "key": PhonemeVariants._cache_key,
+                    "entries": PhonemeVariants._disk_entries,
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            PhonemeVariants._cache_dirty = False
+            return True
+        except OSError as e:
+            print(f"[WARN] Cannot save phoneme variant cache: {e}")
+            return False
+    
+    @staticmethod
+    def clear_cache(remove_file=False):
+        """Drop memoized expansions (and optionally the disk cache)"""
+        PhonemeVariants._cache = {}
+        PhonemeVariants._disk_entries = {}
+        PhonemeVariants._cache_key = None
+        PhonemeVariants._tables_token = None
+        PhonemeVariants._cache_dirty = False
+        for counter in PhonemeVariants._stats:
+            PhonemeVariants._stats[counter] = 0
+        if remove_file:
+            try:
+                PhonemeVariants.CACHE_FILE.unlink()
+            except OSError:
+                pass
+    
+    @staticmethod
+    def get_stats():
+        """Expansion statistics: variants generated, duplicates collapsed, cache hit rate"""
+        stats = dict(PhonemeVariants._stats)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["cached_phrases"] = len(PhonemeVariants._cache)
+        stats["hit_rate"] = round(hits / stats["lookups"] * 100, 1) if stats["lookups"] else 0.0
+        return stats
     
     @staticmethod
     def phonetic_distance(word1, word2):
@@ -0,0 +1,202 @@
+# ============================================
+# PHONETIC INDEX - Phonetic-key retrieval of wake-word tokens
+# ============================================
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.core.fuzzy_scorer import _lcs_length, indel_ratio
+from src.core.phoneme_variants import PhonemeVariants
+
+# Optional: English phonetic codes (Metaphone / NYSIIS)
+try:
+    import jellyfish
+    JELLYFISH_AVAILABLE = True
+except ImportError:
+    JELLYFISH_AVAILABLE = False
+
+# Spelling normalization for Indonesian-accented English (applied in order);
+# the last two merge the vowel shifts of Sundanese / Javanese speakers
+INDONESIAN_RULES = (
+    ("x", "ks"), ("ck", "k"), ("sh", "s"), ("sy", "s"), ("dj", "j"), ("ph", "f"),
+    ("q", "k"), ("c", "k"), ("z", "s"), ("v", "f"), ("ng", "n"), ("w", "u"), ("y", "i"),
+    ("e", "i"), ("o", "u"),
+)
+
+# Consonant classes for the skeleton key: voiced/voiceless pairs merge
+# (Indonesian devoices final stops: "slaid" ~ "slait", "stob" ~ "stop")
+CONSONANT_CLASSES = str.maketrans("bfvdg", "ppptk")
+
+_NON_CONSONANT = re.compile(r"[^a-z]|[aeiou]")
+_REPEATS = re.compile(r"(.)\1+")
+
+
+def indonesian_spelling(word: str) -> str:
+    """Lower-case, strip diacritics, spell the way an Indonesian reader would say it"""
+    spelled = _REPEATS.sub(r"\1", PhonemeVariants._to_phonetic(word).replace("ə", "e").replace("æ", "a"))
+    for original, replacement in INDONESIAN_RULES:
+        spelled = spelled.replace(original, replacement)
+    return _REPEATS.sub(r"\1", spelled)
+
+
+def consonant_skeleton(word: str) -> str:
+    """Consonant classes of a word with vowels and repeats dropped ("slaid" -> "slt")"""
+    skeleton = _NON_CONSONANT.sub("", indonesian_spelling(word)).translate(CONSONANT_CLASSES)
+    return _REPEATS.sub(r"\1", skeleton)
+
+
+def phonetic_keys(word: str) -> Set[str]:
+    """
+    Hash keys under which a word is filed
+
+    Metaphone and NYSIIS (English rules, when jellyfish is installed) plus
+    the Indonesian-tuned consonant skeleton, also without a leading "s"
+    ("estop" / "setop" / "top" all share "tp"), and its first two classes
+    (final clusters get reduced: "neks" / "nek" for "next").
+    """
+    keys = set()
+    plain = PhonemeVariants._to_phonetic(word)
+    if JELLYFISH_AVAILABLE and plain.isascii() and plain.isalpha():
+        keys.add("m:" + jellyfish.metaphone(plain))
+        keys.add("n:" + jellyfish.nysiis(plain))
+    for skeleton in _skeletons(word):
+        keys.add("s:" + skeleton)
+        keys.add("p:" + skeleton[:2])
+    return keys
+
+
+def _skeletons(word: str) -> List[str]:
+    """The consonant skeleton, plus the same without an initial "s" cluster"""
+    skeleton = consonant_skeleton(word)
+    if not skeleton:
+        return []
+    if len(skeleton) > 2 and skeleton[0] == "s":
+        return [skeleton, skeleton[1:]]
+    return [skeleton]
+
+
+def _ratio(a: str, b: str) -> float:
+    return indel_ratio(_lcs_length(a, b), len(a) + len(b)) / 100
+
+
+class PhoneticIndex:
+    """
+    Maps mispronounced / misrecognized words onto the wake-word vocabulary
+
+    Every distinct token of the phrase table is filed under its phonetic
+    keys. An unknown input word is resolved by a hash lookup of its own
+    keys; edit similarity is computed only against the few vocabulary
+    tokens found that way, and dictionary words are left alone. canonicalize() rewrites the input with resolved
+    tokens so the ordinary PhraseIndex tiers can score it; this covers
+    accent variants without storing every spelling as its own phrase.
+    """
+
+    def __init__(self, phrases: Iterable[str], aliases: Optional[Dict[str, Iterable[str]]] = None,
+                 min_similarity: float = 0.75, min_edit_ratio: float = 0.7, min_length: int = 3,
+                 dictionary: Optional[Set[str]] = None, cache_size: int = 4096) -> None:
+        """
+        Args:
+            phrases: Wake-word phrases
+            aliases: Vocabulary word -> known misrecognitions that sound
+                nothing alike ("teks" for "next"), resolved exactly
+            min_similarity: Lowest similarity() that resolves a word
+            min_edit_ratio: Lowest plain edit ratio of the Indonesian
+                spellings, required on top of min_similarity
+            min_length: Shorter words are never resolved
+            dictionary: Real words ("hello", "one"); these are never
+                snapped onto the vocabulary, only aliases still apply
+            cache_size: Resolved words kept before the memo is cleared
+        """
+        self.min_similarity = min_similarity
+        self.min_edit_ratio = min_edit_ratio
+        self.min_length = min_length
+        self.dictionary: Set[str] = dictionary or set()
+        self.cache_size = cache_size
+        self.vocabulary: Set[str] = {token for phrase in phrases for token in phrase.split()}
+        self._aliases: Dict[str, str] = {}
+        for token, spellings in (aliases or {}).items():
+            if token in self.vocabulary:
+                for spelling in spellings:
+                    self._aliases.setdefault(spelling, token)
+        self._keys: Dict[str, List[str]] = {}
+        for token in sorted(self.vocabulary):
+            for key in phonetic_keys(token):
+                self._keys.setdefault(key, []).append(token)
+        self._resolved: Dict[str, Optional[Tuple[str, float]]] = {}
+        self.lookups = 0
+        self.comparisons = 0
+
+    def candidates(self, word: str) -> List[str]:
+        """Vocabulary tokens sharing at least one phonetic key with word"""
+        found: Dict[str, None] = {}
+        for key in sorted(phonetic_keys(word)):
+            for token in self._keys.get(key, ()):
+                found[token] = None
+        return list(found)
+
+    def similarity(self, word: str, token: str) -> float:
+        """
+        0..1 similarity: edit ratio of the Indonesian spellings, raised to
+        its mean with the best skeleton ratio when both words have at least
+        three consonant classes, and to 0.8 for a clipped ending ("slai" for
+        "slide"). Words starting with different consonant classes score 0.
+        """
+        self.comparisons += 1
+        spoken_skeletons = _skeletons(word)
+        token_skeletons = _skeletons(token)
+        if spoken_skeletons and token_skeletons and spoken_skeletons[0][0] != token_skeletons[0][0]:
+            return 0.0
+        spoken = indonesian_spelling(word)
+        target = indonesian_spelling(token)
+        score = _ratio(spoken, target)
+        if spoken_skeletons and token_skeletons and min(len(spoken_skeletons[0]), len(token_skeletons[0])) >= 3:
+            skeleton_score = max(_ratio(a, b) for a in spoken_skeletons for b in token_skeletons)
+            score = max(score, (score + skeleton_score) / 2)
+        if len(spoken) >= self.min_length and target.startswith(spoken) and 2 * len(spoken) >= len(target):
+            score = max(score, 0.8)
+        return score
+
+    def resolve(self, word: str) -> Optional[Tuple[str, float]]:
+        """
+        Vocabulary token a word stands for
+
+        Returns:
+            (token, similarity), or None if nothing is similar enough
+        """
+        if word in self.vocabulary:
+            return word, 1.0
+        if word in self._aliases:
+            return self._aliases[word], 1.0
+        if word in self._resolved:
+            return self._resolved[word]
+        self.lookups += 1
+        best = None
+        if len(word) >= self.min_length and word not in self.dictionary:
+            spoken = indonesian_spelling(word)
+            for token in self.candidates(word):
+                score = self.similarity(word, token)
+                if score < self.min_similarity or (best is not None and score <= best[1]):
+                    continue
+                if _ratio(spoken, indonesian_spelling(token)) >= self.min_edit_ratio:
+                    best = (token, score)
+        if len(self._resolved) >= self.cache_size:
+            self._resolved.clear()  # Open vocabulary: keep the memo bounded
+        self._resolved[word] = best
+        return best
+
+    def canonicalize(self, text: str) -> str:
+        """Replace every resolvable word of text by its vocabulary token"""
+        words = []
+        for word in text.split():
+            resolved = self.resolve(word)
+            words.append(resolved[0] if resolved else word)
+        return " ".join(words)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "vocabulary": len(self.vocabulary),
+            "aliases": len(self._aliases),
+            "keys": len(self._keys),
+            "resolved_cache": len(self._resolved),
+            "lookups": self.lookups,
+            "comparisons": self.comparisons,
+        }
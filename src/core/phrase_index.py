@@ -0,0 +1,247 @@
+# ============================================
+# PHRASE INDEX - Precompiled matcher for wake-word phrases
+# ============================================
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class SubstringAutomaton:
+    """Aho-Corasick automaton answering "which phrases occur in this text" in one pass"""
+
+    def __init__(self, patterns: List[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        own: List[List[int]] = [[]]
+        for pattern_id, pattern in enumerate(patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    own.append([])
+                state = nxt
+            own[state].append(pattern_id)
+
+        # Breadth-first pass: failure links + merged outputs
+        self._out = [()] * len(self._goto)
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._out[nxt] = tuple(own[nxt])
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = link if link != nxt else 0
+                self._out[nxt] = tuple(own[nxt]) + self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
+
+    def step(self, state: int, char: str) -> int:
+        """Advance the automaton by one character"""
+        goto = self._goto
+        fail = self._fail
+        while state and char not in goto[state]:
+            state = fail[state]
+        return goto[state].get(char, 0)
+
+    def outputs(self, state: int) -> Tuple[int, ...]:
+        """Pattern ids that end at this state"""
+        return self._out[state]
+
+    def search(self, text: str) -> set:
+        """Return ids of all patterns occurring anywhere in text"""
+        found = set()
+        state = 0
+        for char in text:
+            state = self.step(state, char)
+            if self._out[state]:
+                found.update(self._out[state])
+        return found
+
+
+class PhraseIndex:
+    """
+    Compiled view of SmartVoiceDetector.wake_words
+
+    Reproduces the detector's rule-based score tiers (exact, phrase-in-text,
+    word overlap) while only visiting phrases that share a token with the
+    input or occur inside it:
+      - exact:    hash table phrase -> phrase ids
+      - contains: Aho-Corasick automaton over all phrases
+      - words:    inverted index token -> (phrase id, occurrences)
+    Phrase ids follow the wake_words iteration order, so ties resolve exactly
+    like the original linear scan.
+    """
+
+    EXACT_BONUS = 20
+    CONTAINS_BONUS = 10
+    WORD_BONUS = 3
+
+    def __init__(self, wake_words: Dict[str, Dict[str, Any]]) -> None:
+        self.commands: List[str] = []
+        self.phrases: List[str] = []
+        self.weights: List[float] = []
+        self.word_counts: List[int] = []
+        self.unique_word_counts: List[int] = []
+        self.signature = self.compute_signature(wake_words)
+
+        self._descriptions: Dict[str, str] = {}
+        self._exact: Dict[str, List[int]] = {}
+        self._tokens: Dict[str, List[Tuple[int, int]]] = {}
+        self._empty: List[int] = []  # "" is contained in every text
+
+        for command, data in wake_words.items():
+            self._descriptions[command] = data["description"]
+            for phrase in data["phrases"]:
+                self._add(command, phrase, data["weight"])
+
+        self._automaton = SubstringAutomaton(self.phrases)
+        self._by_prefix: List[Tuple[str, int]] = sorted((phrase, pid) for pid, phrase in enumerate(self.phrases))
+
+    @staticmethod
+    def compute_signature(wake_words: Dict[str, Dict[str, Any]]) -> Tuple[Any, ...]:
+        """Cheap fingerprint used to notice phrases added after compilation"""
+        return tuple(
+            (command, len(data["phrases"]), data["weight"])
+            for command, data in wake_words.items()
+        )
+
+    def is_stale(self, wake_words: Dict[str, Dict[str, Any]]) -> bool:
+        """True if wake_words changed shape since this index was built"""
+        return self.compute_signature(wake_words) != self.signature
+
+    def _add(self, command: str, phrase: str, weight: float) -> None:
+        pid = len(self.phrases)
+        words = phrase.split()
+
+        self.commands.append(command)
+        self.phrases.append(phrase)
+        self.weights.append(weight)
+        self.word_counts.append(len(words))
+        self.unique_word_counts.append(len(set(words)))
+
+        self._exact.setdefault(phrase, []).append(pid)
+        if not phrase:
+            self._empty.append(pid)
+
+        occurrences: Dict[str, int] = {}
+        for word in words:
+            occurrences[word] = occurrences.get(word, 0) + 1
+        for word, count in occurrences.items():
+            self._tokens.setdefault(word, []).append((pid, count))
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def score(self, text: str) -> Dict[int, Tuple[float, int]]:
+        """
+        Score every phrase that can reach a non-fuzzy tier
+
+        Args:
+            text: Sanitized, lower-cased input
+
+        Returns:
+            Mapping phrase id -> (score, distinct phrase words present in text)
+            for phrases with score > 0
+        """
+        word_hits: Dict[int, int] = {}
+        unique_hits: Dict[int, int] = {}
+        for word in set(text.split()):
+            for pid, count in self._tokens.get(word, ()):
+                word_hits[pid] = word_hits.get(pid, 0) + count
+                unique_hits[pid] = unique_hits.get(pid, 0) + 1
+
+        contained = self._automaton.search(text)
+        contained.update(self._empty)
+        exact = self._exact.get(text, ())
+
+        scores: Dict[int, Tuple[float, int]] = {}
+        for pid in contained.union(word_hits):
+            weight = self.weights[pid]
+            if pid in contained:
+                bonus = self.EXACT_BONUS if pid in exact else self.CONTAINS_BONUS
+                score = weight + bonus
+            else:
+                matched = word_hits[pid]
+                if matched >= 2:
+                    score = weight + matched * self.WORD_BONUS
+                elif matched == 1 and self.word_counts[pid] <= 2:
+                    score = weight + 1
+                else:
+                    continue
+            scores[pid] = (score, unique_hits.get(pid, 0))
+        return scores
+
+    def extending_commands(self, prefix: str) -> set:
+        """Commands owning a phrase that starts with prefix and is longer than it"""
+        commands = set()
+        position = bisect_left(self._by_prefix, (prefix, -1))
+        while position < len(self._by_prefix):
+            phrase, pid = self._by_prefix[position]
+            if not phrase.startswith(prefix):
+                break
+            if len(phrase) > len(prefix):
+                commands.add(self.commands[pid])
+            position += 1
+        return commands
+
+    def overlap(self, pid: int, text_words: set) -> int:
+        """Distinct words of a phrase that also occur in text_words"""
+        return len(set(self.phrases[pid].split()) & text_words)
+
+    def best(self, scores: Dict[int, Tuple[float, int]]) -> Optional[Dict[str, Any]]:
+        """
+        Pick the winning phrase the same way the detector's sort did:
+        score desc, word-overlap ratio desc, phrase length desc, scan order.
+        """
+        best_key = None
+        best_pid = -1
+        for pid, (score, overlap) in scores.items():
+            key = (
+                -score,
+                -(overlap / max(self.unique_word_counts[pid], 1)),
+                -self.word_counts[pid],
+                pid,
+            )
+            if best_key is None or key < best_key:
+                best_key = key
+                best_pid = pid
+
+        if best_key is None:
+            return None
+        return self.result(best_pid, scores[best_pid][0])
+
+    def result(self, pid: int, score: float) -> Dict[str, Any]:
+        """Build the detector's result dict for a phrase id"""
+        command = self.commands[pid]
+        return {
+            "command": command,
+            "phrase": self.phrases[pid],
+            "score": score,
+            "max_score": self.weights[pid] + self.EXACT_BONUS,
+            "description": self._descriptions[command],
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Size of the compiled structures"""
+        return {
+            "phrases": len(self.phrases),
+            "exact_keys": len(self._exact),
+            "tokens": len(self._tokens),
+            "automaton_states": self._automaton.state_count,
+        }
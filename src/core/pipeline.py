@@ -0,0 +1,232 @@
+# ============================================
+# VOICE PIPELINE - Capture / recognize / detect / execute on separate threads
+# ============================================
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from src.infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()  # Sentinel pushed through the queues on shutdown
+
+
+class StageStats:
+    """Counters for one pipeline stage (updated by its own thread only)"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.processed += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def as_dict(self, depth: int) -> Dict[str, Any]:
+        return {
+            "queue_depth": depth,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "avg_ms": self.total_ms / self.processed if self.processed else 0.0,
+            "max_ms": self.max_ms,
+            "last_ms": self.last_ms,
+        }
+
+
+class RingBuffer:
+    """
+    Bounded FIFO between the capture thread and the first worker
+
+    The producer never blocks: when full, the oldest item is overwritten
+    (counted in `overruns`) so the microphone keeps recording even if
+    recognition falls behind.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._items: Deque[Any] = deque(maxlen=capacity)
+        self._ready = threading.Condition()
+        self.overruns = 0
+
+    def put(self, item: Any) -> None:
+        with self._ready:
+            if len(self._items) == self._items.maxlen:
+                self.overruns += 1
+            self._items.append(item)
+            self._ready.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Oldest item, or raise queue.Empty after timeout"""
+        with self._ready:
+            if not self._items and not self._ready.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            return self._items.popleft()
+
+    def clear(self) -> None:
+        with self._ready:
+            self._items.clear()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+
+class Stage:
+    """One worker thread: take from inbox, apply func, pass non-None results on"""
+
+    def __init__(self, name: str, func: Callable[[Any], Any], inbox: Any,
+                 outbox: Optional["queue.Queue"] = None) -> None:
+        self.name = name
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stats = StageStats(name)
+        self.thread = threading.Thread(target=self._run, name=f"pipeline-{name}", daemon=True)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self.inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _STOP:
+                if self.outbox is not None:
+                    self.outbox.put(_STOP)
+                return
+
+            start = time.perf_counter()
+            try:
+                result = self.func(item)
+            except Exception as e:
+                self.stats.errors += 1
+                logger.error(f"Pipeline stage '{self.name}' failed: {e}")
+                continue
+            self.stats.record((time.perf_counter() - start) * 1000)
+
+            if result is not None and self.outbox is not None:
+                try:
+                    self.outbox.put_nowait(result)
+                except queue.Full:
+                    self.stats.dropped += 1  # Downstream saturated: shed instead of stalling
+
+
+class VoicePipeline:
+    """
+    Continuous voice-control runtime
+
+        capture thread -> ring buffer -> recognize -> queue -> detect -> queue -> execute
+
+    capture()   returns the next utterance (or None on silence) and runs in a
+                tight loop, so the microphone is never deaf while later
+                stages work.
+    recognize() turns an utterance into text (None = nothing heard).
+    detect()    turns text into an action (None = nothing to execute).
+    execute()   performs the action, off the detection thread.
+
+    actions, if given, replaces the bounded queue between detect and execute
+    (anything with put / put_nowait / get / qsize, e.g. a CommandScheduler).
+
+    capture_timeout is the longest one capture() call can block (listen
+    timeout plus phrase limit); stop() waits that long for the capture
+    thread. pause() / resume() hold capture while the user reads something
+    (e.g. the help screen); utterances captured meanwhile are discarded.
+    """
+
+    def __init__(self, capture: Callable[[], Any], recognize: Callable[[Any], Optional[str]],
+                 detect: Callable[[str], Any], execute: Callable[[Any], Any],
+                 buffer_size: int = 8, queue_size: int = 4,
+                 actions: Optional[Any] = None, capture_timeout: float = 2.0) -> None:
+        self.capture = capture
+        self.capture_timeout = capture_timeout
+        self.ring = RingBuffer(buffer_size)
+        self.capture_stats = StageStats("capture")
+
+        texts: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        if actions is None:
+            actions = queue.Queue(maxsize=queue_size)
+        self.stages: List[Stage] = [
+            Stage("recognize", recognize, self.ring, texts),
+            Stage("detect", detect, texts, actions),
+            Stage("execute", execute, actions),
+        ]
+
+        self._running = threading.Event()
+        self._paused = threading.Event()
+        self._capture_thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running.is_set()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._running.set()
+        for stage in self.stages:
+            stage.thread.start()
+        self._capture_thread = threading.Thread(target=self._capture_loop, name="pipeline-capture", daemon=True)
+        self._capture_thread.start()
+        logger.info("Voice pipeline started")
+
+    def _capture_loop(self) -> None:
+        while self._running.is_set():
+            if self._paused.is_set():
+                time.sleep(0.05)
+                continue
+            start = time.perf_counter()
+            try:
+                utterance = self.capture()
+            except Exception as e:
+                self.capture_stats.errors += 1
+                logger.error(f"Pipeline capture failed: {e}")
+                time.sleep(0.1)
+                continue
+            if utterance is None or self._paused.is_set():
+                continue
+            self.capture_stats.record((time.perf_counter() - start) * 1000)
+            self.ring.put(utterance)
+        self.ring.put(_STOP)
+
+    def pause(self) -> None:
+        """Stop capturing new utterances until resume()"""
+        self._paused.set()
+
+    def resume(self) -> None:
+        """Drop utterances captured before the pause took effect, then capture again"""
+        self.ring.clear()
+        self._paused.clear()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop capturing and let queued work drain through the stages"""
+        if not self.running:
+            return
+        self._running.clear()
+        self._paused.clear()
+        if self._capture_thread is not None:
+            # An utterance in progress must finish before the microphone is released
+            self._capture_thread.join(max(timeout, self.capture_timeout))
+            if self._capture_thread.is_alive():
+                logger.warning("Pipeline capture thread still running after stop")
+        for stage in self.stages:
+            stage.thread.join(timeout)
+            if stage.thread.is_alive():
+                logger.warning(f"Pipeline stage '{stage.name}' still running after stop")
+        logger.info("Voice pipeline stopped")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage queue depth and latency counters"""
+        report = {"capture": self.capture_stats.as_dict(self.ring.qsize())}
+        report["capture"]["dropped"] = self.ring.overruns
+        for stage in self.stages:
+            report[stage.name] = stage.stats.as_dict(stage.inbox.qsize())
+        return report
@@ -0,0 +1,280 @@
+# ============================================
+# PRONUNCIATION MODEL - Weighted automaton in place of expanded phrase variants
+# ============================================
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.core.command_trie import TrieNode
+from src.core.phoneme_variants import PhonemeVariants
+from src.core.phrase_index import PhraseIndex
+
+# Regional rewrites as per-word transducers, in the order PhonemeVariants
+# applies them. Each maps (spelling, is last word of the phrase) to rewrites.
+Rewrite = Callable[[str, bool], Iterable[str]]
+
+
+def _final_consonant_drop(spelling: str, last: bool) -> Iterable[str]:
+    return [spelling[:-1]] if last and spelling and spelling[-1] in "tpskcng" else []
+
+
+def _ng_to_n(spelling: str, last: bool) -> Iterable[str]:
+    return [spelling.replace("ng", "n")]
+
+
+def _e_to_i(spelling: str, last: bool) -> Iterable[str]:
+    return [spelling.replace("e", "i")]
+
+
+def _o_to_u(spelling: str, last: bool) -> Iterable[str]:
+    return [spelling.replace("o", "u")]
+
+
+REGIONAL_RULES: Dict[str, List[Rewrite]] = {
+    "javanese": [_final_consonant_drop, _ng_to_n],  # Final consonants dropped, NG -> N
+    "sundanese": [_e_to_i, _o_to_u],  # Vowel shifts
+}
+DROPPING_REGIONS = ("betawi", "mixed")  # Short words are swallowed
+
+
+def _regions(region: str) -> List[str]:
+    return list(REGIONAL_RULES) if region == "mixed" else [region]
+
+
+class PronunciationModel:
+    """
+    Accent variants of wake-word phrases as a weighted finite-state model
+
+    PhonemeVariants expands each phrase into the Cartesian product of its
+    words' spellings and then multiplies that by the regional passes, and
+    every result is stored as a phrase. Here each word instead gets a small
+    set of weighted arcs: its WORD_SUBSTITUTIONS (or generated vowel /
+    consonant variants) at SUBSTITUTION_COST, then the regional rewrites of
+    REGIONAL_RULES at REGIONAL_COST each, plus an epsilon arc at DROP_COST
+    where a spelling is short enough for the Betawi pass to swallow it.
+    Phrases are paths of words in a trie, and input is walked against it
+    with a frontier of (start, node, cost) hypotheses. Size grows with the
+    number of words x spellings, not spellings ^ words.
+
+    Scores follow PhraseIndex's tiers on the base phrase ids: a path that
+    spans the whole input is an exact match, a path inside it is contained,
+    and words spelled anywhere in the input count towards word overlap.
+    Arc costs do not enter the score (it matches the expanded-variants
+    table exactly); they only pick the cheapest reading in matches() and
+    the word canonicalize() maps each token to.
+    """
+
+    SUBSTITUTION_COST = 1
+    REGIONAL_COST = 1
+    DROP_COST = 2
+
+    def __init__(self, index: PhraseIndex, phrases: Iterable[str], region: str = "mixed") -> None:
+        """
+        Args:
+            index: Compiled phrase table (base phrases only)
+            phrases: The phrases that get accent variants
+            region: Regional rules to apply, as for PhonemeVariants.expand
+        """
+        self.index = index
+        self.region = region
+        self.root = TrieNode()
+        self.node_count = 1
+        # spelling -> word -> (cost, only valid as the last word of a phrase)
+        self._lexicon: Dict[str, Dict[str, Tuple[int, bool]]] = {}
+        # word -> DROP_COST plus its shortest droppable spelling's cost; last-word-only drops separately
+        self._droppable: Dict[str, int] = {}
+        self._droppable_last: Dict[str, int] = {}
+        self._word_pids: Dict[str, List[Tuple[int, int]]] = {}
+        self._slots: Dict[int, int] = {}
+
+        wanted = set(phrases)
+        built: Set[Tuple[str, bool, bool]] = set()
+        for pid, phrase in enumerate(index.phrases):
+            if phrase not in wanted or not phrase:
+                continue
+            words = phrase.lower().split()
+            self._slots[pid] = len(words)
+            node = self.root
+            for position, word in enumerate(words):
+                child = node.children.get(word)
+                if child is None:
+                    child = node.children[word] = TrieNode(node.depth + 1)
+                    self.node_count += 1
+                node = child
+                node.commands.add(index.commands[pid])
+
+                # Like generate_variants: only the first two words of longer phrases vary
+                varies = len(words) <= 2 or position < 2
+                last = position == len(words) - 1
+                if (word, varies, last) not in built:
+                    built.add((word, varies, last))
+                    self._add_word(word, varies, last)
+            node.terminals.append(pid)
+
+            counts: Dict[str, int] = {}
+            for word in words:
+                counts[word] = counts.get(word, 0) + 1
+            for word, count in counts.items():
+                self._word_pids.setdefault(word, []).append((pid, count))
+
+    # ---------- building ----------
+
+    def spellings(self, word: str, varies: bool = True, last: bool = False) -> Dict[str, int]:
+        """All spellings of one word position with their cheapest cost"""
+        arcs: Dict[str, int] = {word: 0}
+        if varies:
+            if word in PhonemeVariants.WORD_SUBSTITUTIONS:
+                base = PhonemeVariants.WORD_SUBSTITUTIONS[word]
+            else:
+                base = PhonemeVariants._generate_word_variants(word)
+            for spelling in base:
+                if spelling != word:
+                    arcs.setdefault(spelling, self.SUBSTITUTION_COST)
+
+        # Each region's rewrites apply to everything produced before it
+        for region in _regions(self.region):
+            produced: Dict[str, int] = {}
+            for spelling, cost in arcs.items():
+                for rewrite in REGIONAL_RULES.get(region, ()):
+                    for rewritten in rewrite(spelling, last):
+                        if rewritten not in arcs:
+                            previous = produced.get(rewritten)
+                            if previous is None or cost + self.REGIONAL_COST < previous:
+                                produced[rewritten] = cost + self.REGIONAL_COST
+            arcs.update(produced)
+        return arcs
+
+    def _add_word(self, word: str, varies: bool, last: bool) -> None:
+        anywhere = self.spellings(word, varies, last=False) if last else {}
+        for spelling, cost in self.spellings(word, varies, last).items():
+            final_only = last and spelling not in anywhere
+            entries = self._lexicon.setdefault(spelling, {})
+            known = entries.get(word)
+            if known is None:
+                entries[word] = (cost, final_only)
+            else:
+                entries[word] = (min(known[0], cost), known[1] and final_only)
+
+            if self.region in DROPPING_REGIONS and len(spelling) <= 2:
+                drops = self._droppable_last if final_only else self._droppable
+                drops[word] = min(drops.get(word, cost + self.DROP_COST), cost + self.DROP_COST)
+
+    # ---------- matching ----------
+
+    def lookup(self, token: str) -> Dict[str, Tuple[int, bool]]:
+        """Words a spoken token can stand for: word -> (cost, last word only)"""
+        return self._lexicon.get(token, {})
+
+    def _drop_cost(self, word: str, last: bool) -> Optional[int]:
+        cost = self._droppable.get(word)
+        if last and word in self._droppable_last:
+            cost = min(cost, self._droppable_last[word]) if cost is not None else self._droppable_last[word]
+        return cost
+
+    def _closure(self, hypotheses: List[Tuple[int, TrieNode, int]]) -> List[Tuple[int, TrieNode, int]]:
+        """Add hypotheses that skip swallowed (droppable) words"""
+        result = list(hypotheses)
+        stack = list(hypotheses)
+        while stack:
+            start, node, cost = stack.pop()
+            for word, child in node.children.items():
+                drop = self._droppable.get(word)
+                if drop is not None:
+                    hypothesis = (start, child, cost + drop)
+                    result.append(hypothesis)
+                    stack.append(hypothesis)
+        return result
+
+    def matches(self, text: str) -> List[Tuple[int, int, int, int]]:
+        """
+        Token-aligned phrase occurrences as (start, end, phrase id, cost)
+
+        At least one input token is consumed per match; the cheapest path is
+        kept for each (start, end, phrase id).
+        """
+        tokens = text.split()
+        best: Dict[Tuple[int, int, int], int] = {}
+
+        def emit(start: int, end: int, node: TrieNode, cost: int) -> None:
+            for pid in node.terminals:
+                key = (start, end, pid)
+                if key not in best or cost < best[key]:
+                    best[key] = cost
+
+        frontier: List[Tuple[int, TrieNode, int]] = []
+        for position, token in enumerate(tokens):
+            arcs = self.lookup(token)
+            advanced: List[Tuple[int, TrieNode, int]] = []
+            for start, node, cost in self._closure(frontier + [(position, self.root, 0)]):
+                for word, child in node.children.items():
+                    arc = arcs.get(word)
+                    if arc is None:
+                        continue
+                    arc_cost, final_only = arc
+                    if final_only:
+                        emit(start, position + 1, child, cost + arc_cost)
+                    else:
+                        advanced.append((start, child, cost + arc_cost))
+            # Phrases ending in a swallowed last word
+            for start, node, cost in advanced:
+                emit(start, position + 1, node, cost)
+                for word, child in node.children.items():
+                    drop = self._drop_cost(word, last=bool(child.terminals))
+                    if drop is not None and child.terminals:
+                        emit(start, position + 1, child, cost + drop)
+            frontier = advanced
+        return [(start, end, pid, cost) for (start, end, pid), cost in best.items()]
+
+    def score(self, text: str) -> Dict[int, Tuple[float, int]]:
+        """
+        PhraseIndex.score for the modelled phrases, with accents resolved
+
+        Returns:
+            Mapping phrase id -> (score, distinct phrase words spelled in text)
+        """
+        tokens = text.split()
+        index = self.index
+
+        # Word-overlap tier: which phrase words some input token can spell
+        spelled: Set[str] = set()
+        for token in set(tokens):
+            spelled.update(self.lookup(token))
+        word_hits: Dict[int, int] = {}
+        unique_hits: Dict[int, int] = {}
+        for word in spelled:
+            for pid, count in self._word_pids.get(word, ()):
+                word_hits[pid] = word_hits.get(pid, 0) + count
+                unique_hits[pid] = unique_hits.get(pid, 0) + 1
+
+        scores: Dict[int, Tuple[float, int]] = {}
+        for pid, matched in word_hits.items():
+            if matched >= 2:
+                scores[pid] = (index.weights[pid] + matched * PhraseIndex.WORD_BONUS, unique_hits[pid])
+            elif matched == 1 and self._slots[pid] <= 2:
+                scores[pid] = (index.weights[pid] + 1, unique_hits[pid])
+
+        # Exact / contained tiers: accepted paths through the automaton
+        for start, end, pid, _ in self.matches(text):
+            bonus = PhraseIndex.EXACT_BONUS if start == 0 and end == len(tokens) else PhraseIndex.CONTAINS_BONUS
+            score = index.weights[pid] + bonus
+            if pid not in scores or score > scores[pid][0]:
+                scores[pid] = (score, unique_hits.get(pid, 0))
+        return scores
+
+    def canonicalize(self, text: str) -> str:
+        """Replace each token by the cheapest word it spells (partials, segmentation)"""
+        words = []
+        for token in text.split():
+            arcs = self.lookup(token)
+            if token in arcs or not arcs:
+                words.append(token)
+            else:
+                words.append(min(arcs, key=lambda word: (arcs[word][0], word)))
+        return " ".join(words)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "phrases": len(self._slots),
+            "nodes": self.node_count,
+            "spellings": len(self._lexicon),
+            "arcs": sum(len(entries) for entries in self._lexicon.values()),
+            "droppable": len(self._droppable) + len(self._droppable_last),
+        }
@@ -0,0 +1,185 @@
+# ============================================
+# RECOGNITION RACE - Same utterance to several backends, first confident wins
+# ============================================
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import speech_recognition as sr
+
+from src.core.recognizer_backends import GoogleBackend, RecognizerBackend, VoskBackend
+from src.infrastructure.exceptions import VoiceRecognitionError
+from src.infrastructure.logger import get_logger
+from src.infrastructure.tracing import LatencyHistogram
+
+logger = get_logger(__name__)
+
+RACE_BACKENDS = ("vosk_grammar", "vosk", "google")  # Also the default priority order
+
+
+class RecognitionRace(RecognizerBackend):
+    """
+    Recognize one utterance on several backends at once
+
+    Every backend gets the same audio on a thread pool; the first transcript
+    that accept(text) approves (e.g. the detector's score clears its
+    threshold) is returned and the remaining calls are cancelled. If none is
+    approved, the transcript of the highest-priority backend that answered
+    is returned instead, so the detector can still suggest something.
+
+    Calls already running cannot be interrupted (an HTTP request, a Kaldi
+    decode); they finish in the background and only feed the stats. A
+    backend whose previous call is still running is skipped for the next
+    utterance rather than queued behind it.
+    """
+
+    name = "race"
+
+    def __init__(self, backends: List[RecognizerBackend], accept: Optional[Callable[[str], bool]] = None,
+                 timeout: float = 5.0) -> None:
+        if not backends:
+            raise VoiceRecognitionError("Recognition race needs at least one backend")
+        self.backends = backends
+        self.accept = accept
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=2 * len(backends), thread_name_prefix="race")
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self.races = 0
+        self.last_winner: Optional[str] = None
+        self._stats: Dict[str, Dict[str, Any]] = {
+            backend.name: {"calls": 0, "wins": 0, "fallbacks": 0, "unknown": 0, "errors": 0, "skipped": 0,
+                           "latency": LatencyHistogram()}
+            for backend in backends
+        }
+
+    def _call(self, backend: RecognizerBackend, audio: sr.AudioData) -> str:
+        """Runs on the pool: one backend's recognition, timed"""
+        start = time.perf_counter()
+        outcome = "errors"
+        try:
+            text = backend.recognize(audio)
+            outcome = None
+            return text
+        except sr.UnknownValueError:
+            outcome = "unknown"
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                stats = self._stats[backend.name]
+                stats["calls"] += 1
+                stats["latency"].record(elapsed_ms)
+                if outcome:
+                    stats[outcome] += 1
+
+    def _submit(self, audio: sr.AudioData) -> Dict[Future, Tuple[int, RecognizerBackend]]:
+        futures: Dict[Future, Tuple[int, RecognizerBackend]] = {}
+        with self._lock:
+            for priority, backend in enumerate(self.backends):
+                running = self._inflight.get(backend.name)
+                if running is not None and not running.done():
+                    self._stats[backend.name]["skipped"] += 1
+                    continue
+                future = self._pool.submit(self._call, backend, audio)
+                self._inflight[backend.name] = future
+                futures[future] = (priority, backend)
+        return futures
+
+    def _win(self, backend_name: str, outcome: str = "wins") -> None:
+        with self._lock:
+            self._stats[backend_name][outcome] += 1
+        self.last_winner = backend_name
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        self.races += 1
+        futures = self._submit(audio)
+        if not futures:
+            raise sr.RequestError("All recognizer backends are still busy")
+
+        fallback: Optional[Tuple[int, str, str]] = None  # (priority, backend, text)
+        errors: List[str] = []
+        unclear = False
+        try:
+            for future in as_completed(futures, timeout=self.timeout):
+                priority, backend = futures[future]
+                try:
+                    text = future.result()
+                except sr.UnknownValueError:
+                    unclear = True
+                    continue
+                except Exception as e:
+                    errors.append(f"{backend.name}: {e}")
+                    continue
+                if not text:
+                    unclear = True
+                    continue
+                if self.accept is None or self.accept(text):
+                    self._win(backend.name)
+                    return text
+                if fallback is None or priority < fallback[0]:
+                    fallback = (priority, backend.name, text)
+        except FuturesTimeout:
+            errors.append(f"no confident result within {self.timeout}s")
+        finally:
+            for future in futures:
+                future.cancel()  # Only stops calls that have not started
+
+        if fallback is not None:
+            self._win(fallback[1], "fallbacks")  # Returned, but not a confident win
+            return fallback[2]
+        if unclear:
+            raise sr.UnknownValueError()
+        raise sr.RequestError("; ".join(errors))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per backend: calls, wins, win_rate, fallbacks, unknown, errors, skipped, latency percentiles"""
+        with self._lock:
+            report = {}
+            for name, stats in self._stats.items():
+                entry = {key: value for key, value in stats.items() if key != "latency"}
+                entry["win_rate"] = stats["wins"] / self.races if self.races else 0.0
+                entry["latency_ms"] = stats["latency"].summary()
+                report[name] = entry
+            return report
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        for backend in self.backends:
+            backend.close()
+
+
+def create_race(names: List[str], recognizer: sr.Recognizer, language: str = "id-ID",
+                model_path: str = "model", grammar: Optional[str] = None,
+                accept: Optional[Callable[[str], bool]] = None, timeout: float = 5.0) -> RecognitionRace:
+    """
+    Build a race from backend names, in priority order
+
+    "vosk" decodes free dictation, "vosk_grammar" only the command grammar
+    (skipped when no grammar is given), "google" is the online API. Backends
+    that cannot load (no model, vosk missing) are left out with a warning.
+
+    Raises:
+        VoiceRecognitionError: unknown name, or no backend could be built
+    """
+    backends: List[RecognizerBackend] = []
+    for name in names:
+        if name not in RACE_BACKENDS:
+            raise VoiceRecognitionError(f"Unknown race backend: {name} (choose from {', '.join(RACE_BACKENDS)})")
+        if name == "google":
+            backends.append(GoogleBackend(recognizer, language))
+            continue
+        if name == "vosk_grammar" and not grammar:
+            continue
+        try:
+            backend = VoskBackend(model_path, grammar=grammar if name == "vosk_grammar" else None)
+        except sr.RequestError as e:
+            logger.warning(f"Race backend '{name}' unavailable: {e}")
+            continue
+        backend.name = name
+        backends.append(backend)
+    if not backends:
+        raise VoiceRecognitionError(f"No recognizer backend available for the race ({', '.join(names)})")
+    return RecognitionRace(backends, accept=accept, timeout=timeout)
@@ -0,0 +1,121 @@
+# ============================================
+# RECOGNIZER BACKENDS - Pluggable speech-to-text engines
+# ============================================
+import json
+import threading
+from typing import Any, Dict, Optional, Type
+
+import speech_recognition as sr
+
+from src.core.command_grammar import strip_unknown
+from src.core.streaming_recognizer import DEFAULT_MODEL_PATH, VOSK_AVAILABLE, import_vosk, load_vosk_model
+from src.infrastructure.exceptions import VoiceRecognitionError
+
+
+class RecognizerBackend:
+    """
+    Turns one captured utterance (sr.AudioData) into text
+
+    Backends raise the same exceptions as speech_recognition so the
+    recognizer's retry logic treats every engine alike:
+      - sr.UnknownValueError: audio decoded but nothing intelligible
+      - sr.RequestError:      engine unavailable (network, model, ...)
+    """
+
+    name = "base"
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release engine resources (optional)"""
+
+
+class GoogleBackend(RecognizerBackend):
+    """Google Web Speech API (online, the original behaviour)"""
+
+    name = "google"
+
+    def __init__(self, recognizer: sr.Recognizer, language: str = "id-ID") -> None:
+        self.recognizer = recognizer
+        self.language = language
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+
+class VoskBackend(RecognizerBackend):
+    """
+    Offline Kaldi decoding with the bundled Vosk model
+
+    The model is loaded once per process and a single KaldiRecognizer is
+    reused across utterances (FinalResult() resets it for the next one),
+    so each command costs only the decode itself. With a grammar (JSON
+    list of phrases, see command_grammar) the search is restricted to those
+    phrases plus [unk].
+    """
+
+    name = "vosk"
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, sample_rate: int = 16000,
+                 grammar: Optional[str] = None) -> None:
+        if not VOSK_AVAILABLE:
+            raise sr.RequestError("Vosk not installed. Install with: pip install vosk")
+        try:
+            self.model = load_vosk_model(model_path)
+        except VoiceRecognitionError as e:
+            raise sr.RequestError(str(e))
+        self.sample_rate = sample_rate
+        self.grammar = grammar
+        self._lock = threading.Lock()
+        self._recognizer = self._create_recognizer()
+
+    def _create_recognizer(self) -> Any:
+        vosk = import_vosk()
+        if self.grammar:
+            return vosk.KaldiRecognizer(self.model, self.sample_rate, self.grammar)
+        return vosk.KaldiRecognizer(self.model, self.sample_rate)
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        # Resample once to the rate the recognizer was built for (16-bit mono)
+        pcm = audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2)
+        with self._lock:
+            if self._recognizer is None:
+                self._recognizer = self._create_recognizer()  # Closed earlier: the model is still loaded
+            self._recognizer.AcceptWaveform(pcm)
+            text = json.loads(self._recognizer.FinalResult()).get("text", "")
+        text = strip_unknown(text)
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def close(self) -> None:
+        """Release the decoder; the next recognize() creates a fresh one"""
+        with self._lock:
+            self._recognizer = None
+
+
+BACKENDS: Dict[str, Type[RecognizerBackend]] = {
+    GoogleBackend.name: GoogleBackend,
+    VoskBackend.name: VoskBackend,
+}
+
+
+def create_backend(name: str, recognizer: sr.Recognizer, language: str = "id-ID",
+                   model_path: str = DEFAULT_MODEL_PATH, grammar: Optional[str] = None) -> RecognizerBackend:
+    """
+    Build a backend by its config name ("google" or "vosk")
+
+    grammar only applies to vosk; Google always decodes free dictation.
+
+    Raises:
+        VoiceRecognitionError: unknown name, or vosk selected but unusable
+    """
+    if name == GoogleBackend.name:
+        return GoogleBackend(recognizer, language)
+    if name == VoskBackend.name:
+        try:
+            return VoskBackend(model_path, grammar=grammar)
+        except sr.RequestError as e:
+            raise VoiceRecognitionError(str(e))
+    raise VoiceRecognitionError(f"Unknown recognizer backend: {name} (choose from {', '.join(BACKENDS)})")
@@ -0,0 +1,126 @@
+# ============================================
+# SPECULATIVE DETECTION - Arm a command on stable partials, commit at the endpoint
+# ============================================
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class Speculation:
+    """
+    One utterance's speculative state: idle -> armed -> committed / rolled back
+
+    Every decoder chunk is a frame. A partial that changes the hypothesis
+    calls on_partial; a chunk that leaves it unchanged calls on_silence.
+    The command a partial names (SmartVoiceDetector.match_partial, score >=
+    MIN_SCORE) is armed once it has stayed the same for stable_frames frames.
+    An armed command commits when the hypothesis then stays unchanged for
+    endpoint_ms, i.e. the speaker stopped, well before the decoder's own
+    endpoint; any change that names something else (or nothing) first rolls
+    it back. Without an early commit the final transcript decides as usual.
+    """
+
+    def __init__(self, owner: "SpeculativeDetector") -> None:
+        self.owner = owner
+        self.candidate: Optional[Tuple[str, str]] = None  # (command, phrase)
+        self.stable = 0
+        self.armed: Optional[Tuple[str, str]] = None
+        self.armed_text: Optional[str] = None
+        self.silence_ms = 0.0
+        self.committed = False
+        self.rollbacks = 0
+
+    def on_partial(self, text: str) -> bool:
+        """New partial hypothesis; never stops decoding by itself"""
+        self.silence_ms = 0.0
+        key = self.owner.candidate_of(text)
+        if key is not None and key == self.candidate:
+            self.stable += 1
+        else:
+            if self.armed is not None and key != self.armed:
+                self.armed = self.armed_text = None
+                self.rollbacks += 1
+            self.candidate = key
+            self.stable = 1 if key is not None else 0
+        if self.armed is not None and key == self.armed:
+            self.armed_text = text  # Same command, longer transcript
+        self._maybe_arm(text)
+        return False
+
+    def on_silence(self, chunk_ms: float, text: str) -> bool:
+        """A chunk without a new partial; True = commit the armed command now"""
+        if self.candidate is None:
+            return False
+        self.stable += 1
+        self._maybe_arm(text)
+        if self.armed is None:
+            return False
+        self.silence_ms += chunk_ms
+        if self.silence_ms >= self.owner.endpoint_ms:
+            self.committed = True
+            return True
+        return False
+
+    def _maybe_arm(self, text: str) -> None:
+        if self.armed is None and self.candidate is not None and self.stable >= self.owner.stable_frames:
+            self.armed = self.candidate
+            self.armed_text = text
+
+    def finish(self, text: Optional[str]) -> None:
+        """Record how the utterance ended (text = what the recognizer returned)"""
+        stats = self.owner.counters
+        stats["utterances"] += 1
+        stats["rolled_back"] += self.rollbacks
+        if self.committed:
+            stats["committed_early"] += 1
+        elif self.armed is not None:
+            final = self.owner.candidate_of(text) if text else None
+            stats["confirmed_final" if final == self.armed else "rolled_back"] += 1
+
+
+class SpeculativeDetector:
+    """
+    Speculative partial-transcript detection around a SmartVoiceDetector
+
+    Scores are cached per transcript: decoders revisit the same partials
+    (and the final usually equals the last partial), and the same command
+    phrases recur utterance after utterance, so most frames cost a dict
+    lookup instead of a ranking pass.
+    """
+
+    def __init__(self, detector: Any, stable_frames: int = 3, endpoint_ms: float = 150.0,
+                 cache_size: int = 256) -> None:
+        self.detector = detector
+        self.stable_frames = stable_frames
+        self.endpoint_ms = endpoint_ms
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Optional[Tuple[str, str]]]" = OrderedDict()
+        self.counters = {"utterances": 0, "committed_early": 0, "confirmed_final": 0, "rolled_back": 0,
+                         "cache_hits": 0, "cache_misses": 0}
+
+    def begin(self) -> Speculation:
+        """State for the next utterance"""
+        return Speculation(self)
+
+    def candidate_of(self, text: str) -> Optional[Tuple[str, str]]:
+        """(command, phrase) a transcript would safely execute, or None"""
+        key = " ".join(text.lower().split())
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.counters["cache_hits"] += 1
+            return self._cache[key]
+        self.counters["cache_misses"] += 1
+        match = self.detector.match_partial(key)
+        candidate = None
+        if match is not None and match["score"] >= self.detector.MIN_SCORE:
+            candidate = (match["command"], match["phrase"])
+        self._cache[key] = candidate
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return candidate
+
+    def clear(self) -> None:
+        """Forget cached scores (after the phrase table changes)"""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters)
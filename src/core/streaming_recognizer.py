@@ -0,0 +1,161 @@
+# ============================================
+# STREAMING RECOGNIZER - Incremental Vosk decoding with partial results
+# ============================================
+import importlib.util
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.core.command_grammar import strip_unknown
+from src.infrastructure.exceptions import VoiceRecognitionError
+
+# vosk (and the requests stack it pulls in) is imported only when a Vosk
+# recognizer is built, so sessions on the Google backend never load it
+VOSK_AVAILABLE = importlib.util.find_spec("vosk") is not None
+_vosk: Any = None
+
+DEFAULT_MODEL_PATH = "model"
+
+# One loaded model per path, shared by every recognizer in the process
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+
+def import_vosk() -> Any:
+    """The vosk module, imported on first use"""
+    global _vosk
+    if _vosk is None:
+        import vosk
+        vosk.SetLogLevel(-1)  # Silence Kaldi's startup chatter
+        _vosk = vosk
+    return _vosk
+
+
+def load_vosk_model(model_path: str = DEFAULT_MODEL_PATH) -> Any:
+    """
+    Load (once) the Vosk acoustic model from a directory
+
+    Args:
+        model_path: Directory containing conf/, am/, graph/, ivector/
+
+    Returns:
+        Shared vosk.Model instance
+
+    Raises:
+        VoiceRecognitionError: vosk missing or model directory incomplete
+    """
+    if not VOSK_AVAILABLE:
+        raise VoiceRecognitionError("Vosk not installed. Install with: pip install vosk")
+
+    key = str(Path(model_path).resolve())
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            if not Path(model_path).is_dir():
+                raise VoiceRecognitionError(f"Vosk model directory not found: {model_path}")
+            try:
+                model = import_vosk().Model(model_path)
+            except Exception as e:
+                raise VoiceRecognitionError(f"Cannot load Vosk model from {model_path}: {e}")
+            _models[key] = model
+        return model
+
+
+class StreamingRecognizer:
+    """
+    Incremental decoder: feed PCM chunks, get partial and final hypotheses
+
+    Vosk emits a partial hypothesis after every chunk and a final one at
+    its own endpoint, so callers can act on a command long before the
+    speaker stops and without any network round trip.
+    """
+
+    def __init__(self, sample_rate: int = 16000, model_path: str = DEFAULT_MODEL_PATH,
+                 grammar: Optional[str] = None) -> None:
+        self.sample_rate = sample_rate
+        self.model = load_vosk_model(model_path)
+        if grammar:
+            self._recognizer = import_vosk().KaldiRecognizer(self.model, sample_rate, grammar)
+        else:
+            self._recognizer = import_vosk().KaldiRecognizer(self.model, sample_rate)
+        self._last_partial = ""
+
+    def feed(self, chunk: bytes) -> Tuple[str, str]:
+        """
+        Decode one chunk of 16-bit mono PCM
+
+        Returns:
+            ("final", text) at an endpoint, ("partial", text) when the
+            partial hypothesis changed, ("", "") otherwise
+        """
+        if self._recognizer.AcceptWaveform(chunk):
+            text = strip_unknown(json.loads(self._recognizer.Result()).get("text", ""))
+            self._last_partial = ""
+            return "final", text
+
+        partial = strip_unknown(json.loads(self._recognizer.PartialResult()).get("partial", ""))
+        if partial and partial != self._last_partial:
+            self._last_partial = partial
+            return "partial", partial
+        return "", ""
+
+    def flush(self) -> str:
+        """Force an endpoint and return whatever was decoded so far"""
+        text = strip_unknown(json.loads(self._recognizer.FinalResult()).get("text", ""))
+        self._last_partial = ""
+        return text
+
+    def reset(self) -> None:
+        """Discard the current utterance (e.g. after acting on a partial)"""
+        self._recognizer.Reset()
+        self._last_partial = ""
+
+    def stream(self, read_chunk: Callable[[], bytes],
+               on_partial: Optional[Callable[[str], bool]] = None,
+               timeout: Optional[float] = None,
+               phrase_limit: Optional[float] = None,
+               on_silence: Optional[Callable[[float, str], bool]] = None) -> Optional[str]:
+        """
+        Decode audio until a final result, an accepted partial or timeout
+
+        Args:
+            read_chunk: Returns the next chunk of PCM (blocking)
+            on_partial: Called with each new partial; return True to accept
+                it as the utterance and stop decoding immediately
+            timeout: Seconds to wait for speech to start
+            phrase_limit: Seconds allowed once speech has started
+            on_silence: Once speech has started, called with the chunk
+                length (ms) and the current partial for every chunk that
+                did not change it; return True to accept that partial
+
+        Returns:
+            Accepted partial or final text, None on timeout / silence
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        speaking = False
+        partial = ""
+
+        while deadline is None or time.monotonic() < deadline:
+            chunk = read_chunk()
+            kind, text = self.feed(chunk)
+            if kind == "final" and text:
+                return text
+            if kind == "partial":
+                partial = text
+                if not speaking:
+                    speaking = True
+                    if phrase_limit:
+                        deadline = time.monotonic() + phrase_limit
+                if on_partial is not None and on_partial(text):
+                    self.reset()
+                    return text
+            elif speaking and on_silence is not None and partial:
+                chunk_ms = len(chunk) * 500 / self.sample_rate  # 16-bit mono
+                if on_silence(chunk_ms, partial):
+                    self.reset()
+                    return partial
+
+        text = self.flush()
+        return text or None
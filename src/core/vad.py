@@ -0,0 +1,126 @@
+# ============================================
+# VOICE ACTIVITY DETECTION - Drop silence/noise before recognition
+# ============================================
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+try:
+    import webrtcvad
+    WEBRTCVAD_AVAILABLE = True
+except ImportError:
+    WEBRTCVAD_AVAILABLE = False
+
+WEBRTC_SAMPLE_RATES = (8000, 16000, 32000, 48000)
+WEBRTC_FRAME_MS = (10, 20, 30)
+
+
+class VoiceActivityDetector:
+    """
+    Frame-level speech / non-speech classifier for 16-bit mono PCM
+
+    Uses WebRTC's GMM VAD when installed (and the rate/frame size allow),
+    otherwise an energy + zero-crossing-rate test against an adaptive noise
+    floor. Aggressiveness 0..3 follows WebRTC: higher drops more noise and
+    risks clipping quiet speech.
+    """
+
+    # Energy backend: speech must exceed noise_floor * ratio and an absolute RMS floor
+    THRESHOLD_RATIOS = (1.5, 2.0, 3.0, 4.5)
+    MIN_RMS = (60.0, 100.0, 150.0, 220.0)
+    MAX_ZCR = 0.35  # Above this a quiet frame is hiss, not voice
+    FLOOR_ADAPT = 0.05  # EMA step for the noise floor
+
+    def __init__(self, sample_rate: int = 16000, aggressiveness: int = 2, frame_ms: int = 30,
+                 min_speech_ms: int = 150, backend: Optional[str] = None) -> None:
+        self.sample_rate = sample_rate
+        self.aggressiveness = max(0, min(3, int(aggressiveness)))
+        self.frame_ms = frame_ms
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.min_speech_frames = max(1, int(round(min_speech_ms / frame_ms)))
+        self.noise_floor = self.MIN_RMS[0]
+        self.backend = backend or self._default_backend()
+        self._webrtc = webrtcvad.Vad(self.aggressiveness) if self.backend == "webrtc" else None
+
+        self.frames_forwarded = 0
+        self.frames_dropped = 0
+        self.segments_forwarded = 0
+        self.segments_dropped = 0
+
+    def _default_backend(self) -> str:
+        if WEBRTCVAD_AVAILABLE and self.sample_rate in WEBRTC_SAMPLE_RATES and self.frame_ms in WEBRTC_FRAME_MS:
+            return "webrtc"
+        return "energy"
+
+    def set_aggressiveness(self, aggressiveness: int) -> None:
+        self.aggressiveness = max(0, min(3, int(aggressiveness)))
+        if self._webrtc is not None:
+            self._webrtc.set_mode(self.aggressiveness)
+
+    def _frames(self, pcm: bytes) -> np.ndarray:
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        count = len(samples) // self.frame_length
+        return samples[:count * self.frame_length].reshape(count, self.frame_length)
+
+    def classify(self, pcm: bytes) -> np.ndarray:
+        """Boolean speech flag per frame (trailing partial frame ignored)"""
+        frames = self._frames(pcm)
+        if len(frames) == 0:
+            return np.zeros(0, dtype=bool)
+
+        if self._webrtc is not None:
+            return np.array([self._webrtc.is_speech(frame.tobytes(), self.sample_rate) for frame in frames])
+
+        as_float = frames.astype(np.float64)
+        rms = np.sqrt(np.mean(as_float * as_float, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / self.frame_length
+
+        threshold = max(self.MIN_RMS[self.aggressiveness], self.noise_floor * self.THRESHOLD_RATIOS[self.aggressiveness])
+        # Loud frames count regardless of ZCR (fricatives); quiet ones must look voiced
+        speech = (rms > threshold) & ((zcr < self.MAX_ZCR) | (rms > 2 * threshold))
+
+        quiet = rms[~speech]
+        if len(quiet):
+            self.noise_floor += self.FLOOR_ADAPT * (float(np.median(quiet)) - self.noise_floor)
+        return speech
+
+    def calibrate(self, pcm: bytes) -> None:
+        """Set the noise floor from audio known to contain no speech"""
+        frames = self._frames(pcm)
+        if len(frames):
+            as_float = frames.astype(np.float64)
+            self.noise_floor = float(np.median(np.sqrt(np.mean(as_float * as_float, axis=1))))
+
+    def contains_speech(self, pcm: bytes) -> bool:
+        """
+        Gate one captured segment: True if it holds at least min_speech_ms
+        of consecutive speech frames. Updates forwarded/dropped counters.
+        """
+        speech = self.classify(pcm)
+        longest = run = 0
+        for flag in speech:
+            run = run + 1 if flag else 0
+            longest = max(longest, run)
+
+        forwarded = longest >= self.min_speech_frames
+        if forwarded:
+            self.frames_forwarded += len(speech)
+            self.segments_forwarded += 1
+        else:
+            self.frames_dropped += len(speech)
+            self.segments_dropped += 1
+        return forwarded
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.segments_forwarded + self.segments_dropped
+        return {
+            "backend": self.backend,
+            "aggressiveness": self.aggressiveness,
+            "noise_floor": round(self.noise_floor, 1),
+            "frames_forwarded": self.frames_forwarded,
+            "frames_dropped": self.frames_dropped,
+            "segments_forwarded": self.segments_forwarded,
+            "segments_dropped": self.segments_dropped,
+            "drop_rate": self.segments_dropped / total if total else 0.0,
+        }
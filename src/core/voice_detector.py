@@ -6,10 +6,19 @@ from typing import Optional, Dict, List, Any, Tuple, Set
 from src.utils.validators import InputValidator, get_validator
 from src.utils.feedback import get_feedback_ui
 from src.infrastructure.config import get_config
+from src.infrastructure.unrecognized_store import get_unrecognized_store
 from src.utils.matcher import AdaptiveMatcher
 from src.core.phoneme_variants import PhonemeVariants
+from src.core.phrase_index import PhraseIndex
+from src.core.command_trie import CommandTrie, TrieWalker
+from src.core.phonetic_index import PhoneticIndex
+from src.core.command_grammar import load_lexicon
+from src.core.pronunciation_model import PronunciationModel
+from src.core.fuzzy_scorer import BatchFuzzyScorer
 
 class SmartVoiceDetector:
+    MIN_SCORE = 8.0  # Lowest score detect() executes; below it the match is only a suggestion
+
     def __init__(self, config: Optional[Dict[str, Any]] = None, feedback_ui: Optional[Any] = None) -> None:
         # Import libraries for fuzzy matching and phonetic algorithms
         try:
@@ -25,6 +34,16 @@ class SmartVoiceDetector:
         self.config = config or get_config()
         self.adaptive_matcher = AdaptiveMatcher(base_threshold=6.0)
 
+        # "variants": store generated accent spellings as phrases
+        # "automaton": hand-written phrases, the same spellings as a weighted pronunciation model
+        # "phonetic": hand-written phrases only, accents resolved by phonetic keys
+        self.phrase_model = self.config.get("voice.phrase_model", "automaton")
+
+        # Phrases generated by _expand_with_variants (not written by hand)
+        self.generated_variants: Set[str] = set()
+        # Phrases the pronunciation model covers ("automaton" model)
+        self.pronounced_phrases: List[str] = []
+        
         # Wake words (frasa lengkap) + auto-generated phoneme variants
         self.wake_words = {
             "next": {
@@ -98,30 +117,65 @@ class SmartVoiceDetector:
                 "description": "Show session analytics"
             }
         }
-        self.last_execution_time = 0
-        self.cooldown_seconds = 2  # Cooldown 2 detik setelah eksekusi
+        PhonemeVariants.save_cache()
+        self.last_execution_time = float("-inf")  # time.monotonic() of the last executed command
+        self.cooldown_seconds = 2  # Cooldown 2 detik setelah eksekusi (0 = off)
+
+        # Fuzzy fallback tier: similarity cutoff (%) and optional top-k
+        self.fuzzy_cutoff = self.config.get("voice.fuzzy_cutoff", 85)
+        self.fuzzy_top_k = self.config.get("voice.fuzzy_top_k", None)
+
+        # Compiled matcher (exact table + token index + substring automaton)
+        self.rebuild_index()
+
+    def rebuild_index(self) -> None:
+        """Recompile the phrase index after wake_words were modified"""
+        self.phrase_index = PhraseIndex(self.wake_words)
+        self.command_trie = CommandTrie(self.phrase_index)
+        self.phonetic_index = None
+        if self.phrase_model == "phonetic":
+            self.phonetic_index = PhoneticIndex(
+                self.phrase_index.phrases, aliases=PhonemeVariants.WORD_SUBSTITUTIONS,
+                dictionary=load_lexicon(self.config.get("voice.model_path", "model"))
+            )
+        self.pronunciation_model = None
+        if self.phrase_model == "automaton":
+            self.pronunciation_model = PronunciationModel(self.phrase_index, self.pronounced_phrases)
+        self._partial_walker = self.command_trie.walker()
+        self.fuzzy_scorer = BatchFuzzyScorer(
+            self.phrase_index.phrases, cutoff=self.fuzzy_cutoff, top_k=self.fuzzy_top_k
+        )
     
     def _expand_with_variants(self, phrases: List[str]) -> List[str]:
         """Expand phrase list with phoneme variants - minimal filtering"""
-        expanded = set()
+        if self.phrase_model == "automaton":
+            self.pronounced_phrases.extend(phrases)
+            return list(phrases)  # Variants live in the pronunciation model instead
+        if self.phrase_model == "phonetic":
+            # Accents are handled by the phonetic index instead; a swallowed
+            # word ("slide" for "slide next") has no key, so keep those forms
+            kept: Dict[str, None] = dict.fromkeys(phrases)
+            for phrase in phrases:
+                words = set(phrase.split())
+                for variant in PhonemeVariants.expand(phrase, region='mixed'):
+                    if variant and len(variant.split()) < len(phrase.split()) and words.issuperset(variant.split()):
+                        kept[variant] = None
+            self.generated_variants.update(variant for variant in kept if variant not in phrases)
+            return list(kept)
+        
+        expanded: Dict[str, None] = {}  # Ordered set: originals stay first
         
         for phrase in phrases:
             # Add original
-            expanded.add(phrase)
+            expanded[phrase] = None
             
-            # Add phoneme variants (minimal filtering to avoid breaking valid matches)
-            variants = PhonemeVariants.generate_variants(phrase)
-            # Only skip extremely short variants
-            for variant in variants:
+            # Phoneme + regional variants (memoized, disk-cached)
+            for variant in PhonemeVariants.expand(phrase, region='mixed'):
+                # Only skip extremely short variants
                 if len(variant) >= 2:  # Keep anything 2+ chars
-                    expanded.add(variant)
-            
-            # Add regional variants
-            regional = PhonemeVariants.add_regional_variants(phrase, region='mixed')
-            for variant in regional:
-                if len(variant) >= 2:
-                    expanded.add(variant)
+                    expanded[variant] = None
         
+        self.generated_variants.update(variant for variant in expanded if variant not in phrases)
         return list(expanded)
     
     def detect(self, text: str) -> Optional[Dict[str, Any]]:
@@ -142,7 +196,7 @@ class SmartVoiceDetector:
         text = sanitized
         
         # Check cooldown
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_execution_time < self.cooldown_seconds:
             print(f"    [WAIT] Cooldown aktif, tunggu {self.cooldown_seconds - (current_time - self.last_execution_time):.1f} detik lagi")
             return None
@@ -155,71 +209,11 @@ class SmartVoiceDetector:
         # STEP 3: Menampilkan apa yang didengar
         print(f"\n    [HEARD] Anda berkata: '{text_lower}'")
         
-        results = []
-        
         # STEP 4: Mencari perintah terdekat dengan scoring lebih ketat
-        for command, data in self.wake_words.items():
-            for phrase in data["phrases"]:
-                score = 0
-                
-                # EXACT MATCH - poin tertinggi
-                if phrase == text_lower:
-                    score = data["weight"] + 20
-                # PHRASE CONTAINS - poin tinggi
-                elif phrase in text_lower:
-                    score = data["weight"] + 10
-                # PARTIAL MATCH - dengan batasan ketat untuk membedakan open/close
-                else:
-                    phrase_words = phrase.split()
-                    text_words = text_lower.split()
-                    
-                    # Hitung matching words
-                    matching_words = [w for w in phrase_words if w in text_words]
-                    if len(matching_words) >= 2:  # Minimal 2 kata cocok
-                        score = data["weight"] + (len(matching_words) * 3)
-                    elif len(matching_words) == 1 and len(phrase_words) <= 2:  # 1 kata dari 2 kata phrase
-                        score = data["weight"] + 1
-                
-                # Fuzzy Matching hanya untuk sisa yang score 0
-                if score == 0 and self.fuzzy_available:
-                    try:
-                        from fuzzywuzzy import fuzz
-                        similarity = fuzz.ratio(text_lower, phrase)
-                        if similarity >= 85:  # Threshold ketat 85%
-                            score = data["weight"] + (similarity / 20)
-                    except:
-                        pass
-                
-                if score > 0:
-                    results.append({
-                        "command": command,
-                        "phrase": phrase,
-                        "score": score,
-                        "max_score": data["weight"] + 20,
-                        "description": data["description"]
-                    })
-        
-        # Sort by score - highest first, with tie-breaking:
-        # When scores are equal, prefer commands with exact/closer phrase matches
-        def sort_key(result):
-            score = result["score"]
-            # Secondary sort: prefer exact/longer phrase matches
-            phrase_length = len(result["phrase"].split())
-            phrase_match_quality = 0
-            
-            # Check how well the phrase matches the input
-            phrase_words = set(result["phrase"].split())
-            text_words = set(text_lower.split())
-            matching_words = len(phrase_words & text_words)
-            phrase_match_quality = matching_words / max(len(phrase_words), 1)
-            
-            # Return tuple: (score descending, match quality descending, phrase length descending)
-            return (-score, -phrase_match_quality, -phrase_length)
-        
-        results.sort(key=sort_key)
+        best_match = self._rank(text_lower)
         
         # STEP 5: Jika tidak ada hasil, simpan ke file
-        if not results:
+        if best_match is None:
             self._save_unrecognized_command(text_lower)
             print(f"    [NOT FOUND] Perintah tidak dikenali: '{text_lower}'")
             print(f"    [TIP] Ucapkan: 'next slide', 'back slide', 'open slide show', 'close slide show', 'help menu', atau 'stop program'")
@@ -229,10 +223,9 @@ class SmartVoiceDetector:
                 "user_input": text_lower
             }
         
-        best_match = results[0]
         
         # Cek apakah skor cukup tinggi
-        min_score_threshold = 8.0
+        min_score_threshold = self.MIN_SCORE
         
         if best_match["score"] >= min_score_threshold:
             # SECURITY: Validate command is safe
@@ -250,6 +243,12 @@ class SmartVoiceDetector:
             if hasattr(self.adaptive_matcher, 'record_success'):
                 self.adaptive_matcher.record_success(best_match["command"], best_match["score"])
             
+            # Several commands in one breath ("next slide next slide") run in order
+            sequence = self.command_trie.segment(self._canonical(text_lower))
+            if len(sequence) > 1:
+                best_match["sequence"] = sequence
+                print(f"    [SEQ] {len(sequence)} perintah: {', '.join(step['command'] for step in sequence)}")
+            
             return best_match
         
         else:
@@ -278,6 +277,104 @@ class SmartVoiceDetector:
                 "user_input": text_lower
             }
     
+    def _rank(self, text_lower: str) -> Optional[Dict[str, Any]]:
+        """Best-scoring phrase for sanitized, lower-cased text (no side effects)"""
+        # Phrases may have been added (e.g. accent training) since compilation
+        if self.phrase_index.is_stale(self.wake_words):
+            self.rebuild_index()
+        index = self.phrase_index
+        
+        # Exact / phrase-in-text / word-overlap tiers via compiled index
+        scores = index.score(text_lower)
+        
+        # Same tiers for accented spellings of the modelled phrases
+        if self.pronunciation_model is not None:
+            for pid, hit in self.pronunciation_model.score(text_lower).items():
+                if pid not in scores or hit[0] > scores[pid][0]:
+                    scores[pid] = hit
+        
+        # Same tiers on the text with accented words mapped onto the phrase vocabulary;
+        # one guessed word amid unrelated ones ("opin hello") is not enough on its own
+        if self.phonetic_index is not None:
+            canonical = self._canonical(text_lower)
+            if canonical != text_lower:
+                resolved = all(word in self.phonetic_index.vocabulary for word in canonical.split())
+                for pid, hit in index.score(canonical).items():
+                    if not resolved and hit[1] < min(2, index.unique_word_counts[pid]):
+                        continue
+                    if pid not in scores or hit[0] > scores[pid][0]:
+                        scores[pid] = hit
+        
+        # Fuzzy Matching hanya untuk sisa yang score 0 (batch, threshold ketat 85%)
+        if self.fuzzy_available:
+            text_words = set(text_lower.split())
+            for pid, similarity in self.fuzzy_scorer.score(text_lower, exclude=scores):
+                scores[pid] = (index.weights[pid] + (similarity / 20), index.overlap(pid, text_words))
+        
+        # Highest score first; ties prefer closer word overlap, then longer phrases
+        return index.best(scores)
+    
+    def evaluate(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Score text like detect() but without cooldown, printing or logging
+        
+        Returns:
+            Best match dict, or None if input is invalid or nothing matched
+        """
+        sanitized, error = InputValidator.validate_and_sanitize(text)
+        if error or not sanitized:
+            return None
+        return self._rank(sanitized.lower().strip())
+    
+    def match_partial(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Decide whether a partial (still growing) transcript already names a
+        command unambiguously
+        
+        A partial is accepted when a full command phrase occurs in it and no
+        phrase of a *different* command could still grow out of its tail
+        (e.g. "stop" is held back because "stop slide show" closes the
+        slideshow instead of stopping the program).
+        
+        Returns:
+            Best match dict if safe to act on now, else None
+        """
+        best = self.evaluate(text)
+        if best is None:
+            return None
+        
+        words = self._canonical(InputValidator.sanitize_voice_input(text).lower()).split()
+        spoken = " ".join(words)
+        found = spoken.rfind(best["phrase"])
+        if found < 0:
+            return None  # Only word overlap / fuzzy so far - wait for more audio
+        
+        # Every tail that still contains the matched phrase may keep growing:
+        # tails start at or before the word holding its last occurrence
+        last_start = spoken.count(" ", 0, found) if best["phrase"] else len(words)
+        walker = self._walk_partial(words[:-1])
+        if walker.extending_commands(words[-1], max_start=last_start) - {best["command"]}:
+            return None
+        return best
+    
+    def _canonical(self, text_lower: str) -> str:
+        """Text with accented words mapped onto the phrase vocabulary (automaton / phonetic model)"""
+        if self.pronunciation_model is not None:
+            return self.pronunciation_model.canonicalize(text_lower)
+        if self.phonetic_index is not None:
+            return self.phonetic_index.canonicalize(text_lower)
+        return text_lower
+    
+    def _walk_partial(self, words: List[str]) -> TrieWalker:
+        """Trie walker over the finished words of a partial, reusing the previous partial's walk"""
+        walker = self._partial_walker
+        tokens = self.command_trie.tokenize(" ".join(words))
+        if tokens[:len(walker.tokens)] != walker.tokens:
+            walker.reset()  # The decoder revised an earlier word
+        for word in words[len(walker.tokens):]:
+            walker.push(word)
+        return walker
+    
     def show_help(self) -> None:
         """Tampilkan bantuan wake words"""
         print("\n" + "[SPEAKER] " + "="*50)
@@ -289,7 +386,8 @@ class SmartVoiceDetector:
             phrases = ", ".join(data['phrases'])
             print(f"   Frasa: {phrases}")
         
-        print(f"\n[WAIT] Cooldown: {self.cooldown_seconds} detik setelah setiap eksekusi")
+        if self.cooldown_seconds:
+            print(f"\n[WAIT] Cooldown: {self.cooldown_seconds} detik setelah setiap eksekusi")
         print("\n[INFO] FITUR TOLERANSI:")
         print("   • Fuzzy Matching: Mendeteksi frasa mirip (80%+ similarity)")
         print("   • Phonetic Algorithms: Mendeteksi kata dengan bunyi serupa")
@@ -309,35 +407,10 @@ class SmartVoiceDetector:
         print("="*50 + "\n")
     
     def _save_unrecognized_command(self, user_input: str, closest_match: Optional[str] = None, confidence: float = 0.0, suggestion: Optional[str] = None) -> None:
-        """Simpan perintah yang tidak dikenali ke file untuk analisis"""
-        import json
-        from datetime import datetime
-        
+        """Simpan perintah yang tidak dikenali ke log untuk analisis (ditulis di background)"""
         try:
-            # Load existing data
-            try:
-                with open("unrecognized_commands.json", "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            except:
-                data = {"unrecognized_commands": [], "metadata": {"total_unrecognized": 0}}
-            
-            # Add new entry
-            entry = {
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "user_input": user_input,
-                "closest_match": closest_match or "none",
-                "confidence": round(confidence, 2),
-                "suggestions": [suggestion] if suggestion else []
-            }
-            
-            data["unrecognized_commands"].append(entry)
-            data["metadata"]["total_unrecognized"] = len(data["unrecognized_commands"])
-            data["metadata"]["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Save back
-            with open("unrecognized_commands.json", "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            print(f"    [SAVED] Disimpan ke unrecognized_commands.json")
+            store = get_unrecognized_store()
+            store.record(user_input, closest_match, confidence, suggestion)
+            print(f"    [SAVED] Disimpan ke {store.path}")
         except Exception as e:
-            print(f"    [WARN] Error saving unrecognized command: {e}")
\ No newline at end of file
+            print(f"    [WARN] Error saving unrecognized command: {e}")
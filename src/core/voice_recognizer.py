@@ -3,20 +3,29 @@
 # No external dependencies, self-contained
 # ============================================
 import speech_recognition as sr
-import pyaudio
 import numpy as np
 import time
-from typing import Optional, List, Dict, Any
+from typing import Callable, Optional, List, Dict, Any
+from src.infrastructure.config import get_config
+from src.infrastructure.exceptions import VoiceRecognitionError
+from src.infrastructure.tracing import CAPTURED, RECOGNIZED, SPEECH_END, SPEECH_START, mark
+from src.core.recognizer_backends import RecognizerBackend, GoogleBackend, create_backend
+from src.core.audio_session import AudioSession, list_input_devices
+from src.core.vad import VoiceActivityDetector
+from src.core.denoise import SpectralGate
 
 class HybridVoiceRecognizer:
     def __init__(self, debug_mode: bool = True, config: Optional[Dict[str, Any]] = None) -> None:
         self.recognizer = sr.Recognizer()
+        self.config = config or get_config()
         self.microphone = None
+        self.session: Optional[AudioSession] = None  # Long-lived input stream
         self.is_ready = False
         self.device_index = None
         self.speech_history = []
         self.debug_mode = debug_mode
-        self.noise_reduction_enabled = False
+        self.noise_reduction_enabled = self.config.get("voice.noise_reduction", False)
+        self.denoiser: Optional[SpectralGate] = None  # Built at calibration (needs the device rate)
         
         # Settings
         self.listen_timeout = 5
@@ -27,6 +36,26 @@ class HybridVoiceRecognizer:
         
         # Adaptive threshold
         self.base_energy_threshold = 300
+        
+        # Speech-to-text engine ("google" online, "vosk" offline)
+        self.backend_name = self.config.get("voice.backend", "google")
+        self.model_path = self.config.get("voice.model_path", "model")
+        self.backend: Optional[RecognizerBackend] = None
+        self.command_grammar: Optional[str] = None  # JSON phrase list (vosk only)
+        self.accept_transcript: Optional[Callable[[str], bool]] = None  # "race": is this text confident enough?
+        
+        # Voice activity gate in front of the recognizer backend
+        self.vad_aggressiveness = self.config.get("voice.vad_aggressiveness", 2)
+        self.vad: Optional[VoiceActivityDetector] = None
+        if self.config.get("voice.vad_enabled", True):
+            self.vad = VoiceActivityDetector(
+                sample_rate=16000,
+                aggressiveness=self.vad_aggressiveness,
+                min_speech_ms=self.config.get("voice.vad_min_speech_ms", 150)
+            )
+        
+        # Offline streaming decoder (created lazily by listen_streaming)
+        self.streaming_recognizer = None
 
     def initialize(self) -> bool:
         """Initialize Hybrid Speech Recognition"""
@@ -34,20 +63,27 @@ class HybridVoiceRecognizer:
             # List devices
             self.list_audio_devices()
 
-            # Microphone setup
+            # Microphone setup (stream is opened once and kept hot)
             try:
+                self.microphone = self._open_session().source()
                 if self.device_index is not None:
-                    self.microphone = sr.Microphone(device_index=self.device_index)
                     print(f"✅ Microphone selected: Device {self.device_index}")
                 else:
-                    self.microphone = sr.Microphone()
                     print("✅ Microphone ready (default)")
 
                 # Calibrate microphone
                 with self.microphone as source:
                     print("🎤 Calibrating microphone...")
+                    source.transform = None  # Profile the raw room noise
                     self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                    frames = int(source.SAMPLE_RATE * 0.3)
+                    ambient = sr.AudioData(source.stream.read(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+                    if self.vad is not None:
+                        self.vad.calibrate(ambient.get_raw_data(convert_rate=self.vad.sample_rate, convert_width=2))
+                    self.denoiser = SpectralGate(source.SAMPLE_RATE)
+                    self.denoiser.learn_noise(ambient.get_raw_data())
                     print("🎤 Microphone calibrated")
+                self._apply_noise_reduction()
 
             except Exception as mic_error:
                 print(f"❌ Microphone setup error: {mic_error}")
@@ -57,8 +93,14 @@ class HybridVoiceRecognizer:
                 print("   3. Check Windows Sound Settings")
                 return False
 
+            self.backend = self._create_backend()
             self.is_ready = True
-            print("🔄 Hybrid mode: Google API (primary)")
+            if self.backend.name == "vosk":
+                print("🔄 Offline mode: Vosk (local model)")
+            elif self.backend.name == "race":
+                print(f"🔄 Race mode: {', '.join(b.name for b in self.backend.backends)} in parallel")
+            else:
+                print("🔄 Hybrid mode: Google API (primary)")
             return True
 
         except Exception as e:
@@ -66,18 +108,73 @@ class HybridVoiceRecognizer:
             self.is_ready = False
             return False
 
-    def list_audio_devices(self) -> None:
-        """List available audio input devices"""
+    def _create_backend(self) -> RecognizerBackend:
+        """Build the configured backend, falling back to Google if it cannot load"""
+        if self.backend is not None and self.backend.name == self.backend_name:
+            if self.backend_name == "race":
+                from src.core.recognition_race import RecognitionRace
+                if isinstance(self.backend, RecognitionRace):
+                    self.backend.accept = self.accept_transcript  # May have been built before it was set
+            return self.backend  # Keep the loaded model across re-initialization
+        try:
+            if self.backend_name == "race":
+                from src.core.recognition_race import RACE_BACKENDS, create_race
+                return create_race(
+                    self.config.get("voice.race_backends", list(RACE_BACKENDS)), self.recognizer,
+                    self.google_language, self.model_path, grammar=self.command_grammar,
+                    accept=self.accept_transcript, timeout=self.config.get("voice.race_timeout", 5.0)
+                )
+            return create_backend(self.backend_name, self.recognizer, self.google_language,
+                                  self.model_path, grammar=self.command_grammar)
+        except VoiceRecognitionError as e:
+            print(f"⚠️  {e}")
+            print("💡 Falling back to Google API")
+            return GoogleBackend(self.recognizer, self.google_language)
+
+    def use_command_grammar(self, grammar: Optional[str]) -> None:
+        """
+        Restrict offline decoding to a closed phrase list (None = free dictation)
+        
+        Args:
+            grammar: JSON list of phrases, e.g. from command_grammar.grammar_json
+        """
+        if grammar == self.command_grammar:
+            return
+        self.command_grammar = grammar
+        # Decoders are built with the grammar baked in - rebuild on next use
+        if self.backend is not None and self.backend.name in ("vosk", "race"):
+            self.backend.close()
+            self.backend = None
+            if self.is_ready:
+                self.backend = self._create_backend()
+        self.streaming_recognizer = None
+
+    def _open_session(self) -> AudioSession:
+        """Reuse the running audio session, or open one for the selected device"""
+        if self.session is not None and self.session.device_index != self.device_index:
+            self.session.close()
+            self.session = None
+        if self.session is None:
+            self.session = AudioSession(device_index=self.device_index)
+        self.session.open()
+        return self.session
+
+    def close(self) -> None:
+        """Release the microphone"""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+        self.microphone = None
+        self.is_ready = False
+
+    def list_audio_devices(self, refresh: bool = False) -> None:
+        """List available audio input devices (cached, refresh after hot-plug)"""
         try:
-            audio = pyaudio.PyAudio()
             print("\n🎙️  AUDIO INPUT DEVICES:")
             print("-" * 40)
-            for i in range(audio.get_device_count()):
-                device_info = audio.get_device_info_by_index(i)
-                if device_info.get('maxInputChannels') > 0:
-                    print(f"  {i}: {device_info.get('name')} (Channels: {device_info.get('maxInputChannels')})")
+            for device in list_input_devices(refresh=refresh):
+                print(f"  {device['index']}: {device['name']} (Channels: {device['channels']})")
             print("-" * 40)
-            audio.terminate()
         except Exception as e:
             print(f"⚠️  Cannot list devices: {e}")
 
@@ -93,6 +190,29 @@ class HybridVoiceRecognizer:
         if len(self.speech_history) > 10:
             self.speech_history.pop(0)
 
+    def _has_speech(self, audio: sr.AudioData) -> bool:
+        """VAD gate: False if the captured segment is only silence / noise"""
+        if self.vad is None:
+            return True
+        pcm = audio.get_raw_data(convert_rate=self.vad.sample_rate, convert_width=2)
+        return self.vad.contains_speech(pcm)
+
+    def _mark_capture(self, audio: sr.AudioData) -> None:
+        """
+        Trace milestones for a captured phrase
+        
+        listen() returns pause_threshold after the speaker stopped and keeps
+        up to non_speaking_duration of silence before the speech, so both
+        ends are estimated from the returned audio length.
+        """
+        captured = time.perf_counter()
+        duration = len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+        speech_end = captured - min(self.recognizer.pause_threshold, duration)
+        speech_start = captured - duration + min(self.recognizer.non_speaking_duration, duration)
+        mark(SPEECH_START, min(speech_start, speech_end))
+        mark(SPEECH_END, speech_end)
+        mark(CAPTURED, captured)
+
     def listen_google_primary(self) -> Optional[str]:
         """Try Google Speech API with retry logic"""
         for attempt in range(self.max_retries):
@@ -107,15 +227,23 @@ class HybridVoiceRecognizer:
                         timeout=self.listen_timeout,
                         phrase_time_limit=self.phrase_limit
                     )
+                    self._mark_capture(audio)
+
+                    # Noise that crossed the energy threshold: don't waste a recognition call
+                    if not self._has_speech(audio):
+                        if self.debug_mode:
+                            print("\r    🔇 No voice activity")
+                        return None
 
                     if self.debug_mode:
                         print("\r    ⏳ Recognizing...", end="", flush=True)
 
-                    # Recognize with Google Speech API
-                    text = self.recognizer.recognize_google(audio, language=self.google_language)
+                    # Recognize with the configured backend (Google by default)
+                    text = self.backend.recognize(audio)
+                    mark(RECOGNIZED)
 
                     if self.debug_mode:
-                        print(f"\r    📝 Google: '{text}'")
+                        print(f"\r    📝 {self.backend.name.capitalize()}: '{text}'")
 
                     self.add_to_history(text)
                     return text
@@ -159,6 +287,53 @@ class HybridVoiceRecognizer:
         
         return None
 
+    def capture_utterance(self) -> Optional[sr.AudioData]:
+        """
+        Record one utterance without recognizing it (pipeline capture stage)
+        
+        Returns:
+            Captured audio, or None if nobody spoke before listen_timeout
+        """
+        if not self.is_ready:
+            return None
+        try:
+            with self.microphone as source:
+                audio = self.recognizer.listen(
+                    source,
+                    timeout=self.listen_timeout,
+                    phrase_time_limit=self.phrase_limit
+                )
+        except sr.WaitTimeoutError:
+            return None
+        self._mark_capture(audio)
+        return audio
+
+    def recognize_audio(self, audio: sr.AudioData) -> Optional[str]:
+        """
+        Recognize a captured utterance (pipeline recognize stage)
+        
+        Returns:
+            Recognized text, or None if unclear / engine unavailable
+        """
+        if not self._has_speech(audio):
+            return None
+        try:
+            text = self.backend.recognize(audio)
+            mark(RECOGNIZED)
+        except sr.UnknownValueError:
+            if self.debug_mode:
+                print("    🤔 Speech unclear")
+            return None
+        except sr.RequestError as e:
+            if self.debug_mode:
+                print(f"    ❌ API Error: {str(e)[:50]}")
+            return None
+
+        if self.debug_mode:
+            print(f"    📝 {self.backend.name.capitalize()}: '{text}'")
+        self.add_to_history(text)
+        return text
+
     def listen(self, timeout: Optional[int] = None, phrase_limit: Optional[int] = None) -> Optional[str]:
         """Main listen method with smart retry"""
         if not self.is_ready:
@@ -174,6 +349,68 @@ class HybridVoiceRecognizer:
         text = self.listen_google_primary()
         return text
 
+    def listen_streaming(self, on_partial: Optional[Callable[[str], bool]] = None,
+                         model_path: str = "model",
+                         on_silence: Optional[Callable[[float, str], bool]] = None) -> Optional[str]:
+        """
+        Listen with the offline Vosk decoder, reporting partial hypotheses
+        
+        Args:
+            on_partial: Called with each new partial; return True to act on it
+                without waiting for the end of the utterance
+            model_path: Vosk model directory
+            on_silence: Called with (chunk ms, partial) for chunks that left
+                the partial unchanged; return True to act on that partial
+        
+        Returns:
+            Recognized text, or None on timeout / failure
+        """
+        if not self.is_ready:
+            return None
+
+        # Imported here so the Google-only path works without vosk installed
+        from src.core.streaming_recognizer import StreamingRecognizer
+        from src.infrastructure.exceptions import VoiceRecognitionError
+
+        try:
+            with self.microphone as source:
+                if self.streaming_recognizer is None or self.streaming_recognizer.sample_rate != source.SAMPLE_RATE:
+                    self.streaming_recognizer = StreamingRecognizer(source.SAMPLE_RATE, model_path,
+                                                                    grammar=self.command_grammar)
+                else:
+                    self.streaming_recognizer.reset()
+
+                if self.debug_mode:
+                    print("    🔊 Listening (streaming)...", end="", flush=True)
+
+                text = self.streaming_recognizer.stream(
+                    lambda: source.stream.read(source.CHUNK),
+                    on_partial=on_partial,
+                    timeout=self.listen_timeout,
+                    phrase_limit=self.phrase_limit,
+                    on_silence=on_silence,
+                )
+
+        except VoiceRecognitionError as e:
+            if self.debug_mode:
+                print(f"\r    ❌ Streaming unavailable: {str(e)[:50]}")
+            return None
+        except Exception as e:
+            if self.debug_mode:
+                print(f"\r    ❌ Error: {str(e)[:50]}")
+            return None
+
+        if not text:
+            if self.debug_mode:
+                print("\r    ⏰ No speech detected")
+            return None
+
+        mark(RECOGNIZED)
+        if self.debug_mode:
+            print(f"\r    📝 Vosk: '{text}'")
+        self.add_to_history(text)
+        return text
+
     def listen_quick(self, timeout: int = 2) -> Optional[str]:
         """Quick listen for confirmation"""
         try:
@@ -183,7 +420,9 @@ class HybridVoiceRecognizer:
                     timeout=timeout,
                     phrase_time_limit=2
                 )
-                text = self.recognizer.recognize_google(audio, language=self.google_language)
+                if not self._has_speech(audio):
+                    return None
+                text = self.backend.recognize(audio)
                 return text
         except:
             return None
@@ -232,7 +471,8 @@ class HybridVoiceRecognizer:
                 audio = self.recognizer.listen(source, timeout=duration, phrase_time_limit=duration)
 
                 print("   Recognizing...")
-                text = self.recognizer.recognize_google(audio, language=self.google_language)
+                self.backend = self.backend or self._create_backend()
+                text = self.backend.recognize(audio)
 
                 print(f"   ✅ Detected: '{text}'")
                 print("   🎉 Microphone test successful!")
@@ -265,6 +505,18 @@ class HybridVoiceRecognizer:
         else:
             self.recognizer.dynamic_energy_threshold = False
             self.recognizer.energy_threshold = 300
+        self._apply_noise_reduction()
+
+    def _apply_noise_reduction(self) -> None:
+        """Push the noise-reduction flag to the VAD and denoiser (energy threshold untouched)"""
+        # Noisy room: let the VAD reject more
+        if self.vad is not None:
+            boost = 1 if self.noise_reduction_enabled else 0
+            self.vad.set_aggressiveness(self.vad_aggressiveness + boost)
+        
+        # Spectral gate runs on every chunk read from the microphone
+        if self.microphone is not None:
+            self.microphone.transform = self.denoiser if self.noise_reduction_enabled else None
 
     def set_debug_mode(self, enabled: bool = True) -> None:
         """Enable or disable debug mode"""
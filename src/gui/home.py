@@ -14,9 +14,8 @@ Fitur:
 import customtkinter as ctk
 from tkinter import messagebox
 from datetime import datetime
-import os
-import json
 from src.infrastructure.constants import MAIN_COMMANDS, get_command_description
+from src.infrastructure.stats_store import get_stats_store
 from typing import Callable, Optional
 
 class GUIHome:
@@ -397,15 +396,8 @@ class GUIHome:
         )
         title.pack(pady=10)
         
-        # Load stats if available
-        stats_file = "command_stats.json"
-        stats = {}
-        if os.path.exists(stats_file):
-            try:
-                with open(stats_file, 'r', encoding='utf-8') as f:
-                    stats = json.load(f)
-            except:
-                pass
+        # Counters from memory (shared with StatsPanel), not from disk
+        stats = get_stats_store("command_stats.json").snapshot()
         
         # System stats
         stats_frame = ctk.CTkFrame(self.content_display, fg_color="#1a1a1a")
@@ -12,33 +12,31 @@ Fitur:
 
 import customtkinter as ctk
 from datetime import datetime
-import json
-import os
-from typing import Dict, List
+from typing import Dict, List, Optional
+from src.infrastructure.stats_store import get_stats_store
+from src.infrastructure.telemetry import get_telemetry
 
 class StatsPanel:
     def __init__(self, parent=None):
         """Initialize statistics panel"""
         self.parent = parent
         self.stats_file = "command_stats.json"
-        self.stats = self._load_stats()
+        # Shared in-memory counters, written to disk in the background
+        self.store = get_stats_store(self.stats_file, defaults=self._load_stats())
+        self.stats = self.store.data
         self.performance_metrics = {
             "recognition_accuracy": 0.85,  # 85%
-            "avg_response_time": 0.42,     # 0.42 seconds
+            "avg_response_time": None,     # Seconds, from telemetry (None = no data yet)
+            "response_p50": None,
+            "response_p95": None,
+            "response_p99": None,
             "total_commands_run": 0,
             "successful_commands": 0,
             "failed_commands": 0,
         }
     
     def _load_stats(self) -> Dict:
-        """Load statistics from file"""
-        if os.path.exists(self.stats_file):
-            try:
-                with open(self.stats_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                pass
-        
+        """Default counters (values on disk are merged in by the store)"""
         return {
             "next_slide": 0,
             "previous_slide": 0,
@@ -49,26 +47,40 @@ class StatsPanel:
         }
     
     def save_stats(self):
-        """Save statistics to file"""
-        try:
-            with open(self.stats_file, 'w', encoding='utf-8') as f:
-                json.dump(self.stats, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving stats: {e}")
+        """Save statistics to file now (normally done by the store's timer)"""
+        self.store.flush()
     
     def record_command(self, command: str):
         """Record a command execution"""
         if command in self.stats:
-            self.stats[command] += 1
+            self.store.increment(command)
             self.performance_metrics["total_commands_run"] += 1
             self.performance_metrics["successful_commands"] += 1
-            self.save_stats()
     
     def record_failure(self, command: str):
         """Record a failed recognition"""
         self.performance_metrics["total_commands_run"] += 1
         self.performance_metrics["failed_commands"] += 1
     
+    def refresh_latency(self):
+        """Pull end-of-speech -> command executed latency recorded by the voice loop"""
+        telemetry = get_telemetry()
+        if telemetry is None:
+            return
+        try:
+            response = telemetry.latency_summary("response")
+        except Exception as e:
+            print(f"[WARN] Cannot read latency telemetry: {e}")
+            return
+        if response["count"]:
+            self.performance_metrics["avg_response_time"] = response["mean_ms"] / 1000
+            for p in ("p50", "p95", "p99"):
+                self.performance_metrics[f"response_{p}"] = response[f"{p}_ms"] / 1000
+    
+    @staticmethod
+    def _seconds(value: Optional[float]) -> str:
+        return "n/a" if value is None else f"{value:.2f}s"
+    
     def get_command_usage(self) -> List[tuple]:
         """Get commands sorted by usage"""
         return sorted(self.stats.items(), key=lambda x: x[1], reverse=True)
@@ -101,9 +113,12 @@ class StatsPanel:
         stats_frame.pack(pady=10, padx=10, fill="both")
         
         # Performance metrics
+        self.refresh_latency()
         metrics_data = [
             ("Recognition Accuracy", f"{self.performance_metrics['recognition_accuracy']*100:.1f}%"),
-            ("Avg Response Time", f"{self.performance_metrics['avg_response_time']:.2f}s"),
+            ("Avg Response Time", self._seconds(self.performance_metrics['avg_response_time'])),
+            ("Response p50 / p95 / p99", " / ".join(
+                self._seconds(self.performance_metrics[f'response_{p}']) for p in ("p50", "p95", "p99"))),
             ("Total Commands", str(self.performance_metrics['total_commands_run'])),
             ("Success Rate", f"{(self.performance_metrics['successful_commands'] / max(self.performance_metrics['total_commands_run'], 1) * 100):.1f}%"),
         ]
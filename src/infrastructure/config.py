@@ -4,6 +4,7 @@ Load configuration from file, environment variables, or defaults
 """
 
 import os
+import copy
 import json
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -30,6 +31,25 @@ DEFAULT_CONFIG = {
         "energy_threshold": 300,
         "max_retries": 3,
         "retry_delay": 0.5,
+        "fuzzy_cutoff": 85,  # Minimum fuzz ratio for the fuzzy fallback tier
+        "fuzzy_top_k": None,  # Keep only the k most similar phrases (None = all)
+        "phrase_model": "automaton",  # Accent tolerance: "automaton" (weighted pronunciation model), "variants" (every spelling stored) or "phonetic" (phonetic-key index)
+        "backend": "google",  # Speech-to-text engine: "google" (online), "vosk" (offline) or "race" (several at once)
+        "race_backends": ["vosk_grammar", "vosk", "google"],  # backend "race": raced engines, in priority order
+        "race_timeout": 5.0,  # backend "race": seconds to wait for a confident transcript
+        "constrained_grammar": False,  # Vosk decodes only command phrases + [unk]
+        "noise_reduction": False,  # Streaming spectral-gate denoise before recognition
+        "vad_enabled": True,  # Skip recognition for segments without voice activity
+        "vad_aggressiveness": 2,  # 0 (keep most audio) .. 3 (drop most noise)
+        "vad_min_speech_ms": 150,  # Shortest run of speech frames that counts as an utterance
+        "pipelined": True,  # Capture keeps running while recognition/execution work
+        "pipeline_buffer": 8,  # Captured utterances held before the oldest is dropped
+        "pipeline_queue": 4,  # Bound of the recognize->detect->execute queues
+        "streaming": False,  # Offline Vosk decoding, act on partial results
+        "model_path": "model",  # Vosk model directory (offline backend and streaming)
+        "speculative": True,  # streaming: arm a command on stable partials, commit at a short endpoint
+        "speculative_frames": 3,  # streaming: decoder chunks a partial's command must hold before arming
+        "speculative_endpoint_ms": 150,  # streaming: unchanged audio after arming that commits the command
     },
     "microphone": {
         "device_index": None,  # Auto-detect
@@ -52,6 +72,21 @@ DEFAULT_CONFIG = {
         "auto_start_slideshow": False,
         "listen_only_in_slideshow": True,
     },
+    "storage": {
+        "unrecognized_log": "data/unrecognized_commands.jsonl",  # Append-only JSON Lines
+        "unrecognized_max_bytes": 1048576,  # Rotate the active segment at 1MB
+        "unrecognized_segments": 5,  # Rotated segments kept
+        "telemetry_enabled": True,  # Per-session SQLite telemetry
+        "telemetry_db": "data/telemetry.db",
+        "latency_report": "data/latency_report.json",  # Stage p50/p95/p99 + recent traces, written after each run
+    },
+    "service": {
+        "unix_socket": "",  # Also listen on this Unix socket path ("" = TCP only)
+        "host": "127.0.0.1",  # Localhost only; the API has no authentication
+        "port": 8765,
+        "workers": 2,  # Detector processes, each with a warm phrase index
+        "recognizer_threads": 2,
+    },
 }
 
 
@@ -149,6 +184,19 @@ class Config:
         config[keys[-1]] = value
         logger.debug(f"Configuration updated: {key} = {value}")
     
+    def copy(self, overrides: Optional[Dict[str, Any]] = None) -> "Config":
+        """
+        Independent deep copy, e.g. to build a component with different settings
+        
+        Args:
+            overrides: Dot-notation keys to set on the copy (e.g. {"voice.phrase_model": "phonetic"})
+        """
+        clone = Config.__new__(Config)
+        clone._config = copy.deepcopy(self._config)
+        for key, value in (overrides or {}).items():
+            clone.set(key, value)
+        return clone
+    
     def get_section(self, section: str) -> Dict[str, Any]:
         """
         Get entire configuration section
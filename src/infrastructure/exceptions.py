@@ -97,6 +97,13 @@ class AccessibilityError(SlideSenseException):
         super().__init__(message, "ACCESSIBILITY_ERROR")
 
 
+class ServiceError(SlideSenseException):
+    """Raised when the detection service cannot be reached or rejects a request"""
+    
+    def __init__(self, message: str):
+        super().__init__(message, "SERVICE_ERROR")
+
+
 # Error codes mapping
 ERROR_MESSAGES = {
     "MICROPHONE_ERROR": "Microphone error occurred",
@@ -111,6 +118,7 @@ ERROR_MESSAGES = {
     "UI_ERROR": "User interface error occurred",
     "POWERPOINT_ERROR": "PowerPoint control error occurred",
     "ACCESSIBILITY_ERROR": "Accessibility feature error occurred",
+    "SERVICE_ERROR": "Detection service error occurred",
 }
 
 
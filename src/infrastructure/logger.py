@@ -6,14 +6,13 @@ Provides consistent logging across the application
 import logging
 import logging.handlers
 import os
+import threading
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
-# Create logs directory if it doesn't exist
+# Log directory / file (created on the first record written, not at import)
 LOGS_DIR = Path("logs")
-LOGS_DIR.mkdir(exist_ok=True)
-
-# Log file path
 LOG_FILE = LOGS_DIR / f"slidesense_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 
 # Logger configuration
@@ -22,6 +21,53 @@ LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_FORMAT_DETAILED = "%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s"
 
 
+class LazyFileHandler(logging.Handler):
+    """Rotating file handler that creates logs/ and opens its file on the first record"""
+
+    def __init__(self, path: Path, max_bytes: int = 10485760, backup_count: int = 5) -> None:
+        super().__init__(logging.DEBUG)
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._handler: Optional[logging.handlers.RotatingFileHandler] = None
+        self._open_lock = threading.Lock()
+
+    def _open(self) -> logging.Handler:
+        with self._open_lock:
+            if self._handler is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(
+                    self.path, maxBytes=self.max_bytes, backupCount=self.backup_count
+                )
+                handler.setFormatter(self.formatter)
+                self._handler = handler
+        return self._handler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            handler = self._handler or self._open()
+        except OSError:
+            self.handleError(record)
+            return
+        handler.emit(record)
+
+    def close(self) -> None:
+        with self._open_lock:
+            if self._handler is not None:
+                self._handler.close()
+                self._handler = None
+        super().close()
+
+
+# One console and one file handler shared by every SlideSense logger
+_console_handler = logging.StreamHandler()
+_console_handler.setLevel(LOG_LEVEL)
+_console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+_file_handler = LazyFileHandler(LOG_FILE)
+_file_handler.setFormatter(logging.Formatter(LOG_FORMAT_DETAILED))
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a configured logger instance
@@ -38,24 +84,9 @@ def get_logger(name: str) -> logging.Logger:
     if not logger.handlers:
         logger.setLevel(LOG_LEVEL)
         
-        # Console Handler (INFO and above)
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(LOG_LEVEL)
-        console_formatter = logging.Formatter(LOG_FORMAT)
-        console_handler.setFormatter(console_formatter)
-        
-        # File Handler (DEBUG and above - more detailed)
-        file_handler = logging.handlers.RotatingFileHandler(
-            LOG_FILE,
-            maxBytes=10485760,  # 10MB
-            backupCount=5
-        )
-        file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(LOG_FORMAT_DETAILED)
-        file_handler.setFormatter(file_formatter)
-        
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        # Console (LOG_LEVEL and above) + file (DEBUG and above, more detailed)
+        logger.addHandler(_console_handler)
+        logger.addHandler(_file_handler)
     
     return logger
 
@@ -0,0 +1,436 @@
+"""
+Profiling utilities for SlideSense
+
+PerformanceProfiler times functions with time.perf_counter_ns after a few
+warmup calls and drops outliers (Tukey fences on the interquartile range),
+so a GC pause or a context switch does not skew the mean. It can also
+capture a cProfile call graph and tracemalloc peak memory for a benchmark,
+wrap live methods (detector.detect, recognizer.recognize_audio) to time
+real calls, and profile a whole app run (main.py --profile).
+
+CacheOptimizer (LRU memoization with hit statistics), OptimizationAnalyzer
+(heuristic source checks), measure_time and check_performance_target are
+small helpers used alongside it.
+"""
+
+import cProfile
+import functools
+import io
+import json
+import math
+import pstats
+import re
+import statistics
+import textwrap
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds (seconds per call) for the hot paths
+PERFORMANCE_TARGETS: Dict[str, float] = {
+    "command_matching": 0.010,
+    "device_detection": 0.100,
+    "file_operations": 0.500,
+    "voice_recognition": 2.000,
+}
+
+
+class BenchmarkResult:
+    """Timing summary for one function (times in seconds)"""
+
+    def __init__(self, function_name: str, samples_ns: Sequence[int], outlier_factor: float = 1.5) -> None:
+        self.function_name = function_name
+        self.iterations = len(samples_ns)
+        kept, self.outliers = _reject_outliers(samples_ns, outlier_factor)
+        seconds = [ns / 1e9 for ns in kept] or [0.0]
+
+        self.total_time = sum(samples_ns) / 1e9
+        self.avg_time = statistics.fmean(seconds)
+        self.median_time = statistics.median(seconds)
+        self.min_time = min(seconds)
+        self.max_time = max(seconds)
+        self.stdev = statistics.stdev(seconds) if len(seconds) > 1 else 0.0
+        self.p95_time = _percentile(sorted(seconds), 95)
+        self.calls_per_second = 1.0 / self.avg_time if self.avg_time > 0 else math.inf
+
+        self.cpu_profile: Optional[str] = None  # Top of the cProfile report, if captured
+        self.peak_memory: Optional[int] = None  # tracemalloc peak in bytes, if captured
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "function_name": self.function_name,
+            "iterations": self.iterations,
+            "outliers": self.outliers,
+            "avg_time": self.avg_time,
+            "median_time": self.median_time,
+            "min_time": self.min_time,
+            "max_time": self.max_time,
+            "stdev": self.stdev,
+            "p95_time": self.p95_time,
+            "calls_per_second": self.calls_per_second,
+            "peak_memory": self.peak_memory,
+        }
+
+    def __repr__(self) -> str:
+        return (f"BenchmarkResult({self.function_name!r}, n={self.iterations}, "
+                f"avg={self.avg_time * 1e6:.1f}us, p95={self.p95_time * 1e6:.1f}us)")
+
+
+def _percentile(ordered: Sequence[float], p: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+def _reject_outliers(samples: Sequence[int], factor: float) -> Tuple[List[int], int]:
+    """Drop samples outside [Q1 - factor*IQR, Q3 + factor*IQR] (needs >= 10 samples)"""
+    if len(samples) < 10 or factor <= 0:
+        return list(samples), 0
+    ordered = sorted(samples)
+    q1, q3 = _percentile(ordered, 25), _percentile(ordered, 75)
+    spread = q3 - q1
+    low, high = q1 - factor * spread, q3 + factor * spread
+    kept = [s for s in samples if low <= s <= high]
+    return kept, len(samples) - len(kept)
+
+
+class PerformanceProfiler:
+    """Benchmarks, comparisons, hotspot ranking and live instrumentation"""
+
+    def __init__(self, warmup: int = 10, outlier_factor: float = 1.5) -> None:
+        self.warmup = warmup
+        self.outlier_factor = outlier_factor
+        self.results: Dict[str, BenchmarkResult] = {}
+
+        self._live: Dict[str, List[int]] = {}
+        self._live_lock = threading.Lock()
+        self.cpu_stats: Optional[pstats.Stats] = None
+        self.peak_memory: Optional[int] = None
+
+    # ---------- benchmarks ----------
+
+    def benchmark(self, func: Callable[..., Any], iterations: int = 1000, name: Optional[str] = None,
+                  args: Tuple[Any, ...] = (), kwargs: Optional[Dict[str, Any]] = None,
+                  warmup: Optional[int] = None, cpu_profile: bool = False,
+                  trace_memory: bool = False) -> BenchmarkResult:
+        """
+        Time func(*args, **kwargs) once per iteration
+
+        Warmup calls (default min(warmup, iterations // 10), at least one)
+        are not timed. cProfile and tracemalloc run in separate passes after
+        timing so their overhead never reaches the numbers.
+        """
+        name = name or str(getattr(func, "__name__", repr(func)))
+        kwargs = kwargs or {}
+        warmup = max(1, min(self.warmup, iterations // 10)) if warmup is None else warmup
+
+        for _ in range(warmup):
+            func(*args, **kwargs)
+
+        samples = [0] * iterations
+        clock = time.perf_counter_ns
+        for i in range(iterations):
+            start = clock()
+            func(*args, **kwargs)
+            samples[i] = clock() - start
+
+        result = BenchmarkResult(name, samples, self.outlier_factor)
+
+        if cpu_profile:
+            profile = cProfile.Profile()
+            profile.enable()
+            for _ in range(iterations):
+                func(*args, **kwargs)
+            profile.disable()
+            result.cpu_profile = _format_stats(pstats.Stats(profile))
+
+        if trace_memory:
+            already_tracing = tracemalloc.is_tracing()
+            if not already_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            func(*args, **kwargs)
+            result.peak_memory = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+            if not already_tracing:
+                tracemalloc.stop()
+
+        self.results[name] = result
+        return result
+
+    def compare_implementations(self, baseline: Callable[..., Any], candidate: Callable[..., Any],
+                                iterations: int = 1000, args: Tuple[Any, ...] = (),
+                                kwargs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Benchmark two implementations of the same thing
+
+        Returns:
+            baseline / candidate results, speedup (baseline avg / candidate
+            avg), improvement_percent and the name of the faster one
+        """
+        base = self.benchmark(baseline, iterations, args=args, kwargs=kwargs)
+        cand = self.benchmark(candidate, iterations, args=args, kwargs=kwargs)
+        speedup = base.avg_time / cand.avg_time if cand.avg_time > 0 else math.inf
+        improvement = (base.avg_time - cand.avg_time) / base.avg_time * 100 if base.avg_time > 0 else 0.0
+        return {
+            "baseline": base.to_dict(),
+            "candidate": cand.to_dict(),
+            "speedup": speedup,
+            "improvement_percent": improvement,
+            "faster": cand.function_name if cand.avg_time < base.avg_time else base.function_name,
+        }
+
+    def identify_hotspots(self, threshold_percent: float = 10.0) -> List[Tuple[str, float]]:
+        """
+        Functions whose share of all measured time is at least threshold_percent
+
+        Returns:
+            [(name, percent)] sorted by share, largest first
+        """
+        totals = {name: result.avg_time * result.iterations for name, result in self.results.items()}
+        overall = sum(totals.values())
+        if overall <= 0:
+            return []
+        shares = [(name, total / overall * 100) for name, total in totals.items()]
+        return sorted((s for s in shares if s[1] >= threshold_percent), key=lambda s: s[1], reverse=True)
+
+    # ---------- live instrumentation ----------
+
+    def instrument(self, obj: Any, method: str, name: Optional[str] = None) -> None:
+        """Wrap obj.method so every real call is timed (see live_results)"""
+        original = getattr(obj, method)
+        name = name or f"{type(obj).__name__}.{method}"
+        with self._live_lock:
+            samples = self._live.setdefault(name, [])
+
+        @functools.wraps(original)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter_ns()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - start
+                with self._live_lock:
+                    samples.append(elapsed)
+
+        setattr(obj, method, timed)
+
+    def live_results(self) -> Dict[str, BenchmarkResult]:
+        """Summaries of instrumented calls so far (methods never called are left out)"""
+        with self._live_lock:
+            snapshot = {name: list(samples) for name, samples in self._live.items() if samples}
+        return {name: BenchmarkResult(name, samples, self.outlier_factor) for name, samples in snapshot.items()}
+
+    @contextmanager
+    def session(self, cpu: bool = True, memory: bool = True) -> Iterator["PerformanceProfiler"]:
+        """Profile everything inside the block (cProfile call graph, tracemalloc peak)"""
+        profile = cProfile.Profile() if cpu else None
+        started_tracing = memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield self
+        finally:
+            if profile is not None:
+                profile.disable()
+                self.cpu_stats = pstats.Stats(profile)
+            if memory and tracemalloc.is_tracing():
+                self.peak_memory = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+
+    # ---------- reporting ----------
+
+    def report(self) -> str:
+        """Text table of benchmarks and instrumented calls"""
+        rows = list(self.results.values()) + list(self.live_results().values())
+        lines = [f"{'function':<40} {'calls':>7} {'avg':>10} {'p95':>10} {'max':>10} {'calls/s':>10}"]
+        for r in rows:
+            lines.append(f"{r.function_name[:40]:<40} {r.iterations:>7} {r.avg_time * 1000:>8.3f}ms "
+                         f"{r.p95_time * 1000:>8.3f}ms {r.max_time * 1000:>8.3f}ms {r.calls_per_second:>10.0f}")
+        if self.peak_memory is not None:
+            lines.append(f"Peak traced memory: {self.peak_memory / 1024 / 1024:.1f} MB")
+        return "\n".join(lines)
+
+    def save(self, path: Path) -> Path:
+        """Write results as JSON; a session's cProfile data goes next to it as .prof"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report: Dict[str, Any] = {
+            "benchmarks": {name: r.to_dict() for name, r in self.results.items()},
+            "live": {name: r.to_dict() for name, r in self.live_results().items()},
+            "peak_memory": self.peak_memory,
+        }
+        if self.cpu_stats is not None:
+            self.cpu_stats.dump_stats(str(path.with_suffix(".prof")))
+            report["cpu_profile"] = _format_stats(self.cpu_stats, limit=30)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return path
+
+
+def _format_stats(stats: pstats.Stats, limit: int = 15) -> str:
+    buffer = io.StringIO()
+    pstats.Stats(stream=buffer).add(stats).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return buffer.getvalue()
+
+
+class CacheOptimizer:
+    """LRU memoization with hit/miss counters"""
+
+    def __init__(self, max_size: int = 128) -> None:
+        self.max_size = max_size
+        self.cache: "OrderedDict[Any, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def memoize(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Cache func's results by (function, args, kwargs); arguments must be hashable"""
+        @functools.wraps(func)
+        def cached(*args: Any, **kwargs: Any) -> Any:
+            key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+            with self._lock:
+                if key in self.cache:
+                    self.hits += 1
+                    self.cache.move_to_end(key)
+                    return self.cache[key]
+                self.misses += 1
+            value = func(*args, **kwargs)
+            with self._lock:
+                self.cache[key] = value
+                if len(self.cache) > self.max_size:
+                    self.cache.popitem(last=False)
+            return value
+        return cached
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups * 100 if lookups else 0.0,
+            "size": len(self.cache),
+            "max_size": self.max_size,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self.cache.clear()
+            self.hits = self.misses = 0
+
+
+class OptimizationAnalyzer:
+    """
+    Line-based heuristics for common Python slow patterns
+
+    Not a linter: it flags candidates for a closer look (O(n) list
+    operations, string building in loops, index loops).
+    """
+
+    LIST_PATTERNS = [
+        (re.compile(r"\.remove\("), "list.remove() is O(n); consider a set or dict"),
+        (re.compile(r"\.insert\(\s*0\s*,"), "insert(0, x) is O(n); consider collections.deque"),
+        (re.compile(r"\.pop\(\s*0\s*\)"), "pop(0) is O(n); consider collections.deque.popleft()"),
+        (re.compile(r"\.index\("), "list.index() is a linear scan; consider a dict lookup"),
+    ]
+
+    def __init__(self, concat_threshold: int = 1) -> None:
+        self.concat_threshold = concat_threshold
+
+    @staticmethod
+    def _lines(code: str) -> List[str]:
+        return textwrap.dedent(code).splitlines()
+
+    @staticmethod
+    def _loop_bodies(lines: List[str]) -> Iterator[Tuple[int, str]]:
+        """(line number, line) for lines indented under a for/while"""
+        loop_indent: Optional[int] = None
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            indent = len(line) - len(line.lstrip())
+            if loop_indent is not None and indent <= loop_indent:
+                loop_indent = None
+            if loop_indent is not None:
+                yield number, line
+            if re.match(r"\s*(for|while)\b.*:\s*$", line) and loop_indent is None:
+                loop_indent = indent
+
+    def check_list_operations(self, code: str) -> List[Dict[str, Any]]:
+        issues = []
+        lines = self._lines(code)
+        for number, line in enumerate(lines, 1):
+            for pattern, message in self.LIST_PATTERNS:
+                if pattern.search(line):
+                    issues.append({"line": number, "code": line.strip(), "issue": message})
+        for number, line in self._loop_bodies(lines):
+            if re.search(r"\w+\.append\(", line):
+                issues.append({"line": number, "code": line.strip(),
+                               "issue": "append() in a loop; a list comprehension is usually faster"})
+        return issues
+
+    def check_string_operations(self, code: str) -> List[Dict[str, Any]]:
+        issues = []
+        for number, line in self._loop_bodies(self._lines(code)):
+            match = re.match(r"\s*(\w+)\s*(\+=|=\s*\1\s*\+)", line)
+            if match and line.count("+") >= self.concat_threshold:
+                issues.append({"line": number, "code": line.strip(),
+                               "issue": "string built by concatenation in a loop; use ''.join()"})
+        return issues
+
+    def check_loop_operations(self, code: str) -> List[Dict[str, Any]]:
+        issues = []
+        lines = self._lines(code)
+        for number, line in enumerate(lines, 1):
+            if re.search(r"for\s+\w+\s+in\s+range\(\s*len\(", line):
+                issues.append({"line": number, "code": line.strip(),
+                               "issue": "range(len(...)) loop; iterate directly or use enumerate()"})
+        for number, line in self._loop_bodies(lines):
+            if re.match(r"\s*for\b.*:\s*$", line):
+                issues.append({"line": number, "code": line.strip(),
+                               "issue": "nested loop; check whether a dict/set lookup can replace it"})
+        return issues
+
+    def analyze(self, code: str) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            "list_operations": self.check_list_operations(code),
+            "string_operations": self.check_string_operations(code),
+            "loop_operations": self.check_loop_operations(code),
+        }
+
+
+@contextmanager
+def measure_time(label: str) -> Iterator[None]:
+    """Print (and debug-log) how long the block took"""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter_ns() - start) / 1e6
+        print(f"{label}: {elapsed_ms:.2f} ms")
+        logger.debug(f"{label}: {elapsed_ms:.2f} ms")
+
+
+def check_performance_target(avg_time: float, target: str) -> bool:
+    """
+    True if avg_time (seconds per call) is within PERFORMANCE_TARGETS[target]
+
+    Raises:
+        KeyError: unknown target name
+    """
+    limit = PERFORMANCE_TARGETS[target]
+    if avg_time > limit:
+        logger.warning(f"Performance target '{target}' missed: {avg_time * 1000:.2f}ms > {limit * 1000:.0f}ms")
+        return False
+    return True
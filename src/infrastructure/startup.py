@@ -0,0 +1,180 @@
+"""
+Startup timing for SlideSense
+
+Records how long each startup phase takes (entry imports, component
+initialization, microphone / recognizer ready) up to the point the app is
+listening, and optionally an `-X importtime` style breakdown of every module
+imported meanwhile: self and cumulative exec time, nested like the
+interpreter's own report.
+
+    timer = get_startup_timer()
+    timer.track_imports()          # only with --startup-report
+    with timer.phase("components"):
+        ...
+    timer.mark("ready to listen")
+    print(timer.report())
+"""
+
+import importlib.abc
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Process-relative origin: first import of this module (main.py imports it first)
+_ORIGIN = time.perf_counter()
+
+
+class _TimedLoader:
+    """Delegates to the real loader, timing exec_module"""
+
+    def __init__(self, loader: Any, timer: "ImportTimer") -> None:
+        self._loader = loader
+        self._timer = timer
+
+    def create_module(self, spec: Any) -> Any:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: Any) -> None:
+        self._timer._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._exit()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder that times the modules imported while it is installed
+
+    It finds nothing itself: it asks the other finders and wraps the
+    loader of whatever they return. Nesting is tracked per thread.
+    """
+
+    def __init__(self) -> None:
+        self.records: List[Dict[str, Any]] = []  # In completion order, like -X importtime
+        self._local = threading.local()  # .finding guard, .stack of [name, start, child_us]
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> Any:
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._local.finding = False
+
+    def _enter(self, name: str) -> None:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self) -> None:
+        stack = self._local.stack
+        name, start, child_us = stack.pop()
+        cumulative_us = (time.perf_counter() - start) * 1e6
+        if stack:
+            stack[-1][2] += cumulative_us
+        self.records.append({
+            "module": name,
+            "self_us": cumulative_us - child_us,
+            "cumulative_us": cumulative_us,
+            "depth": len(stack),
+        })
+
+    def install(self) -> None:
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def slowest(self, limit: int = 15) -> List[Dict[str, Any]]:
+        """Most expensive imports by cumulative time"""
+        return sorted(self.records, key=lambda r: r["cumulative_us"], reverse=True)[:limit]
+
+
+class StartupTimer:
+    """Phase durations and milestones, measured from the first SlideSense import"""
+
+    def __init__(self, origin: float = _ORIGIN) -> None:
+        self.origin = origin
+        self.phases: List[Dict[str, Any]] = []
+        self.marks: Dict[str, float] = {}
+        self.imports: Optional[ImportTimer] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time one startup step; modules first loaded during it are counted"""
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({
+                "phase": name,
+                "ms": (time.perf_counter() - start) * 1000,
+                "new_modules": len(sys.modules) - modules_before,
+            })
+
+    def mark(self, name: str) -> float:
+        """Milestone: ms since origin"""
+        elapsed_ms = (time.perf_counter() - self.origin) * 1000
+        self.marks[name] = elapsed_ms
+        return elapsed_ms
+
+    def track_imports(self) -> ImportTimer:
+        """Start a per-module import breakdown (adds a little overhead to each import)"""
+        if self.imports is None:
+            self.imports = ImportTimer()
+            self.imports.install()
+        return self.imports
+
+    def stop_tracking(self) -> None:
+        if self.imports is not None:
+            self.imports.uninstall()
+
+    def as_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"phases": list(self.phases), "marks": dict(self.marks)}
+        if self.imports is not None:
+            data["imports"] = list(self.imports.records)
+        return data
+
+    def report(self, top: int = 15) -> str:
+        lines = ["Startup timing", "=" * 60]
+        for phase in self.phases:
+            lines.append(f"  {phase['phase']:<32} {phase['ms']:>8.1f} ms  (+{phase['new_modules']} modules)")
+        for name, elapsed_ms in self.marks.items():
+            lines.append(f"  @ {name:<30} {elapsed_ms:>8.1f} ms since start")
+        if self.imports is not None and self.imports.records:
+            lines.append("")
+            lines.append(f"  {'self [us]':>10} | {'cumulative':>10} | slowest imports")
+            for record in self.imports.slowest(top):
+                lines.append(f"  {record['self_us']:>10.0f} | {record['cumulative_us']:>10.0f} | "
+                             f"{'  ' * record['depth']}{record['module']}")
+        return "\n".join(lines)
+
+
+_timer: Optional[StartupTimer] = None
+
+
+def get_startup_timer() -> StartupTimer:
+    """Process-wide startup timer (singleton)"""
+    global _timer
+    if _timer is None:
+        _timer = StartupTimer()
+    return _timer
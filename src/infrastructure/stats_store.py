@@ -0,0 +1,146 @@
+"""
+In-memory counter store with coalesced, atomic persistence
+
+Counters live in memory and are marked dirty on change; a background
+timer writes them out at most once per flush interval (and on shutdown)
+via write-to-temp + atomic rename, so recording a command never touches
+the disk and readers never see a half-written file.
+"""
+
+import atexit
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class StatsStore:
+    """Thread-safe counters backed by a JSON file"""
+
+    def __init__(self, path: Path, defaults: Optional[Dict[str, Any]] = None,
+                 flush_interval: float = 5.0) -> None:
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.data: Dict[str, Any] = dict(defaults or {})
+        self.data.update(self._load())
+
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.flushes = 0
+
+    def _load(self) -> Dict[str, Any]:
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Cannot read {self.path}: {e}")
+        return {}
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    # ---------- counters ----------
+
+    def increment(self, key: str, amount: int = 1) -> int:
+        """Add to a counter (created at 0) and schedule a flush"""
+        with self._lock:
+            value = self.data.get(key, 0) + amount
+            self.data[key] = value
+            self._dirty = True
+        self._ensure_timer()
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self.data[key] = value
+            self._dirty = True
+        self._ensure_timer()
+
+    def get(self, key: str, default: Any = 0) -> Any:
+        return self.data.get(key, default)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of all counters (what the file will contain after the next flush)"""
+        with self._lock:
+            return dict(self.data)
+
+    # ---------- persistence ----------
+
+    def _ensure_timer(self) -> None:
+        if self._thread is None and not self._stop.is_set():
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._timer, name="stats-flush", daemon=True)
+                    self._thread.start()
+
+    def _timer(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Write counters if they changed since the last flush
+
+        Returns:
+            True if the file was written
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            payload = json.dumps(self.data, indent=2, ensure_ascii=False)
+            self._dirty = False
+
+        temp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            if self.path.parent != Path(""):
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp, "w", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, self.path)
+        except OSError as e:
+            logger.error(f"Error saving stats to {self.path}: {e}")
+            with self._lock:
+                self._dirty = True  # Retry on the next tick
+            return False
+        self.flushes += 1
+        return True
+
+    def close(self) -> None:
+        """Stop the timer and write any pending changes"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+        self.flush()
+
+
+_stores: Dict[str, StatsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_stats_store(path: str = "command_stats.json", defaults: Optional[Dict[str, Any]] = None,
+                    flush_interval: float = 5.0) -> StatsStore:
+    """Shared store per file, so every panel reads the same in-memory counters"""
+    key = str(Path(path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = StatsStore(Path(path), defaults, flush_interval)
+            _stores[key] = store
+            atexit.register(store.close)
+        elif defaults:
+            for name, value in defaults.items():
+                store.data.setdefault(name, value)
+        return store
@@ -0,0 +1,339 @@
+"""
+Session telemetry in an embedded SQLite database
+
+One database replaces the scattered per-feature JSON files for analysis:
+every utterance with its detection score, every executed command, stage
+latencies and UI events, keyed by session. Writes are queued and applied
+by a background thread in batched transactions (WAL mode), so recording
+never blocks the voice loop; readers use their own connection.
+"""
+
+import atexit
+import json
+import math
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = Path("data") / "telemetry.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    ended_at REAL,
+    backend TEXT
+);
+CREATE TABLE IF NOT EXISTS utterances (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    text TEXT NOT NULL,
+    command TEXT,
+    phrase TEXT,
+    score REAL,
+    max_score REAL
+);
+CREATE INDEX IF NOT EXISTS idx_utterances_session ON utterances (session_id, ts);
+CREATE INDEX IF NOT EXISTS idx_utterances_command ON utterances (command, ts);
+CREATE TABLE IF NOT EXISTS executions (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    command TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    latency_ms REAL,
+    feedback TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_executions_session ON executions (session_id, ts);
+CREATE INDEX IF NOT EXISTS idx_executions_command ON executions (command, ts);
+CREATE TABLE IF NOT EXISTS latencies (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    stage TEXT NOT NULL,
+    ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_latencies_stage ON latencies (stage, ts);
+CREATE INDEX IF NOT EXISTS idx_latencies_session ON latencies (session_id, ts);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    type TEXT NOT NULL,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_session ON events (session_id, ts);
+"""
+
+_INSERTS = {
+    "session": "INSERT OR REPLACE INTO sessions (id, started_at, ended_at, backend) VALUES (?, ?, ?, ?)",
+    "end_session": "UPDATE sessions SET ended_at = ? WHERE id = ?",
+    "utterance": "INSERT INTO utterances (session_id, ts, text, command, phrase, score, max_score) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    "execution": "INSERT INTO executions (session_id, ts, command, success, latency_ms, feedback) VALUES (?, ?, ?, ?, ?, ?)",
+    "latency": "INSERT INTO latencies (session_id, ts, stage, ms) VALUES (?, ?, ?, ?)",
+    "event": "INSERT INTO events (session_id, ts, type, details) VALUES (?, ?, ?, ?)",
+}
+
+_STOP = object()
+
+
+class Telemetry:
+    """Batched SQLite writer plus rollup queries"""
+
+    def __init__(self, path: Path = DEFAULT_DB_PATH, batch_size: int = 200,
+                 flush_interval: float = 1.0) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session_id: Optional[str] = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+
+        self.rows_written = 0
+        self.transactions = 0
+        self.rows_dropped = 0  # Recorded after close(), with no writer left to apply them
+        self._closed = False
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self.path), timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    # ---------- writer ----------
+
+    def _writer(self) -> None:
+        connection = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                batch: List[Tuple[str, Tuple[Any, ...]]] = []
+                waiters: List[threading.Event] = []
+                stop = False
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is _STOP:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        batch.append(item)
+                    if stop or waiters or len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+
+                if batch:
+                    self._apply(connection, batch)
+                for waiter in waiters:
+                    waiter.set()
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def _apply(self, connection: sqlite3.Connection, batch: List[Tuple[str, Tuple[Any, ...]]]) -> None:
+        # Group consecutive rows of the same statement for executemany
+        try:
+            with connection:
+                start = 0
+                while start < len(batch):
+                    kind = batch[start][0]
+                    end = start
+                    while end < len(batch) and batch[end][0] == kind:
+                        end += 1
+                    connection.executemany(_INSERTS[kind], [params for _, params in batch[start:end]])
+                    start = end
+            self.rows_written += len(batch)
+            self.transactions += 1
+        except sqlite3.Error as e:
+            logger.error(f"Telemetry write failed ({len(batch)} rows dropped): {e}")
+
+    def _put(self, kind: str, params: Tuple[Any, ...]) -> None:
+        if self._closed or not self._thread.is_alive():
+            if not self.rows_dropped:
+                logger.warning(f"Telemetry writer stopped; dropping '{kind}' and any later records")
+            self.rows_dropped += 1
+            return
+        self._queue.put((kind, params))
+
+    # ---------- recording ----------
+
+    def start_session(self, backend: str = "") -> str:
+        """Open a new session; later records are attributed to it"""
+        self.session_id = uuid.uuid4().hex
+        self._put("session", (self.session_id, time.time(), None, backend))
+        return self.session_id
+
+    def end_session(self) -> None:
+        if self.session_id is not None:
+            self._put("end_session", (time.time(), self.session_id))
+            self.session_id = None
+
+    def _session(self) -> str:
+        if self.session_id is None:
+            return self.start_session()
+        return self.session_id
+
+    def record_utterance(self, text: str, result: Optional[Dict[str, Any]] = None) -> None:
+        """Recognized text and the detector's verdict (command None = nothing matched)"""
+        result = result or {}
+        self._put("utterance", (
+            self._session(), time.time(), text, result.get("command"), result.get("phrase"),
+            result.get("score"), result.get("max_score"),
+        ))
+
+    def record_execution(self, command: str, success: bool, latency_ms: Optional[float] = None,
+                         feedback: str = "") -> None:
+        self._put("execution", (self._session(), time.time(), command, int(success), latency_ms, feedback))
+
+    def record_latency(self, stage: str, ms: float) -> None:
+        self._put("latency", (self._session(), time.time(), stage, ms))
+
+    def record_event(self, event_type: str, details: Optional[Dict[str, Any]] = None) -> None:
+        payload = json.dumps(details, ensure_ascii=False, default=str) if details else None
+        self._put("event", (self._session(), time.time(), event_type, payload))
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until everything queued so far is committed"""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self) -> None:
+        self.end_session()
+        self._closed = True  # Anything queued behind _STOP would never be written
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(5.0)
+
+    # ---------- queries ----------
+
+    def _query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+        connection = self._connect()
+        try:
+            connection.row_factory = sqlite3.Row
+            return [dict(row) for row in connection.execute(sql, params)]
+        finally:
+            connection.close()
+
+    def sessions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent sessions with utterance / execution counts"""
+        return self._query("""
+            SELECT s.id, s.started_at, s.ended_at, s.backend,
+                   (SELECT COUNT(*) FROM utterances u WHERE u.session_id = s.id) AS utterances,
+                   (SELECT COUNT(*) FROM executions e WHERE e.session_id = s.id) AS executions
+            FROM sessions s ORDER BY s.started_at DESC LIMIT ?
+        """, (limit,))
+
+    def session_summary(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Recognition rate, execution success and latency for one session"""
+        session_id = session_id or self.session_id
+        utterances = self._query("""
+            SELECT COUNT(*) AS total,
+                   SUM(CASE WHEN command IS NOT NULL AND command != 'unknown' THEN 1 ELSE 0 END) AS recognized,
+                   AVG(score) AS avg_score
+            FROM utterances WHERE session_id = ?
+        """, (session_id,))[0]
+        executions = self._query("""
+            SELECT COUNT(*) AS total, SUM(success) AS succeeded, AVG(latency_ms) AS avg_latency_ms
+            FROM executions WHERE session_id = ?
+        """, (session_id,))[0]
+        stages = self._query("""
+            SELECT stage, COUNT(*) AS samples, AVG(ms) AS avg_ms, MAX(ms) AS max_ms
+            FROM latencies WHERE session_id = ? GROUP BY stage
+        """, (session_id,))
+        total = utterances["total"] or 0
+        return {
+            "session_id": session_id,
+            "utterances": total,
+            "recognized": utterances["recognized"] or 0,
+            "recognition_rate": (utterances["recognized"] or 0) / total if total else 0.0,
+            "avg_score": utterances["avg_score"],
+            "executions": executions["total"] or 0,
+            "succeeded": executions["succeeded"] or 0,
+            "avg_execution_ms": executions["avg_latency_ms"],
+            "stages": {row["stage"]: row for row in stages},
+        }
+
+    def command_rollup(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Per command: executions, success count and average latency"""
+        return self._query("""
+            SELECT command, COUNT(*) AS executions, SUM(success) AS succeeded, AVG(latency_ms) AS avg_latency_ms
+            FROM executions WHERE ts >= ? GROUP BY command ORDER BY executions DESC
+        """, (since or 0.0,))
+
+    def hourly_rollup(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Per local hour: utterances heard and how many matched a command"""
+        return self._query("""
+            SELECT strftime('%Y-%m-%d %H:00', ts, 'unixepoch', 'localtime') AS hour,
+                   COUNT(*) AS utterances,
+                   SUM(CASE WHEN command IS NOT NULL AND command != 'unknown' THEN 1 ELSE 0 END) AS recognized
+            FROM utterances WHERE ts >= ? GROUP BY hour ORDER BY hour
+        """, (since or 0.0,))
+
+    def latency_summary(self, stage: str, since: Optional[float] = None,
+                        limit: int = 10000) -> Dict[str, float]:
+        """
+        Count, mean and p50/p95/p99 (nearest rank) of one stage's latencies
+
+        Covers the most recent `limit` samples across sessions, so another
+        process (the GUI dashboard) sees what the voice loop recorded.
+        """
+        rows = self._query("""
+            SELECT ms FROM latencies WHERE stage = ? AND ts >= ? ORDER BY ts DESC LIMIT ?
+        """, (stage, since or 0.0, limit))
+        values = sorted(row["ms"] for row in rows)
+        report: Dict[str, float] = {"count": len(values)}
+        if values:
+            report["mean_ms"] = sum(values) / len(values)
+            for p in (50, 95, 99):
+                report[f"p{p}_ms"] = values[max(1, math.ceil(p / 100.0 * len(values))) - 1]
+        return report
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "rows_written": self.rows_written,
+            "transactions": self.transactions,
+            "dropped": self.rows_dropped,
+            "queued": self._queue.qsize(),
+        }
+
+
+_telemetry: Optional[Telemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> Optional[Telemetry]:
+    """Process-wide telemetry store, or None if disabled in storage.telemetry_enabled"""
+    global _telemetry
+    with _telemetry_lock:
+        if _telemetry is None:
+            from src.infrastructure.config import get_config
+            config = get_config()
+            if not config.get("storage.telemetry_enabled", True):
+                return None
+            try:
+                _telemetry = Telemetry(Path(config.get("storage.telemetry_db", str(DEFAULT_DB_PATH))))
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Telemetry disabled: {e}")
+                return None
+            atexit.register(_telemetry.close)
+        return _telemetry
@@ -0,0 +1,273 @@
+"""
+Per-utterance latency tracing
+
+A Trace collects timestamps (time.perf_counter) for the milestones of one
+voice command: capture start, speech start/end, audio captured, recognizer
+result, detection result and command execution (key press). When the trace
+is finished the intervals between milestones are recorded into per-stage
+HDR-style histograms, which give p50/p95/p99 with bounded error and
+constant memory however many utterances a session has.
+
+The active trace is held in a context variable, so code deep in the
+recognizer can call mark() without the trace being passed through every
+signature; the pipeline hands the trace between threads explicitly and
+re-activates it in each stage.
+"""
+
+import contextvars
+import json
+import math
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from src.infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Milestones, in the order they happen for one utterance
+CAPTURE_START = "capture_start"
+SPEECH_START = "speech_start"
+SPEECH_END = "speech_end"
+CAPTURED = "captured"  # Endpointer gave up waiting for more speech; audio handed on
+RECOGNIZED = "recognized"
+DETECTED = "detected"
+EXECUTED = "executed"
+
+# Stage name -> (from milestone, to milestone)
+STAGES: Dict[str, Tuple[str, str]] = {
+    "utterance": (SPEECH_START, SPEECH_END),
+    "endpoint": (SPEECH_END, CAPTURED),
+    "recognize": (CAPTURED, RECOGNIZED),
+    "detect": (RECOGNIZED, DETECTED),
+    "execute": (DETECTED, EXECUTED),
+    "response": (SPEECH_END, EXECUTED),  # What the presenter waits for after they stop talking
+}
+
+PERCENTILES = (50.0, 95.0, 99.0)
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram in the style of HdrHistogram
+
+    Values are stored in microseconds. Below 2 * 2**significant_bits every
+    value has its own bucket; above that each power of two is split into
+    2**significant_bits linear sub-buckets, so any reported value is within
+    1 / 2**significant_bits (~3% for the default 5 bits) of the true one.
+    """
+
+    def __init__(self, significant_bits: int = 5) -> None:
+        self.significant_bits = significant_bits
+        self._half = 1 << significant_bits
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def _index(self, value: int) -> int:
+        if value < 2 * self._half:
+            return value
+        shift = value.bit_length() - self.significant_bits - 1
+        return self._half * (shift + 1) + (value >> shift) - self._half
+
+    def _highest(self, index: int) -> int:
+        """Largest value that maps to this bucket"""
+        if index < 2 * self._half:
+            return index
+        shift = index // self._half - 1
+        mantissa = index % self._half + self._half
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, ms: float) -> None:
+        value = max(0, int(round(ms * 1000)))
+        index = self._index(value)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total_us += value
+        self.max_us = max(self.max_us, value)
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.count += other.count
+        self.total_us += other.total_us
+        self.max_us = max(self.max_us, other.max_us)
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+
+    def percentile(self, p: float) -> float:
+        """Value (ms) at or below which p percent of recordings fall"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(p / 100.0 * self.count))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(self._highest(index), self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    @property
+    def mean(self) -> float:
+        return self.total_us / self.count / 1000.0 if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        report = {
+            "count": self.count,
+            "mean_ms": self.mean,
+            "min_ms": (self.min_us or 0) / 1000.0,
+            "max_ms": self.max_us / 1000.0,
+        }
+        for p in PERCENTILES:
+            report[f"p{p:g}_ms"] = self.percentile(p)
+        return report
+
+
+class Trace:
+    """Milestone timestamps for one utterance"""
+
+    def __init__(self, **attributes: Any) -> None:
+        self.id = uuid.uuid4().hex[:12]
+        self.wall_start = time.time()
+        self.marks: Dict[str, float] = {}
+        self.attributes: Dict[str, Any] = dict(attributes)
+
+    def mark(self, event: str, at: Optional[float] = None) -> None:
+        """Timestamp a milestone (perf_counter seconds; defaults to now)"""
+        self.marks[event] = time.perf_counter() if at is None else at
+
+    def span(self, start: str, end: str) -> Optional[float]:
+        """Milliseconds between two milestones, or None if either is missing"""
+        if start not in self.marks or end not in self.marks:
+            return None
+        return (self.marks[end] - self.marks[start]) * 1000
+
+    def spans(self) -> Dict[str, float]:
+        return {
+            stage: elapsed for stage, (start, end) in STAGES.items()
+            if (elapsed := self.span(start, end)) is not None
+        }
+
+    @contextmanager
+    def activate(self) -> Iterator["Trace"]:
+        """Make this the current trace for mark() on this thread / context"""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def as_dict(self) -> Dict[str, Any]:
+        origin = min(self.marks.values()) if self.marks else 0.0
+        return {
+            "id": self.id,
+            "start": self.wall_start,
+            "marks_ms": {event: (at - origin) * 1000 for event, at in sorted(self.marks.items(), key=lambda i: i[1])},
+            "spans_ms": self.spans(),
+            "attributes": self.attributes,
+        }
+
+
+_current: "contextvars.ContextVar[Optional[Trace]]" = contextvars.ContextVar("slidesense_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def mark(event: str, at: Optional[float] = None) -> None:
+    """Timestamp a milestone on the active trace (no-op when nothing is traced)"""
+    trace = _current.get()
+    if trace is not None:
+        trace.mark(event, at)
+
+
+class Tracer:
+    """Finishes traces into per-stage histograms and keeps the most recent ones"""
+
+    def __init__(self, keep_recent: int = 200) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._recent: Deque[Trace] = deque(maxlen=keep_recent)
+        self.finished = 0
+
+    def start(self, **attributes: Any) -> Trace:
+        """New trace with capture_start marked now"""
+        trace = Trace(**attributes)
+        trace.mark(CAPTURE_START)
+        return trace
+
+    def finish(self, trace: Trace) -> Dict[str, float]:
+        """Record the trace's stage latencies; returns them"""
+        spans = trace.spans()
+        with self._lock:
+            for stage, elapsed in spans.items():
+                self._histograms.setdefault(stage, LatencyHistogram()).record(elapsed)
+            self._recent.append(trace)
+            self.finished += 1
+        return spans
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        """Copy of one stage's histogram (empty if never recorded)"""
+        copy = LatencyHistogram()
+        with self._lock:
+            if stage in self._histograms:
+                copy.merge(self._histograms[stage])
+        return copy
+
+    def percentiles(self, stage: str) -> Dict[str, float]:
+        return self.histogram(stage).summary()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Summary (count, mean, min, max, p50/p95/p99) for every stage seen"""
+        with self._lock:
+            stages = list(self._histograms)
+        return {stage: self.percentiles(stage) for stage in stages}
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            traces = list(self._recent)
+        if limit is not None:
+            traces = traces[-limit:]
+        return [trace.as_dict() for trace in traces]
+
+    def export_json(self, path: Path, include_traces: bool = True) -> Path:
+        """Write stage percentiles (and recent traces) to a JSON file"""
+        path = Path(path)
+        report: Dict[str, Any] = {
+            "exported_at": time.time(),
+            "traces_finished": self.finished,
+            "stages": self.snapshot(),
+        }
+        if include_traces:
+            report["recent"] = self.recent()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return path
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._recent.clear()
+            self.finished = 0
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer (singleton)"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+        return _tracer
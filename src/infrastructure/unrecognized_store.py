@@ -0,0 +1,257 @@
+"""
+Append-only log of unrecognized voice commands
+
+Entries are JSON Lines written by a background thread in batches, so a
+miss on the detection path costs one queue put instead of rewriting the
+whole history. The active segment rotates at a size limit; a bounded
+number of older segments is kept and can be compacted into one.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_LOG_PATH = Path("data") / "unrecognized_commands.jsonl"
+LEGACY_JSON_PATH = Path("unrecognized_commands.json")
+
+_STOP = object()
+
+
+class UnrecognizedStore:
+    """Batched JSONL writer + reader/aggregator for unrecognized commands"""
+
+    def __init__(self, path: Path = DEFAULT_LOG_PATH, batch_size: int = 64,
+                 flush_interval: float = 1.0, fsync_interval: float = 5.0,
+                 max_bytes: int = 1048576, keep_segments: int = 5) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.keep_segments = keep_segments
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()  # Serializes file access (writer vs compaction)
+        self._thread: Optional[threading.Thread] = None
+        self._last_fsync = time.monotonic()
+
+        self.written = 0
+        self.batches = 0
+        self.rotations = 0
+
+    # ---------- writing ----------
+
+    def record(self, user_input: str, closest_match: Optional[str] = None,
+               confidence: float = 0.0, suggestion: Optional[str] = None) -> None:
+        """Queue one entry (never touches the disk on the caller's thread)"""
+        self._ensure_writer()
+        self._queue.put({
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "user_input": user_input,
+            "closest_match": closest_match or "none",
+            "confidence": round(confidence, 2),
+            "suggestions": [suggestion] if suggestion else [],
+        })
+
+    def _ensure_writer(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._writer, name="unrecognized-writer", daemon=True)
+                    self._thread.start()
+
+    def _writer(self) -> None:
+        while True:
+            batch: List[Dict[str, Any]] = []
+            stop = False
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self._write_batch(batch, force_sync=stop)
+                except OSError as e:
+                    logger.error(f"Cannot write unrecognized commands: {e}")
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[Dict[str, Any]], force_sync: bool = False) -> None:
+        payload = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in batch)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                now = time.monotonic()
+                if force_sync or now - self._last_fsync >= self.fsync_interval:
+                    os.fsync(f.fileno())
+                    self._last_fsync = now
+                size = f.tell()
+            self.written += len(batch)
+            self.batches += 1
+            if size >= self.max_bytes:
+                self._rotate()
+
+    def _segment(self, number: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{number}{self.path.suffix}")
+
+    def _rotate(self) -> None:
+        """active -> .1, .1 -> .2, ... dropping anything past keep_segments"""
+        oldest = self._segment(self.keep_segments)
+        if oldest.exists():
+            oldest.unlink()
+        for number in range(self.keep_segments - 1, 0, -1):
+            if self._segment(number).exists():
+                os.replace(self._segment(number), self._segment(number + 1))
+        if self.keep_segments > 0:
+            os.replace(self.path, self._segment(1))
+        else:
+            self.path.unlink()
+        self.rotations += 1
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Write everything queued so far and fsync (restarts the writer)"""
+        if self._thread is None or not self._thread.is_alive():
+            if self._queue.empty():
+                return
+            self._ensure_writer()  # Entries queued behind an earlier stop
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # Still writing: keep it, so record() does not start a second writer on the same file
+            logger.warning(f"Unrecognized command writer still busy after {timeout}s")
+            return
+        self._thread = None
+
+    close = flush
+
+    # ---------- reading ----------
+
+    def segments(self) -> List[Path]:
+        """Existing log files, oldest first"""
+        older = [self._segment(n) for n in range(self.keep_segments, 0, -1)]
+        return [path for path in older + [self.path] if path.exists()]
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Every stored entry, oldest first (a torn trailing line is skipped)"""
+        for path in self.segments():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+    def aggregate(self, top: int = 10) -> Dict[str, Any]:
+        """Totals and the most frequent misses / near-misses"""
+        inputs: Counter = Counter()
+        matches: Counter = Counter()
+        total = 0
+        first_seen = last_seen = None
+        for entry in self.iter_entries():
+            total += 1
+            inputs[entry.get("user_input", "")] += 1
+            matches[entry.get("closest_match", "none")] += 1
+            stamp = entry.get("timestamp")
+            if first_seen is None:
+                first_seen = stamp
+            last_seen = stamp
+        return {
+            "total_unrecognized": total,
+            "unique_inputs": len(inputs),
+            "first_seen": first_seen,
+            "last_updated": last_seen,
+            "top_inputs": inputs.most_common(top),
+            "closest_matches": matches.most_common(top),
+        }
+
+    def compact(self, keep_entries: Optional[int] = None) -> int:
+        """
+        Merge all segments into the active file (optionally keeping only the
+        newest keep_entries). Written to a temp file and swapped atomically.
+
+        Returns:
+            Number of entries kept
+        """
+        self.flush()
+        with self._lock:
+            entries = list(self.iter_entries())
+            if keep_entries is not None:
+                entries = entries[-keep_entries:] if keep_entries > 0 else []
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(temp, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            for path in self.segments():
+                if path != self.path:
+                    path.unlink()
+            os.replace(temp, self.path)
+        return len(entries)
+
+    def import_legacy(self, legacy_path: Path = LEGACY_JSON_PATH) -> int:
+        """One-time copy of the old indent=2 JSON file into an empty log"""
+        if self.segments() or not Path(legacy_path).exists():
+            return 0
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                entries = json.load(f).get("unrecognized_commands", [])
+        except (OSError, ValueError, AttributeError):
+            return 0
+        if entries:
+            self._write_batch(entries, force_sync=True)
+        return len(entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "written": self.written,
+            "batches": self.batches,
+            "rotations": self.rotations,
+            "queued": self._queue.qsize(),
+        }
+
+
+_store: Optional[UnrecognizedStore] = None
+
+
+def get_unrecognized_store() -> UnrecognizedStore:
+    """Process-wide store configured from storage.* settings (singleton)"""
+    global _store
+    if _store is None:
+        from src.infrastructure.config import get_config
+        config = get_config()
+        _store = UnrecognizedStore(
+            path=Path(config.get("storage.unrecognized_log", str(DEFAULT_LOG_PATH))),
+            max_bytes=config.get("storage.unrecognized_max_bytes", 1048576),
+            keep_segments=config.get("storage.unrecognized_segments", 5),
+        )
+        _store.import_legacy()
+        atexit.register(_store.close)
+    return _store
@@ -3,17 +3,25 @@ SlideSense - Main Application
 Voice-Controlled PowerPoint Presentation with Accessibility Features
 """
 
+import argparse
+import importlib.util
+import queue
 import sys
+import threading
 import time
-from typing import Optional, Dict, List, Any, Tuple
+from typing import TYPE_CHECKING, Optional, Dict, List, Any, Tuple
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Startup timing is measured from the first SlideSense import
+from src.infrastructure.startup import get_startup_timer
+
 # Infrastructure
 from src.infrastructure.logger import get_logger
 from src.infrastructure.config import get_config
+from src.infrastructure.tracing import DETECTED, EXECUTED, Trace, get_tracer
 from src.infrastructure.exceptions import (
     MicrophoneError, VoiceRecognitionError, CommandExecutionError,
     SlideSenseException
@@ -22,27 +30,42 @@ from src.infrastructure.exceptions import (
 # GUI
 from src.gui.manager import ui, console
 
-# Core modules
-from src.core.voice_detector import SmartVoiceDetector
-from src.core.voice_recognizer import HybridVoiceRecognizer
-from src.core.powerpoint_controller import PowerPointController
-from src.core.accessibility_popup import AccessibilityPopup
-
 # Utilities
 from src.utils.helpers import get_audio_devices, find_best_device, print_status, pause_and_continue
 
+# Core modules (recognizers, pyautogui, Tk / win32 popup), telemetry and the
+# profiler are imported where first needed, so the menu and `--help` do not
+# pay for them
+if TYPE_CHECKING:
+    from src.core.voice_detector import SmartVoiceDetector
+    from src.core.voice_recognizer import HybridVoiceRecognizer
+    from src.core.pipeline import VoicePipeline
+    from src.core.command_scheduler import CommandScheduler, ScheduledCommand
+    from src.core.powerpoint_controller import PowerPointController
+    from src.core.accessibility_popup import AccessibilityPopup
+    from src.infrastructure.telemetry import Telemetry
+    from src.infrastructure.profiler import PerformanceProfiler
+
 logger = get_logger(__name__)
 config = get_config()
+get_startup_timer().mark("entry imports")
 
 class SlideSenseApp:
     """Main application controller"""
     
-    def __init__(self) -> None:
-        self.voice: Optional[HybridVoiceRecognizer] = None
-        self.detector: Optional[SmartVoiceDetector] = None
-        self.ppt: Optional[PowerPointController] = None
-        self.popup: Optional[AccessibilityPopup] = None
+    def __init__(self, profiler: Optional["PerformanceProfiler"] = None, startup_report: bool = False) -> None:
+        self.profiler = profiler
+        self.startup_report = startup_report
+        self.voice: Optional["HybridVoiceRecognizer"] = None
+        self.detector: Optional["SmartVoiceDetector"] = None
+        self.ppt: Optional["PowerPointController"] = None
+        self.popup: Optional["AccessibilityPopup"] = None
         self.running: bool = False
+        self.pipeline: Optional["VoicePipeline"] = None
+        self.scheduler: Optional["CommandScheduler"] = None
+        self.telemetry: Optional["Telemetry"] = None
+        self.tracer = get_tracer()
+        self.startup = get_startup_timer()
     
     def initialize_components(self) -> bool:
         """Initialize all components"""
@@ -53,31 +76,41 @@ class SlideSenseApp:
         try:
             # Initialize detector
             logger.debug("Initializing voice detector...")
-            self.detector = SmartVoiceDetector()
+            with self.startup.phase("voice detector"):
+                from src.core.voice_detector import SmartVoiceDetector
+                from src.core.command_scheduler import CommandScheduler
+                self.detector = SmartVoiceDetector()
+                # Repeats are debounced per command by the scheduler, not by a global blind window
+                self.detector.cooldown_seconds = 0
+                self.scheduler = CommandScheduler(key=self._command_of)
             console.print("  [green][OK][/green] Voice Detector")
             logger.info("Voice detector initialized")
             
             # Initialize PowerPoint controller
             logger.debug("Initializing PowerPoint controller...")
-            self.ppt = PowerPointController()
+            with self.startup.phase("powerpoint controller"):
+                from src.core.powerpoint_controller import PowerPointController
+                self.ppt = PowerPointController()
             console.print("  [green][OK][/green] PowerPoint Controller")
             logger.info("PowerPoint controller initialized")
             
-            # Initialize popup system
-            logger.debug("Initializing accessibility popup...")
-            self.popup = AccessibilityPopup()
-            self.popup.start()
-            self.ppt.set_popup_system(self.popup)
-            console.print("  [green][OK][/green] Accessibility Popup")
-            logger.info("Accessibility popup initialized")
+            # Popup system (Tk / customtkinter / win32) comes up in the background
+            logger.debug("Initializing accessibility popup in the background...")
+            threading.Thread(target=self._start_popup, name="popup-init", daemon=True).start()
+            console.print("  [green][OK][/green] Accessibility Popup [dim](starting in background)[/dim]")
             
             # Initialize voice recognizer
             logger.debug("Initializing voice recognizer...")
-            debug_mode = config.get("application.debug", False)
-            self.voice = HybridVoiceRecognizer(debug_mode=debug_mode)
+            with self.startup.phase("voice recognizer"):
+                from src.core.voice_recognizer import HybridVoiceRecognizer
+                debug_mode = config.get("application.debug", False)
+                self.voice = HybridVoiceRecognizer(debug_mode=debug_mode)
             console.print("  [green][OK][/green] Voice Recognizer")
             logger.info("Voice recognizer initialized")
             
+            if self.profiler:
+                self._instrument_hot_paths()
+            
             logger.info("All components initialized successfully")
             return True
             
@@ -93,11 +126,36 @@ class SlideSenseApp:
             )
             return False
     
+    def _start_popup(self) -> None:
+        """Import and start the accessibility overlay off the startup path"""
+        try:
+            from src.core.accessibility_popup import AccessibilityPopup
+            popup = AccessibilityPopup()
+            popup.start()
+            popup.voice_recognizer = self.voice
+            self.ppt.set_popup_system(popup)
+            self.popup = popup
+            logger.info("Accessibility popup initialized")
+        except Exception as e:
+            logger.warning(f"Accessibility popup unavailable: {e}")
+    
+    def _instrument_hot_paths(self) -> None:
+        """--profile: time every real call of the detector, recognizer and controller"""
+        for obj, method in [
+            (self.detector, "detect"),
+            (self.voice, "listen"),
+            (self.voice, "capture_utterance"),
+            (self.voice, "recognize_audio"),
+            (self.ppt, "execute_command"),
+        ]:
+            self.profiler.instrument(obj, method)
+        logger.info("Profiling enabled for detector, recognizer and controller")
+    
     def setup_microphone(self) -> bool:
         """Setup microphone - Simplified & Reliable"""
         
-        # Get available devices
-        devices = get_audio_devices()
+        # Get available devices (cached; rescan once in case a mic was just plugged in)
+        devices = get_audio_devices() or get_audio_devices(refresh=True)
         
         if not devices:
             ui.show_error(
@@ -152,7 +210,6 @@ class SlideSenseApp:
         
         self.voice.select_device(device_index)
         console.print(f"[green][OK] Device {device_index} selected[/green]\n")
-        time.sleep(0.5)
         return True
     
     def test_microphone(self) -> None:
@@ -197,7 +254,22 @@ class SlideSenseApp:
         # Initialize voice system
         ui.show_voice_control_starting()
         
-        if not self.voice.initialize():
+        # Racing backends stop at the first transcript the detector would act on
+        self.voice.accept_transcript = self._confident
+        
+        # Offline decoder may be limited to the command vocabulary (the race's
+        # vosk_grammar entrant always is)
+        if config.get("voice.constrained_grammar", False) or self.voice.backend_name == "race":
+            from src.core.command_grammar import grammar_json
+            self.voice.use_command_grammar(grammar_json(
+                self.detector.wake_words,
+                config.get("voice.model_path", "model"),
+                exclude=self.detector.generated_variants
+            ))
+        
+        with self.startup.phase("voice system"):
+            voice_ready = self.voice.initialize()
+        if not voice_ready:
             ui.show_error(
                 "Voice System Error",
                 "Failed to initialize voice recognition system.",
@@ -212,78 +284,38 @@ class SlideSenseApp:
         # Show active interface
         ui.show_voice_control_active()
         
-        # Connect popup to voice for caption
-        self.popup.voice_recognizer = self.voice
+        # Connect popup to voice for caption (if the overlay is already up)
+        if self.popup:
+            self.popup.voice_recognizer = self.voice
         
         console.print("[bold green][OK] System ready![/bold green]")
         console.print("[yellow][TIP] Open PowerPoint and press F5 to start slideshow[/yellow]")
         console.print("[dim]   Then return to this window for control\n[/dim]")
         
-        time.sleep(2)
-        
         # Main control loop
         self.running = True
+        streaming = config.get("voice.streaming", False)
+        
+        from src.infrastructure.telemetry import get_telemetry
+        self.telemetry = get_telemetry()
+        self._report_startup()
+        if self.telemetry:
+            self.telemetry.start_session(backend=self.voice.backend_name)
         
         try:
-            while self.running:
-                ui.show_listening()
-                
-                # Listen for voice
-                text = self.voice.listen()
-                
-                if text is None:
-                    ui.show_no_speech()
-                    time.sleep(0.3)
-                    continue
-                
-                # Show caption if enabled
-                if self.popup.caption_running:
-                    try:
-                        self.popup.show_caption(text)
-                    except:
-                        pass
-                
-                # Detect command
-                result = self.detector.detect(text)
-                
-                if result and result.get("command") != "unknown":
-                    # Get confidence
-                    confidence = (result.get('score', 0) / result.get('max_score', 10)) * 100
-                    
-                    # Show detection
-                    ui.show_command_detected(
-                        result.get("command"),
-                        text,
-                        confidence
-                    )
-                    
-                    # Execute command
-                    feedback = self.ppt.execute_command(result)
-                    ui.show_command_feedback(feedback)
-                    
-                    # Check for stop command
-                    if result.get("command") == "stop":
-                        console.print("\n[bold yellow][STOP] Stopping Voice Control...[/bold yellow]")
-                        self.running = False
-                        break
-                    
-                    # Check for help command
-                    elif result.get("command") == "help":
-                        console.print()
-                        self.detector.show_help()
-                        ui.pause()
-                        ui.show_voice_control_active()
-                
-                else:
-                    # Unknown command
-                    ui.show_unknown_command(text)
-                
-                time.sleep(0.3)
+            if config.get("voice.pipelined", True) and not streaming:
+                self._run_pipeline()
+            else:
+                self._run_serial(streaming)
         
         except KeyboardInterrupt:
             console.print("\n\n[yellow][WARN] Voice Control stopped (Ctrl+C)[/yellow]")
             self.running = False
         
+        self._log_latency()
+        if self.telemetry:
+            self._log_session_summary()
+        
         # Show statistics
         console.print("\n" + "="*60)
         console.print("[bold cyan][STAT] Session Statistics[/bold cyan]")
@@ -292,6 +324,265 @@ class SlideSenseApp:
         
         ui.pause()
     
+    def _report_startup(self) -> None:
+        """Log (and with --startup-report print) the time spent getting ready to listen"""
+        self.startup.mark("ready to listen")
+        work_ms = sum(phase["ms"] for phase in self.startup.phases)
+        logger.info(f"Startup: {self.startup.marks['entry imports']:.0f} ms entry imports + "
+                    f"{work_ms:.0f} ms component / voice setup before listening")
+        if self.startup_report:
+            console.print(self.startup.report())
+            self.startup.stop_tracking()
+    
+    def _run_serial(self, streaming: bool = False) -> None:
+        """Listen -> detect -> execute, one utterance at a time"""
+        model_path = config.get("voice.model_path", "model")
+        speculative = None
+        if streaming and config.get("voice.speculative", True):
+            from src.core.speculative import SpeculativeDetector
+            speculative = SpeculativeDetector(
+                self.detector,
+                stable_frames=config.get("voice.speculative_frames", 3),
+                endpoint_ms=config.get("voice.speculative_endpoint_ms", 150),
+            )
+        
+        try:
+            while self.running:
+                ui.show_listening()
+                trace = self.tracer.start(mode="streaming" if streaming else "serial")
+                
+                with trace.activate():
+                    # Listen for voice (streaming can act before the decoder's own endpoint)
+                    if speculative is not None:
+                        speculation = speculative.begin()
+                        text = self.voice.listen_streaming(
+                            on_partial=speculation.on_partial,
+                            on_silence=speculation.on_silence,
+                            model_path=model_path
+                        )
+                        speculation.finish(text)
+                    elif streaming:
+                        text = self.voice.listen_streaming(
+                            on_partial=lambda partial: self.detector.match_partial(partial) is not None,
+                            model_path=model_path
+                        )
+                    else:
+                        text = self.voice.listen()
+                
+                if text is None:
+                    ui.show_no_speech()
+                    continue
+                
+                self._schedule(self._detect((trace, text)))
+                for scheduled in self.scheduler.drain():
+                    self._handle_result(scheduled)
+        finally:
+            if speculative is not None:
+                logger.info(f"Speculative detection: {speculative.stats()}")
+    
+    def _run_pipeline(self) -> None:
+        """Capture, recognition, detection and execution on separate threads"""
+        from src.core.pipeline import VoicePipeline
+        pipeline = VoicePipeline(
+            capture=self._capture,
+            recognize=self._recognize,
+            detect=self._detect,
+            execute=self._handle_result,
+            buffer_size=config.get("voice.pipeline_buffer", 8),
+            queue_size=config.get("voice.pipeline_queue", 4),
+            actions=self.scheduler,
+            capture_timeout=self.voice.listen_timeout + (self.voice.phrase_limit or 0),
+        )
+        self.pipeline = pipeline
+        ui.show_listening()
+        pipeline.start()
+        try:
+            while self.running:
+                time.sleep(0.1)
+        finally:
+            pipeline.stop()
+            self._log_pipeline_stats(pipeline)
+    
+    def _capture(self) -> Optional[Tuple[Trace, Any]]:
+        """Pipeline capture stage: the trace travels with the audio"""
+        trace = self.tracer.start(mode="pipeline")
+        with trace.activate():
+            audio = self.voice.capture_utterance()
+        return None if audio is None else (trace, audio)
+    
+    def _recognize(self, captured: Tuple[Trace, Any]) -> Optional[Tuple[Trace, str]]:
+        """Pipeline recognize stage"""
+        trace, audio = captured
+        with trace.activate():
+            text = self.voice.recognize_audio(audio)
+        return None if text is None else (trace, text)
+    
+    def _log_pipeline_stats(self, pipeline: "VoicePipeline") -> None:
+        """Per-stage queue depth / latency summary"""
+        for name, stage in pipeline.stats().items():
+            logger.info(
+                f"Pipeline {name}: processed={stage['processed']} dropped={stage['dropped']} "
+                f"errors={stage['errors']} depth={stage['queue_depth']} "
+                f"avg={stage['avg_ms']:.1f}ms max={stage['max_ms']:.1f}ms"
+            )
+        scheduled = self.scheduler.stats()
+        logger.info(
+            f"Scheduler: submitted={scheduled['submitted']} debounced={scheduled['debounced']} "
+            f"coalesced={scheduled['coalesced']} dropped={scheduled['dropped']}"
+        )
+        if self.voice.backend is not None and self.voice.backend.name == "race":
+            for name, backend in self.voice.backend.stats().items():
+                logger.info(
+                    f"Race {name}: calls={backend['calls']} wins={backend['wins']} ({backend['win_rate']:.0%}) "
+                    f"fallbacks={backend['fallbacks']} unknown={backend['unknown']} errors={backend['errors']} "
+                    f"skipped={backend['skipped']} "
+                    f"p50={backend['latency_ms']['p50_ms']:.0f}ms p95={backend['latency_ms']['p95_ms']:.0f}ms"
+                )
+        if self.voice.vad is not None:
+            vad = self.voice.vad.stats()
+            logger.info(
+                f"VAD ({vad['backend']}): forwarded={vad['segments_forwarded']} dropped={vad['segments_dropped']} "
+                f"frames forwarded={vad['frames_forwarded']} dropped={vad['frames_dropped']}"
+            )
+    
+    def _log_latency(self) -> None:
+        """Per-stage latency percentiles, plus the JSON export"""
+        for stage, summary in self.tracer.snapshot().items():
+            logger.info(
+                f"Latency {stage}: n={summary['count']} p50={summary['p50_ms']:.0f}ms "
+                f"p95={summary['p95_ms']:.0f}ms p99={summary['p99_ms']:.0f}ms max={summary['max_ms']:.0f}ms"
+            )
+        export_path = config.get("storage.latency_report", "")
+        if export_path and self.tracer.finished:
+            try:
+                self.tracer.export_json(Path(export_path))
+            except OSError as e:
+                logger.warning(f"Cannot write latency report: {e}")
+    
+    def _log_session_summary(self) -> None:
+        """Flush telemetry and log this session's rollup"""
+        self.telemetry.flush()
+        summary = self.telemetry.session_summary()
+        logger.info(
+            f"Session {summary['session_id']}: utterances={summary['utterances']} "
+            f"recognized={summary['recognized']} ({summary['recognition_rate']:.0%}) "
+            f"executed={summary['executions']} succeeded={summary['succeeded']}"
+        )
+        self.telemetry.end_session()
+    
+    def _detect(self, recognized: Tuple[Trace, str]) -> Tuple[Trace, str, Optional[Dict[str, Any]]]:
+        """Show caption and run command detection on recognized text"""
+        trace, text = recognized
+        if self.popup is not None and self.popup.caption_running:
+            try:
+                self.popup.show_caption(text)
+            except:
+                pass
+        result = self.detector.detect(text)
+        trace.mark(DETECTED)
+        if self.telemetry:
+            self.telemetry.record_utterance(text, result)
+        return trace, text, result
+    
+    def _confident(self, text: str) -> bool:
+        """Would detect() execute this transcript? (recognition race acceptance)"""
+        match = self.detector.evaluate(text)
+        return match is not None and match["score"] >= self.detector.MIN_SCORE
+    
+    @staticmethod
+    def _command_of(detection: Tuple[Trace, str, Optional[Dict[str, Any]]]) -> Optional[str]:
+        """Scheduler key: the command a detection would execute (None = nothing)"""
+        result = detection[2]
+        if not result or result.get("command") in (None, "unknown"):
+            return None
+        return result["command"]
+    
+    def _schedule(self, detection: Tuple[Trace, str, Optional[Dict[str, Any]]]) -> None:
+        """Serial mode: hand a detection to the scheduler (the pipeline's detect stage does this itself)"""
+        try:
+            self.scheduler.put_nowait(detection)
+        except queue.Full:
+            logger.warning("Command queue full, dropping detection")
+    
+    def _handle_result(self, scheduled: "ScheduledCommand") -> None:
+        """Execute a scheduled command, show feedback and close the utterances' traces"""
+        if not self.running:
+            return
+        try:
+            self._execute(scheduled)
+        finally:
+            for trace, _, _ in scheduled.items:
+                spans = self.tracer.finish(trace)
+                if self.telemetry:
+                    for stage, elapsed_ms in spans.items():
+                        self.telemetry.record_latency(stage, elapsed_ms)
+    
+    def _execute(self, scheduled: "ScheduledCommand") -> None:
+        trace, text, result = scheduled.item
+        
+        if result and result.get("command") != "unknown":
+            # Get confidence
+            confidence = (result.get('score', 0) / result.get('max_score', 10)) * 100
+            
+            # Show detection
+            ui.show_command_detected(
+                result.get("command"),
+                text,
+                confidence
+            )
+            
+            # Execute every coalesced utterance, each step of a multi-command utterance
+            executed = 0
+            commands = set()
+            feedback = None
+            for repeat_trace, _, repeat_result in scheduled.items:
+                admitted = False
+                for step in repeat_result.get("sequence") or [repeat_result]:
+                    command = step.get("command")
+                    # The utterance's own command passed the debounce when it was queued
+                    if not admitted and command == scheduled.command:
+                        admitted = True
+                    elif not self.scheduler.admit(command):
+                        continue
+                    feedback = self.ppt.execute_command(step)
+                    executed += 1
+                    commands.add(command)
+                    repeat_trace.mark(EXECUTED)
+                    if self.telemetry:
+                        self.telemetry.record_execution(
+                            command,
+                            success=not feedback.startswith(("⚠", "❌")),
+                            latency_ms=repeat_trace.span(DETECTED, EXECUTED),
+                            feedback=feedback
+                        )
+            if feedback is not None:
+                if executed > 1:
+                    feedback += f" (x{executed})"
+                ui.show_command_feedback(feedback)
+            
+            # Check for stop command
+            if "stop" in commands:
+                console.print("\n[bold yellow][STOP] Stopping Voice Control...[/bold yellow]")
+                self.running = False
+            
+            # Check for help command
+            elif "help" in commands:
+                console.print()
+                self.detector.show_help()
+                # Pipelined mode: keep capture from queueing audio while help is read
+                pipelined = self.pipeline is not None and self.pipeline.running
+                if pipelined:
+                    self.pipeline.pause()
+                ui.pause()
+                if pipelined:
+                    self.pipeline.resume()
+                    self.scheduler.drain()
+                ui.show_voice_control_active()
+        
+        else:
+            # Unknown command
+            ui.show_unknown_command(text)
+    
     def run(self) -> None:
         """Main application loop"""
         
@@ -353,6 +644,10 @@ class SlideSenseApp:
                     ui.show_error("Menu Error", f"An error occurred: {str(e)}")
             
             # Cleanup
+            if self.voice:
+                self.voice.close()
+                logger.info("Microphone released")
+            
             if self.popup:
                 try:
                     self.popup.stop()
@@ -384,7 +679,21 @@ class SlideSenseApp:
 def main() -> None:
     """Entry point"""
     
-    # Check requirements
+    parser = argparse.ArgumentParser(description="SlideSense - voice-controlled PowerPoint")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time detector/recognizer calls and record a cProfile of the run")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="With --profile, also track peak memory (tracemalloc, slower)")
+    parser.add_argument("--profile-output", default="profile/slidesense-profile.json",
+                        help="Where --profile writes its JSON report")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Print startup phase timings and the slowest imports once listening")
+    args = parser.parse_args()
+    
+    if args.startup_report:
+        get_startup_timer().track_imports()
+    
+    # Check requirements (located, not imported: components import them when needed)
     required_modules = [
         ('pyautogui', 'PyAutoGUI'),
         ('speech_recognition', 'SpeechRecognition'),
@@ -392,17 +701,27 @@ def main() -> None:
     ]
     
     for module_name, display_name in required_modules:
-        try:
-            __import__(module_name)
-        except ImportError:
+        if importlib.util.find_spec(module_name) is None:
             console.print(f"[red]❌ {display_name} tidak terinstall![/red]")
             console.print(f"   Install dengan: [cyan]pip install {module_name}[/cyan]")
             input("\nPress Enter to exit...")
             sys.exit(1)
     
-    # Run application
-    app = SlideSenseApp()
-    app.run()
+    # Run application (optionally under the profiler)
+    profiler = None
+    if args.profile:
+        from src.infrastructure.profiler import PerformanceProfiler
+        profiler = PerformanceProfiler()
+    app = SlideSenseApp(profiler=profiler, startup_report=args.startup_report)
+    if profiler is None:
+        app.run()
+        return
+    
+    with profiler.session(cpu=True, memory=args.profile_memory):
+        app.run()
+    console.print(profiler.report())
+    path = profiler.save(Path(args.profile_output))
+    console.print(f"[cyan]Profile saved to {path} (cProfile data: {path.with_suffix('.prof')})[/cyan]")
 
 
 if __name__ == "__main__":
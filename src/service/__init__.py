@@ -0,0 +1,3 @@
+"""
+Shared detection service: one warm detector / recognizer for many rooms
+"""
@@ -0,0 +1,51 @@
+"""
+Run the detection service
+
+Usage:
+    python -m src.service [--unix /tmp/slidesense.sock] [--host 127.0.0.1] [--port 8765]
+                          [--workers 2]
+
+Defaults come from the "service" section of the config.
+"""
+
+import argparse
+import asyncio
+
+from src.infrastructure.config import get_config
+from src.infrastructure.logger import get_logger
+from src.service.server import DetectionServer
+
+logger = get_logger(__name__)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = DetectionServer(workers=args.workers, model_path=args.model,
+                             language=args.language, recognizer_threads=args.recognizer_threads)
+    await server.start(unix_path=args.unix or None, host=args.host, port=args.port if args.port >= 0 else None)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    config = get_config()
+    parser = argparse.ArgumentParser(description="SlideSense shared detection service")
+    parser.add_argument("--unix", default=config.get("service.unix_socket"), help="Unix socket path")
+    parser.add_argument("--host", default=config.get("service.host", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=config.get("service.port", 8765), help="TCP port (-1 disables TCP)")
+    parser.add_argument("--workers", type=int, default=config.get("service.workers", 2),
+                        help="Detector processes (0 = in-process)")
+    parser.add_argument("--recognizer-threads", type=int, default=config.get("service.recognizer_threads", 2))
+    parser.add_argument("--model", default="model", help="Vosk model directory")
+    parser.add_argument("--language", default=config.get("voice.language", "id-ID"))
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        logger.info("Detection service stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Blocking client for the detection service
+
+Keeps one persistent newline-delimited JSON connection (Unix socket or
+localhost TCP) and reconnects once if the server dropped it.
+"""
+
+import socket
+import threading
+from typing import Any, Dict, Optional
+
+from src.infrastructure.exceptions import ServiceError
+from src.service import protocol
+
+
+class DetectionClient:
+    """One room's (or one tool's) connection to a DetectionServer"""
+
+    def __init__(self, unix_path: Optional[str] = None, host: str = "127.0.0.1",
+                 port: int = 8765, timeout: float = 2.0) -> None:
+        self.unix_path = unix_path
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def _connect(self) -> None:
+        if self.unix_path:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.unix_path)
+        else:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock = sock
+        self._file = sock.makefile("rb")
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+    def _disconnect(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._file = None
+
+    def __enter__(self) -> "DetectionClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def request(self, message: Dict[str, Any]) -> Any:
+        """
+        Send one request and wait for its response
+
+        Returns:
+            The response's result
+
+        Raises:
+            ServiceError: server unreachable or the request failed
+        """
+        with self._lock:
+            self._next_id += 1
+            message = dict(message, id=self._next_id)
+            line = protocol.encode(message)
+            for attempt in (1, 2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.sendall(line)
+                    reply = self._file.readline()
+                    if not reply:
+                        raise ConnectionResetError("connection closed by server")
+                    break
+                except OSError as e:
+                    self._disconnect()
+                    if attempt == 2 or isinstance(e, socket.timeout):
+                        raise ServiceError(f"Detection service unreachable: {e}") from e
+
+        try:
+            response = protocol.decode(reply)
+        except ValueError as e:
+            raise ServiceError(f"Malformed response from detection service: {e}") from e
+        if not response.get("ok"):
+            raise ServiceError(response.get("error", "Unknown service error"))
+        return response.get("result")
+
+    # ---------- ops ----------
+
+    def ping(self) -> Dict[str, Any]:
+        return self.request({"op": "ping"})
+
+    def stats(self) -> Dict[str, Any]:
+        return self.request({"op": "stats"})
+
+    def detect(self, text: str, room: str = "default") -> Dict[str, Any]:
+        """Same result shape as SmartVoiceDetector.detect (command None while the room cools down)"""
+        return self.request({"op": "detect", "room": room, "text": text})
+
+    def recognize(self, pcm: bytes, sample_rate: int = 16000, room: str = "default",
+                  backend: str = "vosk") -> Dict[str, Any]:
+        """Transcribe 16-bit mono PCM and detect on the transcript: {"text", "detection"}"""
+        return self.request({
+            "op": "recognize", "room": room, "rate": sample_rate,
+            "backend": backend, "audio": protocol.encode_audio(pcm),
+        })
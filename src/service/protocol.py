@@ -0,0 +1,65 @@
+"""
+Wire format of the detection service
+
+Requests and responses are single-line JSON objects. Over a Unix socket
+or raw TCP connection they are newline-delimited (one request per line,
+answered in order); over HTTP the same object is the POST body of
+/v1/<op> (GET for ping / stats).
+
+    {"op": "detect", "room": "aula-1", "text": "next slide"}
+    {"op": "recognize", "room": "aula-1", "rate": 16000, "audio": "<base64 16-bit mono PCM>",
+     "backend": "vosk"}
+    {"op": "ping"} / {"op": "stats"}
+
+    -> {"ok": true, "result": {...}}  or  {"ok": false, "error": "..."}
+
+An optional "id" in a request is echoed back in its response.
+"""
+
+import base64
+import json
+from typing import Any, Dict, Optional
+
+OPS = ("detect", "recognize", "ping", "stats")
+MAX_LINE_BYTES = 4 * 1024 * 1024  # ~2 minutes of 16 kHz PCM after base64
+HTTP_METHODS = (b"GET ", b"POST ", b"HEAD ", b"PUT ", b"DELETE ", b"OPTIONS ")
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    """One message as a newline-terminated compact JSON line"""
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def decode(line: bytes) -> Dict[str, Any]:
+    """
+    Parse one request line
+
+    Raises:
+        ValueError: not a JSON object
+    """
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("request must be a JSON object")
+    return message
+
+
+def ok(result: Any, request_id: Optional[Any] = None) -> Dict[str, Any]:
+    response = {"ok": True, "result": result}
+    if request_id is not None:
+        response["id"] = request_id
+    return response
+
+
+def error(message: str, request_id: Optional[Any] = None) -> Dict[str, Any]:
+    response = {"ok": False, "error": message}
+    if request_id is not None:
+        response["id"] = request_id
+    return response
+
+
+def encode_audio(pcm: bytes) -> str:
+    return base64.b64encode(pcm).decode("ascii")
+
+
+def decode_audio(data: str) -> bytes:
+    return base64.b64decode(data.encode("ascii"), validate=True)
@@ -0,0 +1,318 @@
+"""
+Asyncio detection server
+
+One process keeps the compiled phrase index (and, for audio requests, the
+loaded Vosk model) warm and serves any number of rooms over a Unix socket
+and/or a localhost TCP port. Each connection may speak newline-delimited
+JSON or HTTP/1.1; the first line decides.
+
+Command matching is CPU-bound Python, so it runs in a pool of worker
+processes, each holding its own warm SmartVoiceDetector (workers=0 keeps a
+single in-process detector on a helper thread). Speech recognition runs on
+a thread pool with one backend per thread; the Vosk model itself is shared.
+Per-room state (a CommandScheduler applying the app's per-command debounce)
+lives in the event loop, so workers are stateless and any worker can answer
+any room.
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import speech_recognition as sr
+
+from src.core.command_scheduler import CommandPolicy, CommandScheduler
+from src.infrastructure.logger import get_logger
+from src.infrastructure.tracing import LatencyHistogram
+from src.service import protocol
+
+logger = get_logger(__name__)
+
+# ---------- detection worker (runs in each pool process) ----------
+
+_detector = None
+
+
+def _init_detector() -> None:
+    """Build this worker's detector once (phoneme expansion + index compile)"""
+    global _detector
+    from src.core.voice_detector import SmartVoiceDetector
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        _detector = SmartVoiceDetector()
+
+
+def _classify(text: str) -> Dict[str, Any]:
+    """detect()'s verdict for text, minus debounce, printing and logging"""
+    from src.utils.validators import InputValidator
+    match = _detector.evaluate(text)
+    if match is None:
+        return {"command": "unknown", "reason": "No matching command found"}
+    if match["score"] >= _detector.MIN_SCORE:
+        if not InputValidator.validate_command(match["command"]):
+            return {"command": None, "reason": "Command validation failed"}
+        return {key: match[key] for key in ("command", "phrase", "score", "max_score", "description") if key in match}
+    return {
+        "command": "unknown",
+        "score": match["score"],
+        "closest": match["command"],
+        "suggestion": match.get("description"),
+        "reason": f"Low confidence: {match['score']:.1f}/{_detector.MIN_SCORE}",
+    }
+
+
+# ---------- server ----------
+
+class DetectionServer:
+    """Shared detector / recognizer behind a local socket API"""
+
+    def __init__(self, workers: int = 2, policies: Optional[Dict[str, CommandPolicy]] = None,
+                 model_path: str = "model", language: str = "id-ID", recognizer_threads: int = 2) -> None:
+        self.workers = workers
+        self.policies = policies  # Overrides on top of the scheduler's DEFAULT_POLICIES
+        self.model_path = model_path
+        self.language = language
+        self.recognizer_threads = recognizer_threads
+
+        self.rooms: Dict[str, CommandScheduler] = {}  # room -> debounce state of its commands
+        self.unix_path: Optional[Path] = None
+        self.port: Optional[int] = None
+
+        self._detect_pool: Optional[Executor] = None
+        self._recognize_pool: Optional[ThreadPoolExecutor] = None
+        self._backends = threading.local()
+        self._servers: List[asyncio.AbstractServer] = []
+
+        self.started_at = 0.0
+        self.requests: Dict[str, int] = {}
+        self.errors = 0
+        self.latency: Dict[str, LatencyHistogram] = {}
+
+    # ---------- lifecycle ----------
+
+    async def start(self, unix_path: Optional[str] = None, host: str = "127.0.0.1",
+                    port: Optional[int] = None) -> None:
+        """Warm the workers and start listening (port 0 picks a free port)"""
+        if unix_path is None and port is None:
+            raise ValueError("Need a Unix socket path and/or a TCP port")
+
+        if self.workers > 0:
+            self._detect_pool = ProcessPoolExecutor(self.workers, initializer=_init_detector)
+        else:
+            self._detect_pool = ThreadPoolExecutor(1, initializer=_init_detector)
+        self._recognize_pool = ThreadPoolExecutor(self.recognizer_threads, thread_name_prefix="service-recognize")
+
+        loop = asyncio.get_running_loop()
+        warm_start = time.perf_counter()
+        await asyncio.gather(*(loop.run_in_executor(self._detect_pool, _classify, "next slide")
+                               for _ in range(max(1, self.workers))))
+        logger.info(f"Detection workers warm in {time.perf_counter() - warm_start:.1f}s")
+
+        if unix_path is not None:
+            self.unix_path = Path(unix_path)
+            if self.unix_path.exists():
+                self.unix_path.unlink()  # Stale socket from a previous run
+            server = await asyncio.start_unix_server(self._handle_connection, path=str(self.unix_path),
+                                                     limit=protocol.MAX_LINE_BYTES)
+            os.chmod(self.unix_path, 0o600)
+            self._servers.append(server)
+            logger.info(f"Detection service listening on {self.unix_path}")
+        if port is not None:
+            server = await asyncio.start_server(self._handle_connection, host, port, limit=protocol.MAX_LINE_BYTES)
+            self.port = server.sockets[0].getsockname()[1]
+            self._servers.append(server)
+            logger.info(f"Detection service listening on {host}:{self.port}")
+        self.started_at = time.time()
+
+    async def serve_forever(self) -> None:
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+
+    async def close(self) -> None:
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+        if self._detect_pool is not None:
+            self._detect_pool.shutdown(wait=True, cancel_futures=True)
+        if self._recognize_pool is not None:
+            self._recognize_pool.shutdown(wait=True, cancel_futures=True)
+        if self.unix_path is not None and self.unix_path.exists():
+            self.unix_path.unlink()
+
+    # ---------- connections ----------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            first = await reader.readline()
+            if first.startswith(protocol.HTTP_METHODS):
+                await self._serve_http(first, reader, writer)
+            else:
+                await self._serve_lines(first, reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass  # Client went away or sent an oversized line
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _serve_lines(self, line: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Newline-delimited JSON: one response line per request line, in order"""
+        while line:
+            if line.strip():
+                try:
+                    message = protocol.decode(line)
+                except ValueError as e:
+                    response = protocol.error(f"Bad request: {e}")
+                else:
+                    response = await self.handle(message)
+                writer.write(protocol.encode(response))
+                await writer.drain()
+            line = await reader.readline()
+
+    async def _serve_http(self, request_line: bytes, reader: asyncio.StreamReader,
+                          writer: asyncio.StreamWriter) -> None:
+        """Minimal HTTP/1.1: GET|POST /v1/<op>, JSON in and out, keep-alive"""
+        while request_line:
+            parts = request_line.decode("latin-1").split()
+            method, path = (parts[0], parts[1]) if len(parts) >= 2 else ("", "")
+            headers = {}
+            while True:
+                header = await reader.readline()
+                if header in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = header.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+
+            op = path.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+            if not path.startswith("/v1/") or op not in protocol.OPS:
+                status, response = 404, protocol.error(f"Unknown path {path}")
+            else:
+                try:
+                    message = protocol.decode(body) if body.strip() else {}
+                    message["op"] = op
+                    response = await self.handle(message)
+                    status = 200 if response["ok"] else 400
+                except ValueError as e:
+                    status, response = 400, protocol.error(f"Bad request: {e}")
+
+            payload = protocol.encode(response)
+            keep_alive = headers.get("connection", "").lower() != "close"
+            writer.write(
+                f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+            if not keep_alive or method == "":
+                return
+            request_line = await reader.readline()
+
+    # ---------- requests ----------
+
+    async def handle(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch one decoded request to its op"""
+        op = message.get("op")
+        request_id = message.get("id")
+        if op not in protocol.OPS:
+            self.errors += 1
+            return protocol.error(f"Unknown op: {op!r}", request_id)
+
+        start = time.perf_counter()
+        try:
+            result = await getattr(self, f"_op_{op}")(message)
+            response = protocol.ok(result, request_id)
+        except (KeyError, TypeError, ValueError) as e:
+            self.errors += 1
+            response = protocol.error(f"Bad {op} request: {e}", request_id)
+        except sr.RequestError as e:
+            self.errors += 1
+            response = protocol.error(f"Recognizer unavailable: {e}", request_id)
+
+        self.requests[op] = self.requests.get(op, 0) + 1
+        self.latency.setdefault(op, LatencyHistogram()).record((time.perf_counter() - start) * 1000)
+        return response
+
+    async def _op_ping(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        return {"pong": True, "uptime": time.time() - self.started_at}
+
+    async def _op_stats(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        return self.stats()
+
+    async def _op_detect(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._detect(str(message.get("room", "default")), str(message["text"]))
+
+    async def _op_recognize(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        pcm = protocol.decode_audio(message["audio"])
+        rate = int(message.get("rate", 16000))
+        backend = str(message.get("backend", "vosk"))
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(self._recognize_pool, self._recognize, backend, pcm, rate)
+        if not text:
+            return {"text": None, "detection": None}
+        detection = await self._detect(str(message.get("room", "default")), text)
+        return {"text": text, "detection": detection}
+
+    async def _detect(self, room: str, text: str) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._detect_pool, _classify, text)
+
+        if result["command"] == "unknown":
+            if text.strip():
+                self._log_unrecognized(text.lower().strip(), result)
+            return result
+        if result["command"] is None:
+            return result
+
+        # Same per-command debounce as the app's scheduler, but per room
+        scheduler = self.rooms.get(room)
+        if scheduler is None:
+            scheduler = self.rooms[room] = CommandScheduler(policies=self.policies)
+        command = result["command"]
+        if not scheduler.admit(command):
+            return {"command": None, "reason": "debounced", "retry_after": scheduler.retry_after(command)}
+        return result
+
+    def _recognize(self, backend_name: str, pcm: bytes, rate: int) -> Optional[str]:
+        """Runs on a recognizer thread; each thread keeps its own backend instances"""
+        from src.core.recognizer_backends import create_backend
+        from src.infrastructure.exceptions import VoiceRecognitionError
+
+        backends = getattr(self._backends, "by_name", None)
+        if backends is None:
+            backends = self._backends.by_name = {}
+        backend = backends.get(backend_name)
+        if backend is None:
+            try:
+                backend = create_backend(backend_name, sr.Recognizer(), self.language, self.model_path)
+            except VoiceRecognitionError as e:
+                raise sr.RequestError(str(e))
+            backends[backend_name] = backend
+        try:
+            return backend.recognize(sr.AudioData(pcm, rate, 2))
+        except sr.UnknownValueError:
+            return None
+
+    @staticmethod
+    def _log_unrecognized(text: str, result: Dict[str, Any]) -> None:
+        from src.infrastructure.unrecognized_store import get_unrecognized_store
+        try:
+            get_unrecognized_store().record(text, result.get("closest"), result.get("score", 0.0),
+                                            result.get("suggestion"))
+        except Exception as e:
+            logger.warning(f"Cannot log unrecognized command: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "uptime": time.time() - self.started_at if self.started_at else 0.0,
+            "workers": self.workers,
+            "rooms": len(self.rooms),
+            "debounced": sum(scheduler.debounced for scheduler in self.rooms.values()),
+            "requests": dict(self.requests),
+            "errors": self.errors,
+            "latency_ms": {op: histogram.summary() for op, histogram in self.latency.items()},
+        }
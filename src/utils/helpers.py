@@ -88,29 +88,21 @@ def safe_call(
 # DEVICE MANAGEMENT UTILITIES
 # ============================================
 
-def get_audio_devices() -> List[Dict[str, Any]]:
+def get_audio_devices(refresh: bool = False) -> List[Dict[str, Any]]:
     """
     Get list of available audio input devices.
     
+    The scan is cached; pass refresh=True after plugging in a microphone.
+    
     Returns:
         List of device dictionaries with 'index', 'name', 'channels' keys
     """
     try:
-        import pyaudio
-        audio = pyaudio.PyAudio()
-        devices = []
-        
-        for i in range(audio.get_device_count()):
-            device_info = audio.get_device_info_by_index(i)
-            if device_info.get('maxInputChannels') > 0:
-                devices.append({
-                    'index': i,
-                    'name': device_info.get('name', 'Unknown'),
-                    'channels': device_info.get('maxInputChannels', 0)
-                })
-        
-        audio.terminate()
-        return devices
+        from src.core.audio_session import list_input_devices
+        return [
+            {'index': d['index'], 'name': d['name'], 'channels': d['channels']}
+            for d in list_input_devices(refresh=refresh)
+        ]
         
     except Exception as e:
         console.print(f"[red]Error getting devices: {e}[/red]")
@@ -0,0 +1,75 @@
+"""
+Tests for the shared audio session's subscriber buffering
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.audio_session import PreRoll, Subscription
+
+
+class FakeSession:
+    """Just the attributes a Subscription reads"""
+    sample_width = 2
+
+    def __init__(self) -> None:
+        self.unsubscribed = []
+
+    def unsubscribe(self, subscription) -> None:
+        self.unsubscribed.append(subscription)
+
+
+class TestSubscription:
+    """Frame-accurate reads over fixed-size chunks"""
+
+    def test_reads_across_chunk_boundaries(self) -> None:
+        subscription = Subscription(FakeSession(), max_chunks=8)
+        subscription._push(b"\x01\x00" * 4)
+        subscription._push(b"\x02\x00" * 4)
+        assert subscription.read(3) == b"\x01\x00" * 3
+        assert subscription.read(3) == b"\x01\x00" + b"\x02\x00" * 2
+        assert subscription.read(2) == b"\x02\x00" * 2
+
+    def test_drops_oldest_when_behind(self) -> None:
+        subscription = Subscription(FakeSession(), max_chunks=2)
+        for value in (1, 2, 3):
+            subscription._push(bytes([value, 0]))
+        assert subscription.dropped == 1
+        assert subscription.read(2) == b"\x02\x00\x03\x00"
+
+    def test_stall_returns_silence(self) -> None:
+        subscription = Subscription(FakeSession(), max_chunks=2)
+        subscription._push(b"\x05\x00")
+        assert subscription.read(3, timeout=0.01) == b"\x05\x00" + b"\x00" * 4
+
+    def test_close_unsubscribes(self) -> None:
+        session = FakeSession()
+        subscription = Subscription(session, max_chunks=2)
+        subscription.close()
+        assert session.unsubscribed == [subscription]
+
+
+class TestPreRoll:
+    """Only audio no subscriber has read is replayed"""
+
+    def test_replays_only_unread_chunks(self) -> None:
+        preroll = PreRoll(max_chunks=4)
+        subscription = Subscription(FakeSession(), max_chunks=8)
+        for value in (1, 2, 3):
+            subscription._push(bytes([value, 0]), preroll.append(bytes([value, 0])))
+        assert subscription.read(2) == b"\x01\x00\x02\x00"  # Listen cut after two chunks
+        preroll.mark_consumed(subscription.last_read)
+        preroll.append(b"\x04\x00")
+        assert [chunk for _, chunk in preroll.unconsumed()] == [b"\x03\x00", b"\x04\x00"]
+
+    def test_keeps_the_most_recent_chunks(self) -> None:
+        preroll = PreRoll(max_chunks=2)
+        for value in (1, 2, 3):
+            preroll.append(bytes([value, 0]))
+        assert [position for position, _ in preroll.unconsumed()] == [2, 3]
+        preroll.mark_consumed(3)
+        preroll.mark_consumed(1)
+        assert preroll.unconsumed() == []
@@ -0,0 +1,47 @@
+"""
+Tests for the constrained-decoding grammar built from the wake-word table
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.command_grammar import (
+    UNKNOWN_TOKEN, build_grammar, command_phrases, grammar_json, load_lexicon, strip_unknown
+)
+
+WAKE_WORDS = {
+    "next": {"phrases": ["next slide", "neks slaid", "lanjut slide"], "weight": 10, "description": "Slide maju"},
+    "stop": {"phrases": ["stop program", "stop", "next slide"], "weight": 15, "description": "Stop program"},
+}
+
+
+class TestCommandGrammar:
+    """Grammar content and vocabulary filtering"""
+
+    def test_phrases_deduplicated_in_order(self) -> None:
+        phrases = command_phrases(WAKE_WORDS, include_main_commands=False)
+        assert phrases == ["next slide", "neks slaid", "lanjut slide", "stop program", "stop"]
+
+    def test_excluded_variants(self) -> None:
+        phrases = command_phrases(WAKE_WORDS, exclude={"neks slaid"}, include_main_commands=False)
+        assert "neks slaid" not in phrases
+
+    def test_out_of_vocabulary_phrases_dropped(self) -> None:
+        vocabulary = {"next", "slide", "stop", "program"}
+        grammar = build_grammar(["next slide", "lanjut slide", "stop"], vocabulary)
+        assert grammar == ["next slide", "stop", UNKNOWN_TOKEN]
+
+    def test_grammar_json_uses_model_lexicon(self, tmp_path: Path) -> None:
+        (tmp_path / "cmudict-en-us.dict").write_text("next N EH1 K S T\nslide S L AY1 D\nstop(2) S T AA1 P\n")
+        assert load_lexicon(str(tmp_path)) == {"next", "slide", "stop"}
+
+        grammar = json.loads(grammar_json(WAKE_WORDS, str(tmp_path)))
+        assert "next slide" in grammar and "stop" in grammar
+        assert "lanjut slide" not in grammar and grammar[-1] == UNKNOWN_TOKEN
+
+    def test_strip_unknown(self) -> None:
+        assert strip_unknown("[unk] next slide [unk]") == "next slide"
@@ -0,0 +1,146 @@
+"""
+Tests for per-command debounce / coalescing between detection and execution
+"""
+
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.command_scheduler import CommandPolicy, CommandScheduler, ScheduledCommand
+from src.core.pipeline import VoicePipeline
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+class TestCommandScheduler:
+    """Policy decisions on a controlled monotonic clock"""
+
+    def test_rapid_navigation_is_never_dropped(self, clock) -> None:
+        scheduler = CommandScheduler(clock=clock)
+        for _ in range(3):
+            assert scheduler.put_nowait("next")
+            clock.now += 0.1
+        (task,) = scheduler.drain()
+        assert task.command == "next" and task.count == 3
+        assert scheduler.stats()["coalesced"] == 2
+
+    def test_coalescing_keeps_order(self, clock) -> None:
+        scheduler = CommandScheduler(clock=clock)
+        for command in ["next", "next", "previous", "next"]:
+            scheduler.put_nowait(command)
+        assert [(t.command, t.count) for t in scheduler.drain()] == [("next", 2), ("previous", 1), ("next", 1)]
+
+    def test_different_commands_are_not_blocked(self, clock) -> None:
+        scheduler = CommandScheduler(clock=clock)
+        assert scheduler.put_nowait("open_slideshow")
+        assert scheduler.put_nowait("next")
+        assert scheduler.put_nowait("close_slideshow")
+        assert len(scheduler.drain()) == 3
+
+    def test_toggle_repeat_is_debounced(self, clock) -> None:
+        scheduler = CommandScheduler(clock=clock)
+        assert scheduler.put_nowait("open_slideshow")
+        clock.now += 0.5
+        assert not scheduler.put_nowait("open_slideshow")
+        assert scheduler.retry_after("open_slideshow") == pytest.approx(1.5)
+        assert scheduler.retry_after("next") == 0.0
+        clock.now += 2.0
+        assert scheduler.put_nowait("open_slideshow")
+        assert scheduler.stats()["debounced"] == 1
+
+    def test_sequence_steps_share_the_debounce(self, clock) -> None:
+        scheduler = CommandScheduler(clock=clock)
+        assert scheduler.put_nowait("next")
+        assert scheduler.admit("open_slideshow")
+        clock.now += 0.5
+        assert not scheduler.admit("open_slideshow")
+        assert not scheduler.put_nowait("open_slideshow")
+        assert scheduler.admit("next")
+        assert scheduler.stats()["debounced"] == 2
+
+    def test_custom_policy(self, clock) -> None:
+        scheduler = CommandScheduler(clock=clock, policies={"next": CommandPolicy(debounce=0.5)})
+        assert scheduler.put_nowait("next")
+        assert not scheduler.put_nowait("next")
+
+    def test_unknown_items_pass_through(self, clock) -> None:
+        scheduler = CommandScheduler(key=lambda item: None, clock=clock)
+        for _ in range(3):
+            assert scheduler.put_nowait("mumble")
+        assert [t.count for t in scheduler.drain()] == [1, 1, 1]
+
+    def test_full_queue_raises(self, clock) -> None:
+        scheduler = CommandScheduler(clock=clock, max_pending=2)
+        scheduler.put_nowait("open_slideshow")
+        scheduler.put_nowait("help")
+        with pytest.raises(queue.Full):
+            scheduler.put_nowait("stop")
+        # A coalescible repeat still joins the waiting task
+        full = CommandScheduler(clock=clock, max_pending=1)
+        full.put_nowait("next")
+        assert full.put_nowait("next")
+
+    def test_control_items_are_not_wrapped(self) -> None:
+        scheduler = CommandScheduler()
+        sentinel = object()
+        scheduler.put(sentinel)
+        assert scheduler.get(0) is sentinel
+
+    def test_get_blocks_until_submitted(self) -> None:
+        scheduler = CommandScheduler()
+        threading.Timer(0.05, scheduler.put_nowait, args=("next",)).start()
+        task = scheduler.get(timeout=2.0)
+        assert isinstance(task, ScheduledCommand) and task.command == "next"
+        with pytest.raises(queue.Empty):
+            scheduler.get(timeout=0.01)
+
+
+class TestSchedulerInPipeline:
+    """The scheduler as the detect -> execute inbox"""
+
+    def test_repeats_queued_behind_a_slow_execute_all_run(self) -> None:
+        utterances = iter(["next", "next", "next", "previous"])
+        release = threading.Event()
+        executed = []
+
+        def capture():
+            try:
+                return next(utterances)
+            except StopIteration:
+                time.sleep(0.01)
+                return None
+
+        def execute(task):
+            release.wait(2.0)
+            executed.append((task.command, task.count))
+
+        pipeline = VoicePipeline(capture, lambda audio: audio, lambda text: text, execute,
+                                 actions=CommandScheduler())
+        pipeline.start()
+        time.sleep(0.2)
+        release.set()
+        deadline = time.monotonic() + 2.0
+        while sum(count for _, count in executed) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        pipeline.stop()
+
+        assert sum(count for command, count in executed if command == "next") == 3
+        assert executed[-1] == ("previous", 1)
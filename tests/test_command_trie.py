@@ -0,0 +1,85 @@
+"""
+Tests for the token trie behind partial matching and multi-command utterances
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.command_trie import CommandTrie
+from src.core.phrase_index import PhraseIndex
+from src.core.voice_detector import SmartVoiceDetector
+
+WAKE_WORDS = {
+    "next": {"phrases": ["next slide", "nèxt slide"], "weight": 10, "description": "Next"},
+    "stop": {"phrases": ["stop", "stop program"], "weight": 15, "description": "Stop"},
+    "close_slideshow": {"phrases": ["stop slide show"], "weight": 18, "description": "Close"},
+}
+
+
+@pytest.fixture
+def trie() -> CommandTrie:
+    return CommandTrie(PhraseIndex(WAKE_WORDS))
+
+
+@pytest.fixture(scope="module")
+def detector() -> SmartVoiceDetector:
+    return SmartVoiceDetector()
+
+
+class TestCommandTrie:
+    """Walking the trie one word at a time"""
+
+    def test_diacritic_variants_share_a_path(self, trie: CommandTrie) -> None:
+        node = trie.root.children["next"].children["slide"]
+        assert len(node.terminals) == 2
+
+    def test_walker_reports_completed_phrases(self, trie: CommandTrie) -> None:
+        walker = trie.walker()
+        assert walker.push("please") == []
+        assert walker.push("next") == []
+        assert [pid for _, _, pid in walker.push("slide")] == [0, 1]
+        assert walker.matches[0][:2] == (1, 3)
+
+    def test_frontier_only_holds_live_prefixes(self, trie: CommandTrie) -> None:
+        walker = trie.walker()
+        for word in "stop slide".split():
+            walker.push(word)
+        assert [node.depth for _, node in walker.frontier] == [2]
+
+    def test_extending_commands(self, trie: CommandTrie) -> None:
+        walker = trie.walker()
+        walker.push("stop")
+        assert walker.extending_commands() == {"stop", "close_slideshow"}
+        assert walker.extending_commands("sl") == {"close_slideshow"}
+        assert walker.extending_commands("program") == set()
+
+    def test_segment_leftmost_longest(self, trie: CommandTrie) -> None:
+        assert [m["command"] for m in trie.segment("next slide next slide")] == ["next", "next"]
+        assert [m["command"] for m in trie.segment("stop slide show")] == ["close_slideshow"]
+        assert trie.segment("stop slide show")[0]["score"] == 18 + PhraseIndex.EXACT_BONUS
+        assert trie.segment("the quarterly numbers") == []
+
+
+class TestDetectorIntegration:
+    """The detector uses the trie for partials and multi-command utterances"""
+
+    def test_repeated_command_becomes_a_sequence(self, detector: SmartVoiceDetector) -> None:
+        detector.last_execution_time = float("-inf")
+        result = detector.detect("next slide next slide")
+        assert result["command"] == "next"
+        assert [step["command"] for step in result["sequence"]] == ["next", "next"]
+
+    def test_single_command_has_no_sequence(self, detector: SmartVoiceDetector) -> None:
+        detector.last_execution_time = float("-inf")
+        assert "sequence" not in detector.detect("next slide")
+
+    def test_partial_walk_is_reused_and_revised(self, detector: SmartVoiceDetector) -> None:
+        assert detector.match_partial("so the next") is None
+        assert detector.match_partial("so the next slide")["command"] == "next"
+        assert detector._partial_walker.tokens == ["so", "the", "next"]
+        assert detector.match_partial("stop") is None
+        assert detector._partial_walker.tokens == []
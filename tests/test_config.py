@@ -86,6 +86,14 @@ class TestConfigModification(unittest.TestCase):
         self.config.set("new_section.new_key", "new_value")
         self.assertEqual(self.config.get("new_section.new_key"), "new_value")
     
+    def test_copy_with_overrides(self):
+        """Test that a copy can be changed without touching the original"""
+        clone = self.config.copy({"voice.phrase_model": "phonetic"})
+        self.assertEqual(clone.get("voice.phrase_model"), "phonetic")
+        self.assertEqual(self.config.get("voice.phrase_model"), "automaton")
+        clone.set("voice.listen_timeout", 42)
+        self.assertNotEqual(self.config.get("voice.listen_timeout"), 42)
+    
     def test_save_configuration(self):
         """Test saving configuration to file"""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -0,0 +1,91 @@
+"""
+Tests for the streaming spectral-gate denoiser
+"""
+
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.denoise import SpectralGate
+from src.core.voice_recognizer import HybridVoiceRecognizer
+
+RATE = 16000
+
+
+def noise(samples: int, amplitude: float = 200, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(0, amplitude, samples)
+
+
+def as_pcm(signal: np.ndarray) -> bytes:
+    return np.clip(signal, -32768, 32767).astype(np.int16).tobytes()
+
+
+def as_array(pcm: bytes) -> np.ndarray:
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float64)
+
+
+class TestSpectralGate:
+    """Streaming overlap-add spectral gating"""
+
+    def test_passthrough_without_profile(self) -> None:
+        gate = SpectralGate(RATE)
+        chunk = as_pcm(noise(1024))
+        assert gate.process(chunk) == chunk
+
+    def test_reconstruction_is_exact_when_nothing_is_removed(self) -> None:
+        gate = SpectralGate(RATE, prop_decrease=0.0)
+        gate.learn_noise(as_pcm(noise(RATE // 2)))
+        signal = as_pcm(noise(RATE, amplitude=3000, seed=1))
+        output = as_array(gate.process(signal))
+        # One hop of latency, otherwise identical up to int16 truncation
+        expected = as_array(signal)[:len(output) - gate.hop]
+        assert np.abs(output[gate.hop:] - expected).max() <= 1
+
+    def test_chunked_equals_single_pass(self) -> None:
+        signal = as_pcm(noise(RATE, amplitude=1000, seed=2))
+        profile = as_pcm(noise(RATE // 2))
+
+        whole = SpectralGate(RATE, adapt_rate=0.0)
+        whole.learn_noise(profile)
+        single = whole.process(signal)
+
+        streamed = SpectralGate(RATE, adapt_rate=0.0)
+        streamed.learn_noise(profile)
+        chunks = b"".join(streamed.process(signal[i:i + 700]) for i in range(0, len(signal), 700))
+        assert chunks == single
+
+    def test_noise_attenuated_tone_kept(self) -> None:
+        gate = SpectralGate(RATE)
+        gate.learn_noise(as_pcm(noise(RATE // 2, seed=3)))
+
+        background = noise(RATE, seed=4)
+        quiet = as_array(gate.process(as_pcm(background)))
+        assert np.std(quiet[RATE // 4:]) < 0.5 * np.std(background)
+
+        t = np.arange(RATE) / RATE
+        tone = 4000 * np.sin(2 * np.pi * 300 * t)
+        kept = as_array(gate.process(as_pcm(tone + noise(RATE, seed=5))))
+        assert abs(np.std(kept[RATE // 4:]) - np.std(tone)) < 0.1 * np.std(tone)
+
+
+class TestNoiseReductionSetting:
+    """Applying the denoise setting keeps the calibrated energy threshold"""
+
+    def test_apply_keeps_calibration(self) -> None:
+        recognizer = HybridVoiceRecognizer(debug_mode=False)
+        recognizer.recognizer.energy_threshold = 1234  # As left by adjust_for_ambient_noise
+        recognizer._apply_noise_reduction()
+        assert recognizer.recognizer.energy_threshold == 1234
+        assert recognizer.recognizer.dynamic_energy_threshold is True
+
+    def test_toggle_sets_thresholds(self) -> None:
+        recognizer = HybridVoiceRecognizer(debug_mode=False)
+        recognizer.toggle_noise_reduction()
+        assert recognizer.noise_reduction_enabled
+        assert recognizer.recognizer.energy_threshold == 400
+        recognizer.toggle_noise_reduction()
+        assert recognizer.recognizer.energy_threshold == 300
+        assert recognizer.recognizer.dynamic_energy_threshold is False
@@ -0,0 +1,68 @@
+"""
+Tests for the batched fuzzy scoring engine
+"""
+
+import pytest
+import random
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import fuzzy_scorer
+from src.core.fuzzy_scorer import BatchFuzzyScorer, indel_ratio, _lcs_length
+
+
+def reference_scores(text, phrases, cutoff):
+    hits = []
+    for pid, phrase in enumerate(phrases):
+        similarity = indel_ratio(_lcs_length(text, phrase), len(text) + len(phrase))
+        if similarity >= cutoff:
+            hits.append((pid, similarity))
+    return sorted(hits, key=lambda hit: (-hit[1], hit[0]))
+
+
+def backends():
+    names = ["python"]
+    if fuzzy_scorer.NUMPY_AVAILABLE:
+        names.append("numpy")
+        if fuzzy_scorer.RAPIDFUZZ_AVAILABLE:
+            names.append("rapidfuzz")
+    return names
+
+
+class TestBatchFuzzyScorer:
+    """Every backend must agree with fuzz.ratio semantics"""
+
+    @pytest.fixture
+    def phrases(self):
+        rnd = random.Random(3)
+        alphabet = "aeiklnoprstx é"
+        table = ["".join(rnd.choice(alphabet) for _ in range(rnd.randint(2, 18))) for _ in range(400)]
+        return table + ["next slide", "next slid", "nex slide", "x" * 80]
+
+    @pytest.mark.parametrize("backend", backends())
+    @pytest.mark.parametrize("cutoff", [0, 70, 85])
+    def test_backend_matches_reference(self, phrases, backend: str, cutoff: int) -> None:
+        scorer = BatchFuzzyScorer(phrases, backend=backend)
+        for text in ["next slide", "nekst slaid", "stop", "x" * 79]:
+            assert scorer.score(text, cutoff=cutoff) == reference_scores(text, phrases, cutoff)
+
+    def test_matches_fuzzywuzzy(self) -> None:
+        fuzz = pytest.importorskip("fuzzywuzzy.fuzz")
+        pytest.importorskip("Levenshtein")
+        for a, b in [("next slide", "next slid"), ("open slide show", "opn slaid sho"), ("abc", "xyz")]:
+            assert indel_ratio(_lcs_length(a, b), len(a) + len(b)) == fuzz.ratio(a, b)
+
+    def test_length_window_prunes(self) -> None:
+        scorer = BatchFuzzyScorer(["ab", "next slide", "a much longer phrase than needed"])
+        lo, hi = scorer.length_window(len("next slide"), 85)
+        assert scorer._sorted_phrases[lo:hi] == ["next slide"]
+
+    def test_top_k_and_exclude(self) -> None:
+        scorer = BatchFuzzyScorer(["next slide", "next slid", "nex slide"], backend="python")
+        hits = scorer.score("next slide", cutoff=80)
+        assert hits[0] == (0, 100)
+        assert scorer.score("next slide", cutoff=80, top_k=1) == [(0, 100)]
+        assert all(pid != 0 for pid, _ in scorer.score("next slide", cutoff=80, exclude={0}))
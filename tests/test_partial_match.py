@@ -0,0 +1,39 @@
+"""
+Tests for acting on partial (streaming) transcripts
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.voice_detector import SmartVoiceDetector
+
+
+@pytest.fixture(scope="module")
+def detector() -> SmartVoiceDetector:
+    return SmartVoiceDetector()
+
+
+class TestMatchPartial:
+    """Partials are accepted only once no other command can still grow out of them"""
+
+    @pytest.mark.parametrize("text,command", [
+        ("next slide", "next"),
+        ("please next slide", "next"),
+        ("stop program", "stop"),
+        ("close slide show", "close_slideshow"),
+    ])
+    def test_unambiguous_partial(self, detector: SmartVoiceDetector, text: str, command: str) -> None:
+        assert detector.match_partial(text)["command"] == command
+
+    @pytest.mark.parametrize("text", ["stop", "next", "help"])
+    def test_ambiguous_partial_waits(self, detector: SmartVoiceDetector, text: str) -> None:
+        assert detector.match_partial(text) is None
+
+    def test_evaluate_has_no_side_effects(self, detector: SmartVoiceDetector) -> None:
+        before = detector.last_execution_time
+        assert detector.evaluate("next slide")["command"] == "next"
+        assert detector.last_execution_time == before
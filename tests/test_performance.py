@@ -3,6 +3,7 @@ Performance Tests for SlideSense Application
 Benchmark critical functions and identify optimization opportunities
 """
 
+import json
 import pytest
 import time
 from typing import Dict, Any
@@ -17,6 +18,10 @@ from src.utils.helpers import (
     validate_confidence, format_confidence, sanitize_text,
     group_by_key, flatten_dict, safe_read_file, safe_write_file
 )
+from src.infrastructure.profiler import (
+    PerformanceProfiler, CacheOptimizer, OptimizationAnalyzer,
+    measure_time, check_performance_target
+)
 
 
 class TestPerformanceProfiler:
@@ -338,5 +343,56 @@ class TestMeasureTimeContext:
         assert "ms" in captured.out
 
 
+class TestProfilerCapture:
+    """Outlier rejection, cProfile/tracemalloc capture and live instrumentation"""
+    
+    def test_outliers_are_rejected(self) -> None:
+        """A single slow call does not move the mean"""
+        calls = {"n": 0}
+        
+        def spiky() -> None:
+            calls["n"] += 1
+            if calls["n"] == 50:
+                time.sleep(0.05)
+        
+        profiler = PerformanceProfiler(warmup=0)
+        result = profiler.benchmark(spiky, iterations=100, warmup=0)
+        assert result.outliers >= 1
+        assert result.avg_time < 0.001
+        assert result.max_time < 0.05
+    
+    def test_cpu_profile_and_memory(self) -> None:
+        """Optional cProfile report and tracemalloc peak"""
+        def allocate() -> list:
+            return [bytes(1000) for _ in range(100)]
+        
+        profiler = PerformanceProfiler()
+        result = profiler.benchmark(allocate, iterations=20, cpu_profile=True, trace_memory=True)
+        assert "allocate" in result.cpu_profile
+        assert result.peak_memory >= 100 * 1000
+    
+    def test_instrument_times_real_calls(self, tmp_path: Path) -> None:
+        """Wrapped methods keep working and report their call timings"""
+        class Detector:
+            def detect(self, text: str) -> str:
+                return text.upper()
+        
+        detector = Detector()
+        profiler = PerformanceProfiler()
+        profiler.instrument(detector, "detect")
+        with profiler.session(cpu=True, memory=False):
+            for _ in range(5):
+                assert detector.detect("next") == "NEXT"
+        
+        live = profiler.live_results()
+        assert live["Detector.detect"].iterations == 5
+        assert "Detector.detect" in profiler.report()
+        
+        path = profiler.save(tmp_path / "profile.json")
+        assert path.with_suffix(".prof").exists()
+        assert "Detector.detect" in path.read_text(encoding="utf-8")
+        assert "detect" in json.loads(path.read_text(encoding="utf-8"))["cpu_profile"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
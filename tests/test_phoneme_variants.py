@@ -0,0 +1,81 @@
+"""
+Tests for cached phoneme-variant expansion
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.phoneme_variants import PhonemeVariants
+
+
+@pytest.fixture
+def variant_cache(tmp_path, monkeypatch):
+    """Isolated cache file and clean counters for each test"""
+    monkeypatch.setattr(PhonemeVariants, "CACHE_FILE", tmp_path / "phoneme_variants.json")
+    PhonemeVariants.clear_cache()
+    yield PhonemeVariants
+    PhonemeVariants.clear_cache()
+
+
+class TestVariantCache:
+    """Memoization, disk persistence and statistics"""
+
+    def test_expand_is_memoized(self, variant_cache) -> None:
+        first = variant_cache.expand("next slide")
+        second = variant_cache.expand("next slide")
+
+        assert first is second
+        assert first == sorted(set(first))
+        stats = variant_cache.get_stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["hit_rate"] == 50.0
+
+    def test_duplicates_are_counted(self, variant_cache) -> None:
+        variants = variant_cache.expand("stop program")
+        stats = variant_cache.get_stats()
+
+        assert stats["variants_generated"] - stats["duplicates_collapsed"] == len(variants)
+        assert stats["duplicates_collapsed"] > 0
+
+    def test_disk_cache_round_trip(self, variant_cache) -> None:
+        expected = variant_cache.expand("back slide")
+        assert variant_cache.save_cache() is True
+        assert variant_cache.CACHE_FILE.exists()
+
+        variant_cache.clear_cache()
+        assert variant_cache.expand("back slide") == expected
+        assert variant_cache.get_stats()["disk_hits"] == 1
+
+    def test_table_change_invalidates_cache(self, variant_cache, monkeypatch) -> None:
+        variant_cache.expand("help menu")
+        variant_cache.save_cache()
+        variant_cache.clear_cache()
+
+        tables = dict(PhonemeVariants.WORD_SUBSTITUTIONS, help=["help", "halp"])
+        monkeypatch.setattr(PhonemeVariants, "WORD_SUBSTITUTIONS", tables)
+
+        assert "halp menu" in variant_cache.expand("help menu")
+        assert variant_cache.get_stats()["disk_hits"] == 0
+
+    def test_hits_do_not_rehash_tables(self, variant_cache, monkeypatch) -> None:
+        variant_cache.expand("next slide")
+        hashes = []
+        table_hash = PhonemeVariants.table_hash
+        monkeypatch.setattr(PhonemeVariants, "table_hash", staticmethod(lambda: hashes.append(1) or table_hash()))
+        variant_cache.expand("next slide")
+        variant_cache.expand("back slide")
+        assert hashes == []
+
+        monkeypatch.setattr(PhonemeVariants, "WORD_SUBSTITUTIONS", dict(PhonemeVariants.WORD_SUBSTITUTIONS))
+        variant_cache.expand("next slide")
+        assert hashes == [1]
+
+    def test_regional_variants_returns_copy(self, variant_cache) -> None:
+        variants = variant_cache.add_regional_variants("next slide")
+        variants.append("mutated")
+        assert "mutated" not in variant_cache.expand("next slide")
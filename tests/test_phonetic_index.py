@@ -0,0 +1,129 @@
+"""
+Tests for phonetic-key retrieval of wake-word tokens
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.phonetic_index import PhoneticIndex, consonant_skeleton, indonesian_spelling, phonetic_keys
+from src.core.phoneme_variants import PhonemeVariants
+from src.core.voice_detector import SmartVoiceDetector
+from src.infrastructure.config import get_config
+
+PHRASES = ["next slide", "back slide", "stop program", "open slide show", "help menu", "mulai presentasi"]
+
+
+@pytest.fixture
+def index() -> PhoneticIndex:
+    return PhoneticIndex(PHRASES, aliases={"next": ["teks"], "unrelated": ["foo"]})
+
+
+@pytest.fixture(scope="module")
+def detector() -> SmartVoiceDetector:
+    return SmartVoiceDetector(config=get_config().copy({"voice.phrase_model": "phonetic"}))
+
+
+class TestPhoneticKeys:
+    """Indonesian-tuned spelling and keys"""
+
+    def test_spelling_rules(self) -> None:
+        assert indonesian_spelling("necks") == indonesian_spelling("neks")
+        assert indonesian_spelling("nèxt") == indonesian_spelling("next")
+
+    def test_skeleton_merges_final_devoicing(self) -> None:
+        assert consonant_skeleton("slaid") == consonant_skeleton("slait") == "slt"
+        assert consonant_skeleton("stob") == consonant_skeleton("stop")
+
+    def test_prothetic_vowel_shares_a_key(self) -> None:
+        assert phonetic_keys("estop") & phonetic_keys("stop")
+        assert phonetic_keys("setop") & phonetic_keys("stop")
+
+
+class TestPhoneticIndex:
+    """Hash lookup first, edit similarity only on the candidates"""
+
+    @pytest.mark.parametrize("word,token", [
+        ("neks", "next"),
+        ("slaid", "slide"),
+        ("estop", "stop"),
+        ("programm", "program"),
+        ("presentas", "presentasi"),
+        ("teks", "next"),
+    ])
+    def test_resolves_accented_words(self, index: PhoneticIndex, word: str, token: str) -> None:
+        assert index.resolve(word)[0] == token
+
+    @pytest.mark.parametrize("word", ["the", "revenue", "quarterly", "kita"])
+    def test_leaves_other_words_alone(self, index: PhoneticIndex, word: str) -> None:
+        assert index.resolve(word) is None
+
+    def test_candidates_are_few(self, index: PhoneticIndex) -> None:
+        assert 0 < len(index.candidates("slaid")) < len(index.vocabulary)
+
+    def test_canonicalize_and_memo(self, index: PhoneticIndex) -> None:
+        assert index.canonicalize("please neks slaid") == "please next slide"
+        comparisons = index.comparisons
+        index.canonicalize("neks slaid")
+        assert index.comparisons == comparisons
+
+    def test_aliases_only_for_known_tokens(self, index: PhoneticIndex) -> None:
+        assert index.resolve("foo") is None
+
+    def test_dictionary_words_are_kept(self) -> None:
+        index = PhoneticIndex(["helmmu", "open slide"], dictionary={"hello", "slides"})
+        assert index.resolve("hello") is None
+        assert index.resolve("slides") is None
+        assert index.resolve("opin") == ("open", 1.0)
+
+    def test_edit_ratio_floor(self) -> None:
+        strict = PhoneticIndex(PHRASES, min_edit_ratio=1.0)
+        assert strict.resolve("stob") is None
+        assert strict.resolve("nekst") == ("next", 1.0)
+
+
+class TestPhoneticPhraseModel:
+    """voice.phrase_model = "phonetic" keeps only hand-written phrases"""
+
+    def test_phrase_table_is_small(self, detector: SmartVoiceDetector) -> None:
+        assert detector.generated_variants == {"slide"}  # Swallowed-word form of "slide next"
+        assert detector.phonetic_index is not None
+        assert len(detector.phrase_index) < 200
+
+    @pytest.mark.parametrize("text,command", [
+        ("neks slaid", "next"),
+        ("bek slait", "previous"),
+        ("estop program", "stop"),
+        ("nekst slaid nekst slaid", "next"),
+    ])
+    def test_detects_accented_commands(self, detector: SmartVoiceDetector, text: str, command: str) -> None:
+        match = detector.evaluate(text)
+        assert match["command"] == command
+        assert match["score"] >= detector.MIN_SCORE
+
+    @pytest.mark.parametrize("text", [
+        "hello world", "one hello", "opin hello", "the quarterly numbers", "kita lihat tabel berikut",
+    ])
+    def test_distractors_do_not_trigger(self, detector: SmartVoiceDetector, text: str) -> None:
+        match = detector.evaluate(text)
+        assert match is None or match["score"] < detector.MIN_SCORE
+
+    @pytest.mark.parametrize("text,command", [
+        ("language hello", "change_language"),
+        ("slide", "next"),
+        ("slide please", "next"),
+    ])
+    def test_matches_variants_model(self, detector: SmartVoiceDetector, text: str, command: str) -> None:
+        assert detector.evaluate(text)["command"] == command
+
+    def test_partial_uses_canonical_words(self, detector: SmartVoiceDetector) -> None:
+        assert detector.match_partial("neks slaid")["command"] == "next"
+
+    def test_variants_model_unchanged(self) -> None:
+        variants = SmartVoiceDetector(config=get_config().copy({"voice.phrase_model": "variants"}))
+        assert variants.phonetic_index is None
+        assert "neks slaid" in variants.wake_words["next"]["phrases"]
+        assert PhonemeVariants.expand("next slide")
@@ -0,0 +1,111 @@
+"""
+Tests for the compiled phrase index used by SmartVoiceDetector
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.phrase_index import PhraseIndex, SubstringAutomaton
+
+
+WAKE_WORDS = {
+    "next": {"phrases": ["next slide", "slide next", "neks slaid"], "weight": 10, "description": "Slide maju"},
+    "previous": {"phrases": ["back slide", "slide back", "bak slaid"], "weight": 10, "description": "Slide mundur"},
+    "open_slideshow": {"phrases": ["open slide show", "f5"], "weight": 18, "description": "Buka slideshow (F5)"},
+    "stop": {"phrases": ["stop program", "stop"], "weight": 15, "description": "Stop program"},
+}
+
+
+def linear_scan(wake_words, text):
+    """Reference implementation: the detector's original per-phrase loop"""
+    results = []
+    for command, data in wake_words.items():
+        for phrase in data["phrases"]:
+            score = 0
+            if phrase == text:
+                score = data["weight"] + 20
+            elif phrase in text:
+                score = data["weight"] + 10
+            else:
+                phrase_words = phrase.split()
+                text_words = text.split()
+                matching = [w for w in phrase_words if w in text_words]
+                if len(matching) >= 2:
+                    score = data["weight"] + len(matching) * 3
+                elif len(matching) == 1 and len(phrase_words) <= 2:
+                    score = data["weight"] + 1
+            if score > 0:
+                results.append((command, phrase, score))
+
+    def sort_key(result):
+        phrase_words = set(result[1].split())
+        quality = len(phrase_words & set(text.split())) / max(len(phrase_words), 1)
+        return (-result[2], -quality, -len(result[1].split()))
+
+    results.sort(key=sort_key)
+    return results[0] if results else None
+
+
+class TestSubstringAutomaton:
+    """Aho-Corasick substring search"""
+
+    def test_finds_all_occurrences(self) -> None:
+        automaton = SubstringAutomaton(["slide", "lid", "show", "how", "xyz"])
+        assert automaton.search("open slide show") == {0, 1, 2, 3}
+
+    def test_no_match(self) -> None:
+        automaton = SubstringAutomaton(["next", "back"])
+        assert automaton.search("hello world") == set()
+
+
+class TestPhraseIndex:
+    """Compiled index must agree with the original linear scan"""
+
+    @pytest.mark.parametrize("text", [
+        "next slide", "please next slide now", "slide", "bak slaid",
+        "open slide", "stop", "stop the program", "f5 please",
+        "slide back slide", "nothing relevant", "show open slide",
+    ])
+    def test_matches_linear_scan(self, text: str) -> None:
+        index = PhraseIndex(WAKE_WORDS)
+        best = index.best(index.score(text))
+        expected = linear_scan(WAKE_WORDS, text)
+
+        if expected is None:
+            assert best is None
+        else:
+            assert (best["command"], best["phrase"], best["score"]) == expected
+
+    def test_result_shape(self) -> None:
+        index = PhraseIndex(WAKE_WORDS)
+        best = index.best(index.score("next slide"))
+        assert best == {
+            "command": "next",
+            "phrase": "next slide",
+            "score": 30,
+            "max_score": 30,
+            "description": "Slide maju",
+        }
+
+    def test_only_candidates_are_scored(self) -> None:
+        index = PhraseIndex(WAKE_WORDS)
+        scores = index.score("stop")
+        assert {index.commands[pid] for pid in scores} == {"stop"}
+
+    def test_stale_after_phrases_added(self) -> None:
+        wake_words = {k: dict(v, phrases=list(v["phrases"])) for k, v in WAKE_WORDS.items()}
+        index = PhraseIndex(wake_words)
+        assert not index.is_stale(wake_words)
+
+        wake_words["next"]["phrases"].append("nex slet")
+        assert index.is_stale(wake_words)
+
+    def test_extending_commands(self) -> None:
+        index = PhraseIndex(WAKE_WORDS)
+        assert index.extending_commands("stop") == {"stop"}
+        assert index.extending_commands("slide") == {"next", "previous"}
+        assert index.extending_commands("open slide show") == set()
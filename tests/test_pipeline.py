@@ -0,0 +1,137 @@
+"""
+Tests for the threaded capture / recognize / detect / execute pipeline
+"""
+
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.pipeline import RingBuffer, VoicePipeline
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestRingBuffer:
+    """Non-blocking producer side"""
+
+    def test_fifo(self) -> None:
+        ring = RingBuffer(4)
+        for item in range(3):
+            ring.put(item)
+        assert [ring.get(0) for _ in range(3)] == [0, 1, 2]
+
+    def test_overwrites_oldest_when_full(self) -> None:
+        ring = RingBuffer(2)
+        for item in range(5):
+            ring.put(item)
+        assert ring.overruns == 3
+        assert [ring.get(0), ring.get(0)] == [3, 4]
+
+    def test_get_times_out(self) -> None:
+        ring = RingBuffer(2)
+        try:
+            ring.get(0.01)
+            assert False, "expected queue.Empty"
+        except queue.Empty:
+            pass
+
+
+class TestVoicePipeline:
+    """End-to-end flow with stand-in stages"""
+
+    def test_capture_continues_while_execution_is_slow(self) -> None:
+        utterances = iter(["next slide", "back slide", "stop program"])
+        release = threading.Event()
+        executed = []
+
+        def capture():
+            try:
+                return next(utterances)
+            except StopIteration:
+                time.sleep(0.01)
+                return None
+
+        def execute(action):
+            release.wait(2)
+            executed.append(action)
+
+        pipeline = VoicePipeline(capture, str.upper, lambda text: text.split()[0], execute)
+        pipeline.start()
+        try:
+            # All three utterances are captured while the first execution blocks
+            assert wait_until(lambda: pipeline.capture_stats.processed == 3)
+            release.set()
+            assert wait_until(lambda: len(executed) == 3)
+        finally:
+            pipeline.stop()
+
+        assert executed == ["NEXT", "BACK", "STOP"]
+        stats = pipeline.stats()
+        assert set(stats) == {"capture", "recognize", "detect", "execute"}
+        assert stats["recognize"]["processed"] == 3
+        assert stats["execute"]["max_ms"] > 0
+
+    def test_none_results_are_not_forwarded(self) -> None:
+        utterances = iter(["", "next"])
+        executed = []
+
+        def capture():
+            try:
+                return next(utterances)
+            except StopIteration:
+                time.sleep(0.01)
+                return None
+
+        pipeline = VoicePipeline(capture, lambda audio: audio or None, str.strip, executed.append)
+        pipeline.start()
+        try:
+            assert wait_until(lambda: executed == ["next"])
+        finally:
+            pipeline.stop()
+        assert pipeline.stats()["detect"]["processed"] == 1
+
+    def test_stop_waits_for_a_capture_in_progress(self) -> None:
+        capturing = threading.Event()
+
+        def capture():
+            capturing.set()
+            time.sleep(0.3)  # A listen() that outlasts the default join
+            return None
+
+        pipeline = VoicePipeline(capture, str.upper, str.strip, lambda action: None, capture_timeout=2.0)
+        pipeline.start()
+        assert capturing.wait(1)
+        pipeline.stop(timeout=0.05)
+        assert not pipeline._capture_thread.is_alive()
+
+    def test_pause_discards_utterances(self) -> None:
+        heard = []
+        executed = []
+
+        def capture():
+            time.sleep(0.01)
+            return "next" if heard else None
+
+        pipeline = VoicePipeline(capture, str.upper, str.strip, executed.append)
+        pipeline.start()
+        try:
+            pipeline.pause()
+            heard.append(True)
+            time.sleep(0.1)
+            assert executed == [] and pipeline.ring.qsize() == 0
+            pipeline.resume()
+            assert wait_until(lambda: executed)
+        finally:
+            pipeline.stop()
@@ -0,0 +1,95 @@
+"""
+Tests for the weighted pronunciation model that replaces expanded phrase variants
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.phoneme_variants import PhonemeVariants
+from src.core.phrase_index import PhraseIndex
+from src.core.pronunciation_model import PronunciationModel
+from src.core.voice_detector import SmartVoiceDetector
+from src.infrastructure.config import get_config
+
+PHRASES = ["next slide", "back slide", "mundur slide", "slide lanjut"]
+
+
+@pytest.fixture(scope="module")
+def model() -> PronunciationModel:
+    index = PhraseIndex({
+        "next": {"phrases": ["next slide", "slide lanjut"], "weight": 10, "description": "Next"},
+        "previous": {"phrases": ["back slide", "mundur slide"], "weight": 10, "description": "Previous"},
+    })
+    return PronunciationModel(index, PHRASES)
+
+
+@pytest.fixture(scope="module")
+def detectors():
+    return SmartVoiceDetector(), SmartVoiceDetector(config=get_config().copy({"voice.phrase_model": "variants"}))
+
+
+class TestPronunciationModel:
+    """Per-word weighted arcs instead of stored phrase variants"""
+
+    def test_spelling_costs(self, model: PronunciationModel) -> None:
+        arcs = model.spellings("next")
+        assert arcs["next"] == 0
+        assert arcs["neks"] == PronunciationModel.SUBSTITUTION_COST
+        assert arcs["niks"] == PronunciationModel.SUBSTITUTION_COST + PronunciationModel.REGIONAL_COST
+
+    def test_final_consonant_drop_only_for_last_word(self, model: PronunciationModel) -> None:
+        assert model.lookup("lanju") == {"lanjut": (PronunciationModel.REGIONAL_COST, True)}
+        assert [match[:2] for match in model.matches("slide lanju")] == [(0, 2)]
+        assert model.matches("lanju slide") == []
+
+    @pytest.mark.parametrize("phrase", PHRASES)
+    def test_accepts_every_expanded_variant(self, model: PronunciationModel, phrase: str) -> None:
+        for variant in PhonemeVariants.expand(phrase):
+            if variant:
+                assert model.score(variant), variant
+
+    def test_matches_are_token_aligned(self, model: PronunciationModel) -> None:
+        spans = {(start, end) for start, end, _, _ in model.matches("please neks slaid now")}
+        assert spans == {(1, 3)}
+        assert model.matches("slides") == []
+
+    def test_canonicalize(self, model: PronunciationModel) -> None:
+        assert model.canonicalize("please neks slaid") == "please next slide"
+        assert model.canonicalize("the revenue") == "the revenue"
+
+    def test_stays_small(self, model: PronunciationModel) -> None:
+        stats = model.stats()
+        assert stats["phrases"] == len(PHRASES)
+        assert stats["arcs"] < sum(len(PhonemeVariants.expand(phrase)) for phrase in PHRASES)
+
+
+class TestAutomatonPhraseModel:
+    """voice.phrase_model = "automaton" (default) keeps only hand-written phrases"""
+
+    def test_default_model_is_small(self, detectors) -> None:
+        automaton, variants = detectors
+        assert automaton.phrase_model == "automaton"
+        assert automaton.pronunciation_model is not None
+        assert len(automaton.phrase_index) < len(variants.phrase_index) / 5
+
+    @pytest.mark.parametrize("text", [
+        "neks slaid", "nekst slide", "bek slait", "please nex slide now",
+        "slide mundur", "lanjut slaid", "the revenue grew", "stop program",
+    ])
+    def test_same_result_as_variants(self, detectors, text: str) -> None:
+        automaton, variants = detectors
+        expected = variants.evaluate(text)
+        result = automaton.evaluate(text)
+        if expected is None:
+            assert result is None
+        else:
+            assert result["command"] == expected["command"]
+            assert result["score"] == pytest.approx(expected["score"])
+
+    def test_partial_uses_canonical_words(self, detectors) -> None:
+        automaton, _ = detectors
+        assert automaton.match_partial("neks slaid")["command"] == "next"
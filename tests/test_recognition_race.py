@@ -0,0 +1,155 @@
+"""
+Tests for racing several recognizer backends on the same utterance
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+sr = pytest.importorskip("speech_recognition")
+
+from src.core.recognition_race import RecognitionRace, create_race
+from src.core.recognizer_backends import GoogleBackend, RecognizerBackend
+from src.infrastructure.exceptions import VoiceRecognitionError
+
+
+class ScriptedBackend(RecognizerBackend):
+    """Answers (or fails) after a delay, optionally held until released"""
+
+    def __init__(self, name: str, text=None, delay: float = 0.0, error=None, hold=None) -> None:
+        self.name = name
+        self.text = text
+        self.delay = delay
+        self.error = error
+        self.hold = hold
+        self.calls = 0
+
+    def recognize(self, audio):
+        self.calls += 1
+        if self.hold is not None:
+            self.hold.wait(5.0)
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.text
+
+
+def confident(text: str) -> bool:
+    return text in ("next slide", "back slide")
+
+
+class TestRecognitionRace:
+    """First confident transcript wins"""
+
+    def test_fast_confident_backend_wins(self) -> None:
+        race = RecognitionRace([
+            ScriptedBackend("slow", "next slide", delay=0.5),
+            ScriptedBackend("fast", "back slide"),
+        ], accept=confident)
+        start = time.perf_counter()
+        assert race.recognize("audio") == "back slide"
+        assert time.perf_counter() - start < 0.4
+        assert race.last_winner == "fast"
+        race.close()
+
+    def test_waits_past_unconfident_answers(self) -> None:
+        race = RecognitionRace([
+            ScriptedBackend("grammar", "next slide", delay=0.05),
+            ScriptedBackend("dictation", "nyxt sly"),
+        ], accept=confident)
+        assert race.recognize("audio") == "next slide"
+        assert race.stats()["grammar"]["wins"] == 1
+        race.close()
+
+    def test_falls_back_to_highest_priority_transcript(self) -> None:
+        race = RecognitionRace([
+            ScriptedBackend("first", "open the window", delay=0.05),
+            ScriptedBackend("second", "quarterly revenue"),
+        ], accept=confident)
+        assert race.recognize("audio") == "open the window"
+        stats = race.stats()["first"]
+        assert stats["fallbacks"] == 1 and stats["wins"] == 0 and stats["win_rate"] == 0.0
+        race.close()
+
+    def test_failures_surface_as_recognizer_errors(self) -> None:
+        unclear = RecognitionRace([
+            ScriptedBackend("a", error=sr.UnknownValueError()),
+            ScriptedBackend("b", error=sr.RequestError("offline")),
+        ])
+        with pytest.raises(sr.UnknownValueError):
+            unclear.recognize("audio")
+        unclear.close()
+
+        offline = RecognitionRace([ScriptedBackend("a", error=sr.RequestError("offline"))])
+        with pytest.raises(sr.RequestError):
+            offline.recognize("audio")
+        offline.close()
+
+    def test_timeout(self) -> None:
+        hold = threading.Event()
+        race = RecognitionRace([ScriptedBackend("stuck", "next slide", hold=hold)], timeout=0.1)
+        with pytest.raises(sr.RequestError):
+            race.recognize("audio")
+        hold.set()
+        race.close()
+
+    def test_busy_backend_is_skipped_not_queued(self) -> None:
+        hold = threading.Event()
+        stuck = ScriptedBackend("network", "next slide", hold=hold)
+        local = ScriptedBackend("local", "back slide")
+        race = RecognitionRace([stuck, local], accept=confident)
+        assert race.recognize("audio") == "back slide"
+        assert race.recognize("audio") == "back slide"
+        assert stuck.calls == 1
+        assert race.stats()["network"]["skipped"] == 1
+        hold.set()
+        race.close()
+
+    def test_stats(self) -> None:
+        race = RecognitionRace([ScriptedBackend("only", "next slide")], accept=confident)
+        for _ in range(3):
+            race.recognize("audio")
+        stats = race.stats()["only"]
+        assert stats["wins"] == 3 and stats["win_rate"] == 1.0
+        assert stats["latency_ms"]["count"] == 3
+        race.close()
+
+
+class TestCreateRace:
+    """Building a race from config names"""
+
+    def test_unavailable_backends_are_left_out(self, tmp_path: Path) -> None:
+        race = create_race(["vosk_grammar", "vosk", "google"], sr.Recognizer(),
+                           model_path=str(tmp_path / "missing"), grammar='["next slide"]')
+        assert [b.name for b in race.backends] == ["google"]
+        assert isinstance(race.backends[0], GoogleBackend)
+        race.close()
+
+    def test_unknown_name(self) -> None:
+        with pytest.raises(VoiceRecognitionError):
+            create_race(["whisper"], sr.Recognizer())
+
+    def test_nothing_available(self, tmp_path: Path) -> None:
+        with pytest.raises(VoiceRecognitionError):
+            create_race(["vosk"], sr.Recognizer(), model_path=str(tmp_path / "missing"))
+
+    def test_recognizer_passes_accept_to_existing_race(self) -> None:
+        # Test Microphone can build the race before start_voice_control sets accept
+        from src.core.voice_recognizer import HybridVoiceRecognizer
+        from src.infrastructure.config import get_config
+        voice = HybridVoiceRecognizer(config=get_config().copy({
+            "voice.backend": "race", "voice.race_backends": ["google"]}))
+        voice.backend = voice._create_backend()
+        voice.is_ready = True
+        assert isinstance(voice.backend, RecognitionRace) and voice.backend.accept is None
+        race = voice.backend
+        voice.accept_transcript = confident
+        assert voice._create_backend() is race and race.accept is confident
+        voice.use_command_grammar('["next slide"]')  # Rebuilt with the grammar, keeps accept
+        assert voice.backend is not race and voice.backend.accept is confident
+        voice.backend.close()
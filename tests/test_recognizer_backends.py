@@ -0,0 +1,79 @@
+"""
+Tests for the pluggable speech-to-text backends
+"""
+
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+sr = pytest.importorskip("speech_recognition")
+
+from src.core.recognizer_backends import GoogleBackend, VoskBackend, create_backend
+from src.infrastructure.exceptions import VoiceRecognitionError
+
+
+class RecordingRecognizer:
+    """Stands in for sr.Recognizer and records what the backend asked for"""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def recognize_google(self, audio, language=None):
+        self.calls.append((audio, language))
+        return "next slide"
+
+
+class TestCreateBackend:
+    """Backend selection by config name"""
+
+    def test_google(self) -> None:
+        recognizer = RecordingRecognizer()
+        backend = create_backend("google", recognizer, language="id-ID")
+        assert isinstance(backend, GoogleBackend)
+        assert backend.recognize("audio") == "next slide"
+        assert recognizer.calls == [("audio", "id-ID")]
+
+    def test_unknown_backend(self) -> None:
+        with pytest.raises(VoiceRecognitionError):
+            create_backend("whisper", RecordingRecognizer())
+
+    def test_vosk_missing_model(self, tmp_path: Path) -> None:
+        with pytest.raises(VoiceRecognitionError):
+            create_backend("vosk", RecordingRecognizer(), model_path=str(tmp_path / "missing"))
+
+    def test_vosk_reports_request_error(self, tmp_path: Path) -> None:
+        # Recognizer retry logic expects engine failures as sr.RequestError
+        with pytest.raises(sr.RequestError):
+            VoskBackend(model_path=str(tmp_path / "missing"))
+
+
+class FakeKaldi:
+    """Stands in for vosk.KaldiRecognizer"""
+
+    def AcceptWaveform(self, pcm) -> None:
+        self.pcm = pcm
+
+    def FinalResult(self) -> str:
+        return '{"text": "next slide"}'
+
+
+class TestVoskBackend:
+    """Decoder lifecycle without loading a model"""
+
+    def test_recognize_after_close(self, monkeypatch) -> None:
+        monkeypatch.setattr(VoskBackend, "_create_recognizer", lambda self: FakeKaldi())
+        backend = VoskBackend.__new__(VoskBackend)
+        backend.sample_rate = 16000
+        backend.grammar = None
+        backend._lock = threading.Lock()
+        backend._recognizer = FakeKaldi()
+        audio = sr.AudioData(b"\x00\x00" * 160, 16000, 2)
+
+        backend.close()
+        assert backend._recognizer is None
+        assert backend.recognize(audio) == "next slide"
+        assert isinstance(backend._recognizer, FakeKaldi)
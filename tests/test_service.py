@@ -0,0 +1,162 @@
+"""
+Tests for the shared detection service (NDJSON + HTTP over TCP / Unix socket)
+"""
+
+import asyncio
+import json
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.command_scheduler import CommandPolicy
+from src.infrastructure import unrecognized_store
+from src.infrastructure.exceptions import ServiceError
+from src.service import protocol
+from src.service.client import DetectionClient
+from src.service.server import DetectionServer
+
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    """In-process server (workers=0) on an ephemeral port and a Unix socket"""
+    tmp = tmp_path_factory.mktemp("service")
+    previous_store = unrecognized_store._store
+    unrecognized_store._store = unrecognized_store.UnrecognizedStore(path=tmp / "unrecognized.jsonl")
+
+    loop = asyncio.new_event_loop()
+    server = DetectionServer(workers=0, policies={"open_slideshow": CommandPolicy(debounce=60.0)})
+    unix_path = str(tmp / "detect.sock") if hasattr(socket, "AF_UNIX") else None
+    loop.run_until_complete(server.start(unix_path=unix_path, port=0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield server
+
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(timeout=10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+    unrecognized_store._store.close()
+    unrecognized_store._store = previous_store
+
+
+def _http(port: int, request: bytes) -> tuple:
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(request)
+        data = b""
+        while b"\r\n\r\n" not in data:
+            data += sock.recv(65536)
+        head, _, body = data.partition(b"\r\n\r\n")
+        length = int([line.split(b":")[1] for line in head.split(b"\r\n") if line.lower().startswith(b"content-length")][0])
+        while len(body) < length:
+            body += sock.recv(65536)
+    return int(head.split()[1]), json.loads(body)
+
+
+class TestProtocol:
+    """Wire format helpers"""
+
+    def test_round_trip(self) -> None:
+        line = protocol.encode({"op": "detect", "text": "next slide"})
+        assert line.endswith(b"\n") and b"\n" not in line[:-1]
+        assert protocol.decode(line) == {"op": "detect", "text": "next slide"}
+
+    def test_decode_rejects_non_objects(self) -> None:
+        with pytest.raises(ValueError):
+            protocol.decode(b"[1, 2]")
+
+    def test_audio_round_trip(self) -> None:
+        pcm = bytes(range(256))
+        assert protocol.decode_audio(protocol.encode_audio(pcm)) == pcm
+
+
+class TestDetectionService:
+    """End-to-end requests against a running server"""
+
+    def test_ping(self, service) -> None:
+        with DetectionClient(port=service.port) as client:
+            assert client.ping()["pong"] is True
+
+    def test_detect_over_tcp(self, service) -> None:
+        with DetectionClient(port=service.port) as client:
+            result = client.detect("next slide", room="tcp")
+        assert result["command"] == "next"
+        assert result["score"] >= 8.0
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="no Unix sockets")
+    def test_detect_over_unix_socket(self, service) -> None:
+        with DetectionClient(unix_path=str(service.unix_path)) as client:
+            assert client.detect("back slide", room="unix")["command"] == "previous"
+
+    def test_debounce_is_per_room_and_command(self, service) -> None:
+        with DetectionClient(port=service.port) as client:
+            assert client.detect("open slide show", room="room-a")["command"] == "open_slideshow"
+            repeat = client.detect("open slide show", room="room-a")
+            assert repeat["command"] is None and repeat["reason"] == "debounced"
+            assert 0 < repeat["retry_after"] <= 60.0
+            # Navigation is never debounced, and another room is unaffected
+            assert client.detect("next slide", room="room-a")["command"] == "next"
+            assert client.detect("next slide", room="room-a")["command"] == "next"
+            assert client.detect("open slide show", room="room-b")["command"] == "open_slideshow"
+
+    def test_unknown_text(self, service) -> None:
+        with DetectionClient(port=service.port) as client:
+            assert client.detect("quarterly revenue growth", room="oov")["command"] == "unknown"
+
+    def test_pipelined_requests_answer_in_order(self, service) -> None:
+        requests = b"".join(protocol.encode({"op": "ping", "id": i}) for i in range(5))
+        with socket.create_connection(("127.0.0.1", service.port), timeout=5) as sock:
+            sock.sendall(requests)
+            reader = sock.makefile("rb")
+            ids = [protocol.decode(reader.readline())["id"] for _ in range(5)]
+        assert ids == list(range(5))
+
+    def test_bad_requests_keep_connection_open(self, service) -> None:
+        with socket.create_connection(("127.0.0.1", service.port), timeout=5) as sock:
+            reader = sock.makefile("rb")
+            sock.sendall(b"not json\n")
+            assert protocol.decode(reader.readline())["ok"] is False
+            sock.sendall(protocol.encode({"op": "explode"}))
+            assert "Unknown op" in protocol.decode(reader.readline())["error"]
+            sock.sendall(protocol.encode({"op": "detect"}))  # Missing text
+            assert protocol.decode(reader.readline())["ok"] is False
+            sock.sendall(protocol.encode({"op": "ping"}))
+            assert protocol.decode(reader.readline())["ok"] is True
+
+    def test_client_raises_service_error(self, service) -> None:
+        with DetectionClient(port=service.port) as client:
+            with pytest.raises(ServiceError):
+                client.request({"op": "detect"})
+
+    def test_unreachable_server(self) -> None:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            free_port = probe.getsockname()[1]
+        with pytest.raises(ServiceError):
+            DetectionClient(port=free_port, timeout=0.5).ping()
+
+    def test_http_detect(self, service) -> None:
+        body = json.dumps({"room": "http", "text": "open slide show"}).encode()
+        status, response = _http(service.port, b"POST /v1/detect HTTP/1.1\r\nHost: x\r\nConnection: close\r\n"
+                                               b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+        assert status == 200
+        assert response["ok"] and response["result"]["command"] == "open_slideshow"
+
+    def test_http_stats_and_unknown_path(self, service) -> None:
+        status, response = _http(service.port, b"GET /v1/stats HTTP/1.1\r\nConnection: close\r\n\r\n")
+        assert status == 200 and response["result"]["workers"] == 0
+        status, _ = _http(service.port, b"GET /v2/nothing HTTP/1.1\r\nConnection: close\r\n\r\n")
+        assert status == 404
+
+    def test_stats_count_requests(self, service) -> None:
+        with DetectionClient(port=service.port) as client:
+            client.detect("help menu", room="stats")
+            stats = client.stats()
+        assert stats["requests"]["detect"] >= 1
+        assert stats["latency_ms"]["detect"]["count"] >= 1
+        assert stats["rooms"] >= 1
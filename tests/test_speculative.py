@@ -0,0 +1,139 @@
+"""
+Tests for speculative detection on streaming partial transcripts
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.speculative import SpeculativeDetector
+from src.core.streaming_recognizer import StreamingRecognizer
+from src.core.voice_detector import SmartVoiceDetector
+
+CHUNK_MS = 50.0
+
+
+@pytest.fixture(scope="module")
+def detector() -> SmartVoiceDetector:
+    return SmartVoiceDetector()
+
+
+@pytest.fixture
+def speculative(detector: SmartVoiceDetector) -> SpeculativeDetector:
+    return SpeculativeDetector(detector, stable_frames=3, endpoint_ms=150)
+
+
+class ScriptedDecoder:
+    """KaldiRecognizer stand-in: one scripted (final?, text) step per chunk"""
+
+    def __init__(self, steps) -> None:
+        self.steps = list(steps)
+        self.partial = ""
+        self.final = ""
+        self.resets = 0
+
+    def AcceptWaveform(self, chunk: bytes) -> bool:
+        is_final, text = self.steps.pop(0) if self.steps else (False, self.partial)
+        if is_final:
+            self.final, self.partial = text, ""
+            return True
+        self.partial = text
+        return False
+
+    def Result(self) -> str:
+        return json.dumps({"text": self.final})
+
+    def PartialResult(self) -> str:
+        return json.dumps({"partial": self.partial})
+
+    def FinalResult(self) -> str:
+        return json.dumps({"text": self.partial})
+
+    def Reset(self) -> None:
+        self.resets += 1
+
+
+def scripted_stream(steps) -> StreamingRecognizer:
+    recognizer = StreamingRecognizer.__new__(StreamingRecognizer)
+    recognizer.sample_rate = 16000
+    recognizer._recognizer = ScriptedDecoder(steps)
+    recognizer._last_partial = ""
+    return recognizer
+
+
+def chunk() -> bytes:
+    return b"\0" * int(16000 * 2 * CHUNK_MS / 1000)
+
+
+class TestSpeculation:
+    """Arm on stable partials, commit at the endpoint, roll back on change"""
+
+    def test_arms_after_stable_frames_and_commits_at_endpoint(self, speculative: SpeculativeDetector) -> None:
+        speculation = speculative.begin()
+        speculation.on_partial("next slide")
+        assert speculation.armed is None
+        assert not speculation.on_silence(CHUNK_MS, "next slide")
+        assert not speculation.on_silence(CHUNK_MS, "next slide")
+        assert speculation.armed == speculative.candidate_of("next slide")
+        assert not speculation.on_silence(CHUNK_MS, "next slide")
+        assert speculation.on_silence(CHUNK_MS, "next slide")
+        speculation.finish("next slide")
+        assert speculative.stats()["committed_early"] == 1
+
+    def test_change_rolls_back(self, speculative: SpeculativeDetector) -> None:
+        speculation = speculative.begin()
+        speculation.on_partial("next slide")
+        speculation.on_silence(CHUNK_MS, "next slide")
+        speculation.on_silence(CHUNK_MS, "next slide")
+        assert speculation.armed is not None
+        speculation.on_partial("previous slide")  # Decoder revised its hypothesis
+        assert speculation.armed is None
+        speculation.finish("previous slide")
+        assert speculative.stats()["rolled_back"] >= 1
+        assert speculative.stats()["committed_early"] == 0
+
+    def test_ambiguous_partial_never_arms(self, speculative: SpeculativeDetector) -> None:
+        speculation = speculative.begin()
+        speculation.on_partial("stop")
+        for _ in range(10):
+            assert not speculation.on_silence(CHUNK_MS, "stop")
+        assert speculation.armed is None
+
+    def test_final_confirms_armed_command(self, speculative: SpeculativeDetector) -> None:
+        speculation = speculative.begin()
+        speculation.on_partial("next slide")
+        speculation.on_silence(CHUNK_MS, "next slide")
+        speculation.on_silence(CHUNK_MS, "next slide")
+        speculation.finish("next slide")
+        assert speculative.stats()["confirmed_final"] == 1
+
+    def test_scores_are_cached(self, speculative: SpeculativeDetector) -> None:
+        for _ in range(3):
+            speculative.candidate_of("next slide")
+        assert speculative.stats()["cache_misses"] == 1
+        assert speculative.stats()["cache_hits"] == 2
+
+
+class TestStreamSilenceHook:
+    """StreamingRecognizer.stream hands unchanged chunks to on_silence"""
+
+    def test_commits_partial_before_decoder_endpoint(self, speculative: SpeculativeDetector) -> None:
+        steps = [(False, "next"), (False, "next slide")] + [(False, "next slide")] * 10 + [(True, "next slide")]
+        recognizer = scripted_stream(steps)
+        speculation = speculative.begin()
+        text = recognizer.stream(chunk, on_partial=speculation.on_partial, on_silence=speculation.on_silence)
+        assert text == "next slide"
+        assert speculation.committed
+        assert recognizer._recognizer.resets == 1
+        assert recognizer._recognizer.steps  # Stopped before the final
+
+    def test_final_wins_when_nothing_is_armed(self, speculative: SpeculativeDetector) -> None:
+        recognizer = scripted_stream([(False, "open"), (False, "open the report"), (True, "open the report")])
+        speculation = speculative.begin()
+        text = recognizer.stream(chunk, on_partial=speculation.on_partial, on_silence=speculation.on_silence)
+        assert text == "open the report"
+        assert not speculation.committed
@@ -0,0 +1,90 @@
+"""
+Tests for startup timing, the lazy log file and lazy import boundaries
+"""
+
+import logging
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.infrastructure.logger import LazyFileHandler
+from src.infrastructure.startup import ImportTimer, StartupTimer
+
+ROOT = Path(__file__).parent.parent
+
+
+def _modules_after(statement: str) -> set:
+    """Modules loaded by a fresh interpreter after running statement"""
+    output = subprocess.run(
+        [sys.executable, "-c", f"import sys; {statement}; print(' '.join(sys.modules))"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return set(output.split())
+
+
+class TestStartupTimer:
+    """Phases, marks and the import breakdown"""
+
+    def test_phase_and_mark(self) -> None:
+        timer = StartupTimer()
+        with timer.phase("work"):
+            sum(range(10000))
+        assert timer.phases[0]["phase"] == "work"
+        assert timer.phases[0]["ms"] >= 0
+        assert timer.mark("ready") >= 0
+        report = timer.report()
+        assert "work" in report and "ready" in report
+
+    def test_import_timer_nests_modules(self, tmp_path, monkeypatch) -> None:
+        (tmp_path / "startup_probe_outer.py").write_text("import startup_probe_inner\n")
+        (tmp_path / "startup_probe_inner.py").write_text("VALUE = sum(range(1000))\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        timer = ImportTimer()
+        timer.install()
+        try:
+            import startup_probe_outer  # noqa: F401
+        finally:
+            timer.uninstall()
+            sys.modules.pop("startup_probe_outer", None)
+            sys.modules.pop("startup_probe_inner", None)
+
+        records = {r["module"]: r for r in timer.records}
+        assert records["startup_probe_inner"]["depth"] == records["startup_probe_outer"]["depth"] + 1
+        assert records["startup_probe_outer"]["cumulative_us"] >= records["startup_probe_inner"]["cumulative_us"]
+        assert timer not in sys.meta_path
+
+    def test_report_lists_slowest_imports(self) -> None:
+        timer = StartupTimer()
+        timer.imports = ImportTimer()
+        timer.imports.records.append({"module": "heavy", "self_us": 10.0, "cumulative_us": 900.0, "depth": 0})
+        assert "heavy" in timer.report()
+
+
+class TestLazyFileHandler:
+    """No logs/ directory or file until something is logged"""
+
+    def test_file_created_on_first_record(self, tmp_path) -> None:
+        path = tmp_path / "logs" / "app.log"
+        handler = LazyFileHandler(path)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        assert not path.parent.exists()
+
+        handler.handle(logging.LogRecord("t", logging.INFO, __file__, 1, "hello", None, None))
+        handler.close()
+        assert path.read_text().strip() == "hello"
+
+
+class TestLazyImports:
+    """Heavy optional modules stay out of processes that do not use them"""
+
+    def test_recognizer_backends_do_not_import_vosk(self) -> None:
+        assert "vosk" not in _modules_after("import src.core.recognizer_backends")
+
+    def test_package_import_is_light(self) -> None:
+        modules = _modules_after("import src.infrastructure.config")
+        assert "src.core.voice_detector" not in modules
+        assert "speech_recognition" not in modules
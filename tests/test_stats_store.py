@@ -0,0 +1,65 @@
+"""
+Tests for the coalescing command-stats store
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.infrastructure.stats_store import StatsStore, get_stats_store
+
+
+class TestStatsStore:
+    """In-memory counters, dirty tracking and atomic flush"""
+
+    def test_increment_does_not_write_immediately(self, tmp_path: Path) -> None:
+        path = tmp_path / "stats.json"
+        store = StatsStore(path, {"next_slide": 0}, flush_interval=60)
+        store.increment("next_slide")
+        store.increment("next_slide")
+
+        assert store.get("next_slide") == 2
+        assert store.dirty
+        assert not path.exists()
+
+        assert store.flush()
+        assert not store.dirty
+        assert json.loads(path.read_text(encoding="utf-8")) == {"next_slide": 2}
+        assert not store.flush()  # Nothing changed: no rewrite
+        store.close()
+
+    def test_timer_coalesces_writes(self, tmp_path: Path) -> None:
+        store = StatsStore(tmp_path / "stats.json", flush_interval=0.05)
+        for _ in range(100):
+            store.increment("previous_slide")
+        deadline = time.monotonic() + 2
+        while store.dirty and time.monotonic() < deadline:
+            time.sleep(0.01)
+        store.close()
+
+        assert 1 <= store.flushes < 5
+        assert json.loads((tmp_path / "stats.json").read_text(encoding="utf-8")) == {"previous_slide": 100}
+
+    def test_loads_existing_file_over_defaults(self, tmp_path: Path) -> None:
+        path = tmp_path / "stats.json"
+        path.write_text(json.dumps({"next_slide": 7}), encoding="utf-8")
+        store = StatsStore(path, {"next_slide": 0, "stop_program": 0})
+        assert store.snapshot() == {"next_slide": 7, "stop_program": 0}
+
+    def test_close_flushes_pending(self, tmp_path: Path) -> None:
+        path = tmp_path / "stats.json"
+        store = StatsStore(path, flush_interval=60)
+        store.increment("show_help")
+        store.close()
+        assert json.loads(path.read_text(encoding="utf-8")) == {"show_help": 1}
+
+    def test_shared_store_per_path(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "shared.json")
+        first = get_stats_store(path, {"a": 0})
+        second = get_stats_store(path, {"b": 0})
+        assert first is second
+        assert first.snapshot() == {"a": 0, "b": 0}
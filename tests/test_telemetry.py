@@ -0,0 +1,144 @@
+"""
+Tests for the SQLite session telemetry store
+"""
+
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.infrastructure.telemetry import Telemetry
+
+
+@pytest.fixture
+def telemetry(tmp_path: Path):
+    store = Telemetry(tmp_path / "telemetry.db", flush_interval=0.05)
+    yield store
+    store.close()
+
+
+class TestTelemetry:
+    """Batched writes and rollup queries"""
+
+    def test_schema_has_indexes(self, telemetry: Telemetry) -> None:
+        with sqlite3.connect(str(telemetry.path)) as connection:
+            indexes = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_utterances_session", "idx_executions_command", "idx_latencies_stage"} <= indexes
+
+    def test_session_summary(self, telemetry: Telemetry) -> None:
+        session = telemetry.start_session(backend="google")
+        telemetry.record_utterance("next slide", {"command": "next", "phrase": "next slide", "score": 9, "max_score": 10})
+        telemetry.record_utterance("banana", {"command": "unknown", "score": 2, "max_score": 10})
+        telemetry.record_utterance("hmm")
+        telemetry.record_execution("next", True, latency_ms=4.0)
+        telemetry.record_execution("popup_on", False, latency_ms=2.0)
+        telemetry.record_latency("recognize", 300.0)
+        telemetry.record_latency("recognize", 500.0)
+        telemetry.flush()
+
+        summary = telemetry.session_summary(session)
+        assert summary["utterances"] == 3
+        assert summary["recognized"] == 1
+        assert summary["recognition_rate"] == pytest.approx(1 / 3)
+        assert summary["executions"] == 2
+        assert summary["succeeded"] == 1
+        assert summary["avg_execution_ms"] == pytest.approx(3.0)
+        assert summary["stages"]["recognize"]["avg_ms"] == pytest.approx(400.0)
+        assert summary["stages"]["recognize"]["max_ms"] == pytest.approx(500.0)
+
+    def test_sessions_are_separate(self, telemetry: Telemetry) -> None:
+        first = telemetry.start_session()
+        telemetry.record_utterance("next slide", {"command": "next"})
+        telemetry.end_session()
+        second = telemetry.start_session()
+        telemetry.record_utterance("back", {"command": "previous"})
+        telemetry.record_utterance("back", {"command": "previous"})
+        telemetry.flush()
+
+        assert telemetry.session_summary(first)["utterances"] == 1
+        assert telemetry.session_summary(second)["utterances"] == 2
+        sessions = telemetry.sessions()
+        assert [row["id"] for row in sessions] == [second, first]
+        assert sessions[1]["ended_at"] is not None
+
+    def test_command_and_hourly_rollups(self, telemetry: Telemetry) -> None:
+        for _ in range(3):
+            telemetry.record_execution("next", True, latency_ms=1.0)
+        telemetry.record_execution("previous", True, latency_ms=5.0)
+        telemetry.record_utterance("next", {"command": "next"})
+        telemetry.record_utterance("what", {"command": "unknown"})
+        telemetry.flush()
+
+        rollup = telemetry.command_rollup()
+        assert [row["command"] for row in rollup] == ["next", "previous"]
+        assert rollup[0]["executions"] == 3
+        assert rollup[1]["avg_latency_ms"] == pytest.approx(5.0)
+        assert telemetry.command_rollup(since=time.time() + 60) == []
+
+        hours = telemetry.hourly_rollup()
+        assert len(hours) == 1
+        assert hours[0]["utterances"] == 2
+        assert hours[0]["recognized"] == 1
+
+    def test_writes_are_batched(self, telemetry: Telemetry) -> None:
+        telemetry.start_session()
+        for i in range(500):
+            telemetry.record_latency("detect", float(i))
+        telemetry.flush()
+
+        stats = telemetry.stats()
+        assert stats["rows_written"] == 501
+        assert stats["transactions"] < 20
+
+    def test_latency_summary_across_sessions(self, telemetry: Telemetry) -> None:
+        assert telemetry.latency_summary("response") == {"count": 0}
+        for session in range(2):
+            telemetry.start_session()
+            for ms in range(1, 51):
+                telemetry.record_latency("response", float(ms + 50 * session))
+        telemetry.record_latency("detect", 9999.0)
+        telemetry.flush()
+
+        reader = Telemetry(telemetry.path)  # Another process, e.g. the GUI dashboard
+        summary = reader.latency_summary("response")
+        reader.close()
+        assert summary["count"] == 100
+        assert summary["mean_ms"] == pytest.approx(50.5)
+        assert (summary["p50_ms"], summary["p95_ms"], summary["p99_ms"]) == (50.0, 95.0, 99.0)
+
+    def test_events_store_details_as_json(self, telemetry: Telemetry) -> None:
+        telemetry.record_event("popup_shown", {"title": "Guide"})
+        telemetry.flush()
+        with sqlite3.connect(str(telemetry.path)) as connection:
+            event_type, details = connection.execute("SELECT type, details FROM events").fetchone()
+        assert event_type == "popup_shown"
+        assert json.loads(details) == {"title": "Guide"}
+
+    def test_records_after_close_are_dropped_and_logged(self, tmp_path: Path, caplog) -> None:
+        store = Telemetry(tmp_path / "telemetry.db")
+        store.close()
+        with caplog.at_level("WARNING"):
+            store.record_execution("next", True)
+            store.record_latency("response", 12.0)
+        assert store.stats()["dropped"] == 3  # Both records plus the session _session() opened
+        assert store.stats()["queued"] == 0
+        assert sum("dropping" in record.getMessage() for record in caplog.records) == 1
+
+    def test_data_survives_reopen(self, tmp_path: Path) -> None:
+        path = tmp_path / "telemetry.db"
+        store = Telemetry(path)
+        session = store.start_session()
+        store.record_execution("next", True)
+        store.close()
+
+        reopened = Telemetry(path)
+        try:
+            assert reopened.session_summary(session)["executions"] == 1
+        finally:
+            reopened.close()
@@ -0,0 +1,137 @@
+"""
+Tests for per-utterance latency tracing and HDR-style histograms
+"""
+
+import json
+import random
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.infrastructure.tracing import (
+    CAPTURED, DETECTED, EXECUTED, RECOGNIZED, SPEECH_END, SPEECH_START,
+    LatencyHistogram, Tracer, current_trace, mark,
+)
+
+
+class TestLatencyHistogram:
+    """Bounded-error percentiles"""
+
+    def test_empty(self) -> None:
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) == 0.0
+        assert histogram.summary()["count"] == 0
+
+    def test_small_values_are_exact(self) -> None:
+        histogram = LatencyHistogram()
+        for us in range(1, 61):
+            histogram.record(us / 1000)
+        assert histogram.percentile(50) == pytest.approx(0.030)
+        assert histogram.max_us == 60
+
+    def test_percentiles_within_relative_error(self) -> None:
+        rng = random.Random(3)
+        values = [rng.lognormvariate(5, 1) for _ in range(5000)]  # ~150ms median, long tail
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        ordered = sorted(values)
+        for p in (50, 95, 99):
+            exact = ordered[int(p / 100 * len(ordered)) - 1]
+            assert histogram.percentile(p) == pytest.approx(exact, rel=1 / 32 + 0.01)
+        assert histogram.percentile(100) == pytest.approx(max(values), abs=0.001)
+        assert histogram.mean == pytest.approx(sum(values) / len(values), rel=0.001)
+
+    def test_bucket_count_stays_small(self) -> None:
+        histogram = LatencyHistogram()
+        for ms in range(1, 60001):
+            histogram.record(float(ms))
+        assert len(histogram._counts) < 600
+
+    def test_merge(self) -> None:
+        a, b = LatencyHistogram(), LatencyHistogram()
+        for ms in (10, 20, 30):
+            a.record(ms)
+        for ms in (1000, 2000):
+            b.record(ms)
+        a.merge(b)
+        assert a.count == 5
+        assert a.min_us == 10000
+        assert a.percentile(100) == pytest.approx(2000, rel=0.04)
+
+
+class TestTrace:
+    """Milestones, spans and the active-trace context"""
+
+    def test_spans_from_marks(self) -> None:
+        trace = Tracer().start()
+        for offset, event in enumerate([SPEECH_START, SPEECH_END, CAPTURED, RECOGNIZED, DETECTED, EXECUTED]):
+            trace.mark(event, at=100.0 + offset * 0.1)
+        spans = trace.spans()
+        assert spans["recognize"] == pytest.approx(100.0)
+        assert spans["response"] == pytest.approx(400.0)
+        assert set(spans) == {"utterance", "endpoint", "recognize", "detect", "execute", "response"}
+
+    def test_missing_milestones_are_skipped(self) -> None:
+        trace = Tracer().start()
+        trace.mark(DETECTED, at=1.0)
+        trace.mark(EXECUTED, at=1.002)
+        assert trace.spans() == {"execute": pytest.approx(2.0)}
+
+    def test_mark_uses_active_trace(self) -> None:
+        trace = Tracer().start()
+        mark(RECOGNIZED)  # Nothing active: ignored
+        assert RECOGNIZED not in trace.marks
+        with trace.activate():
+            assert current_trace() is trace
+            mark(RECOGNIZED)
+        assert current_trace() is None
+        assert RECOGNIZED in trace.marks
+
+    def test_activation_is_per_thread(self) -> None:
+        trace = Tracer().start()
+        seen = []
+        with trace.activate():
+            worker = threading.Thread(target=lambda: seen.append(current_trace()))
+            worker.start()
+            worker.join()
+        assert seen == [None]
+
+
+class TestTracer:
+    """Aggregation and export"""
+
+    def _finish(self, tracer: Tracer, response_ms: float) -> None:
+        trace = tracer.start()
+        trace.mark(SPEECH_END, at=10.0)
+        trace.mark(DETECTED, at=10.0 + response_ms / 2000)
+        trace.mark(EXECUTED, at=10.0 + response_ms / 1000)
+        tracer.finish(trace)
+
+    def test_snapshot_percentiles(self) -> None:
+        tracer = Tracer()
+        for ms in range(1, 101):
+            self._finish(tracer, float(ms))
+        response = tracer.snapshot()["response"]
+        assert response["count"] == 100
+        assert response["p50_ms"] == pytest.approx(50, rel=0.04)
+        assert response["p95_ms"] == pytest.approx(95, rel=0.04)
+        assert response["p99_ms"] == pytest.approx(99, rel=0.04)
+        assert tracer.percentiles("recognize")["count"] == 0
+
+    def test_export_json(self, tmp_path: Path) -> None:
+        tracer = Tracer(keep_recent=3)
+        for ms in (100.0, 200.0, 300.0, 400.0):
+            self._finish(tracer, ms)
+        path = tracer.export_json(tmp_path / "report.json")
+        report = json.loads(path.read_text(encoding="utf-8"))
+        assert report["traces_finished"] == 4
+        assert report["stages"]["response"]["count"] == 4
+        assert len(report["recent"]) == 3
+        assert report["recent"][-1]["spans_ms"]["response"] == pytest.approx(400.0)
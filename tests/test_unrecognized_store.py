@@ -0,0 +1,94 @@
+"""
+Tests for the append-only unrecognized command log
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.infrastructure.unrecognized_store import UnrecognizedStore
+
+
+class TestUnrecognizedStore:
+    """Batched writes, rotation, compaction and aggregation"""
+
+    def test_record_is_written_by_background_thread(self, tmp_path: Path) -> None:
+        store = UnrecognizedStore(tmp_path / "log.jsonl", flush_interval=0.05)
+        store.record("neks slait", "next", 6.5, "Slide maju")
+        store.record("xyz")
+        store.flush()
+
+        entries = list(store.iter_entries())
+        assert [e["user_input"] for e in entries] == ["neks slait", "xyz"]
+        assert entries[0]["closest_match"] == "next"
+        assert entries[0]["suggestions"] == ["Slide maju"]
+        assert entries[1]["closest_match"] == "none"
+
+    def test_flush_timeout_keeps_the_writer(self, tmp_path: Path) -> None:
+        store = UnrecognizedStore(tmp_path / "log.jsonl", flush_interval=0.01)
+        release = threading.Event()
+        write_batch = store._write_batch
+        store._write_batch = lambda batch, force_sync=False: release.wait(2) and write_batch(batch, force_sync)
+        store.record("first")
+        writer = store._thread
+        store.flush(timeout=0.05)
+        assert store._thread is writer and writer.is_alive()
+
+        store.record("second")
+        assert store._thread is writer
+        release.set()
+        writer.join(2)
+        store.flush()
+        assert [e["user_input"] for e in store.iter_entries()] == ["first", "second"]
+
+    def test_rotation_keeps_bounded_segments(self, tmp_path: Path) -> None:
+        store = UnrecognizedStore(tmp_path / "log.jsonl", batch_size=1, max_bytes=200, keep_segments=2)
+        for i in range(30):
+            store.record(f"utterance number {i}")
+        store.flush()
+
+        assert store.rotations > 2
+        assert len(store.segments()) <= 3
+        inputs = [e["user_input"] for e in store.iter_entries()]
+        assert inputs[-1] == "utterance number 29"
+        assert inputs == sorted(inputs, key=lambda text: int(text.split()[-1]))
+
+    def test_compact_merges_segments(self, tmp_path: Path) -> None:
+        store = UnrecognizedStore(tmp_path / "log.jsonl", batch_size=1, max_bytes=200, keep_segments=3)
+        for i in range(12):
+            store.record(f"utterance {i}")
+        kept = store.compact(keep_entries=5)
+
+        assert kept == 5
+        assert store.segments() == [tmp_path / "log.jsonl"]
+        assert [e["user_input"] for e in store.iter_entries()] == [f"utterance {i}" for i in range(7, 12)]
+
+    def test_aggregate(self, tmp_path: Path) -> None:
+        store = UnrecognizedStore(tmp_path / "log.jsonl")
+        for text in ["bak slait", "bak slait", "hello"]:
+            store.record(text, "previous" if "bak" in text else None)
+        store.flush()
+
+        summary = store.aggregate()
+        assert summary["total_unrecognized"] == 3
+        assert summary["unique_inputs"] == 2
+        assert summary["top_inputs"][0] == ("bak slait", 2)
+        assert dict(summary["closest_matches"]) == {"previous": 2, "none": 1}
+
+    def test_torn_trailing_line_ignored(self, tmp_path: Path) -> None:
+        path = tmp_path / "log.jsonl"
+        path.write_text(json.dumps({"user_input": "ok"}) + "\n" + '{"user_input": "cut', encoding="utf-8")
+        assert [e["user_input"] for e in UnrecognizedStore(path).iter_entries()] == ["ok"]
+
+    def test_import_legacy(self, tmp_path: Path) -> None:
+        legacy = tmp_path / "unrecognized_commands.json"
+        legacy.write_text(json.dumps({"unrecognized_commands": [{"user_input": "old"}]}), encoding="utf-8")
+        store = UnrecognizedStore(tmp_path / "log.jsonl")
+
+        assert store.import_legacy(legacy) == 1
+        assert store.import_legacy(legacy) == 0  # Log exists now: no double import
+        assert [e["user_input"] for e in store.iter_entries()] == ["old"]
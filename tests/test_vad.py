@@ -0,0 +1,61 @@
+"""
+Tests for the voice activity detection gate
+"""
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.vad import VoiceActivityDetector
+
+RATE = 16000
+
+
+def pcm(samples: np.ndarray) -> bytes:
+    return np.clip(samples, -32768, 32767).astype(np.int16).tobytes()
+
+
+def tone(seconds: float, amplitude: float, frequency: float = 220.0) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    return amplitude * np.sin(2 * np.pi * frequency * t)
+
+
+def hiss(seconds: float, amplitude: float, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(0, amplitude, int(RATE * seconds))
+
+
+@pytest.fixture
+def vad() -> VoiceActivityDetector:
+    detector = VoiceActivityDetector(RATE, aggressiveness=2, backend="energy")
+    detector.calibrate(pcm(hiss(0.5, 40)))
+    return detector
+
+
+class TestVoiceActivityDetector:
+    """Energy + zero-crossing backend"""
+
+    def test_voiced_segment_forwarded(self, vad: VoiceActivityDetector) -> None:
+        segment = np.concatenate([hiss(0.3, 40), tone(0.4, 3000) + hiss(0.4, 40), hiss(0.3, 40)])
+        assert vad.contains_speech(pcm(segment))
+
+    def test_background_noise_dropped(self, vad: VoiceActivityDetector) -> None:
+        assert not vad.contains_speech(pcm(hiss(1.0, 60, seed=1)))
+
+    def test_click_shorter_than_min_speech_dropped(self, vad: VoiceActivityDetector) -> None:
+        segment = np.concatenate([hiss(0.3, 40), tone(0.06, 5000), hiss(0.3, 40)])
+        assert not vad.contains_speech(pcm(segment))
+
+    def test_counters(self, vad: VoiceActivityDetector) -> None:
+        vad.contains_speech(pcm(tone(0.3, 3000)))
+        vad.contains_speech(pcm(hiss(0.3, 40)))
+        stats = vad.stats()
+        assert stats["segments_forwarded"] == 1 and stats["segments_dropped"] == 1
+        assert stats["frames_forwarded"] == stats["frames_dropped"] == 10
+        assert stats["drop_rate"] == 0.5
+
+    def test_aggressiveness_clamped(self) -> None:
+        assert VoiceActivityDetector(RATE, aggressiveness=7, backend="energy").aggressiveness == 3